@@ -12,6 +12,7 @@ Usage:
     python pipeline.py import-external           # Import from AngelList, Angelmatch, GitHub, Bing
     python pipeline.py run-all                   # Run stages 1-3 in sequence
     python pipeline.py stats                     # Show pipeline progress
+    python pipeline.py stats --from-mirror       # Same, from the local Supabase mirror
     python pipeline.py export                    # Export verified leads to CSV
 
 Options work with all stage commands:
@@ -31,6 +32,11 @@ import sys
 from dotenv import load_dotenv
 from supabase import create_client
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from supabase_export import Exporter, PostgrestError
+from supabase_paging import iter_rows
+import supabase_mirror
+
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
 
 SUPABASE_URL = os.getenv('SUPABASE_URL')
@@ -64,58 +70,90 @@ def run_script(script_name, extra_args=None):
     return result.returncode
 
 
-def fetch_all(supabase, table, filters=None):
-    """Fetch all rows from a table with optional filters."""
-    all_rows = []
-    page_size = 1000
-    offset = 0
-    while True:
-        query = supabase.table(table).select('*')
-        if filters:
-            for col, val in filters.items():
-                query = query.eq(col, val)
-        response = query.range(offset, offset + page_size - 1).execute()
-        all_rows.extend(response.data)
-        if len(response.data) < page_size:
-            break
-        offset += page_size
-    return all_rows
+def fetch_all(supabase, table, filters=None, columns='*'):
+    """Fetch all rows from a table with optional filters (keyset-paged on id)."""
+    return list(iter_rows(supabase, table, columns, filters=filters))
 
 
 # ── Stats ────────────────────────────────────────────────────────────────────
 
-def show_stats():
+VERIFICATION_STATUSES = ['pending', 'verified', 'failed', 'catch_all', 'unverifiable']
+OUTREACH_STATUSES = ['pending', 'emailed', 'responded', 'meeting', 'passed']
+EXPORT_COLUMNS = ('verified_email,first_name,last_name,full_name,company,domain,'
+                  'investor_type,source,verification_status,linkedin_url')
+
+
+def server_stats():
+    """
+    Pipeline counts computed by Supabase: exact counts per status bucket
+    (no rows transferred) and grouped counts for source/company. Without
+    PostgREST aggregates, the grouped counts come from the mirror instead.
+    """
+    buckets = {
+        'total': [],
+        'has_candidates': [('candidate_emails', 'not.is.null'), ('candidate_emails', 'neq.[]')],
+        'has_verified': [('verified_email', 'not.is.null'), ('verified_email', 'neq.')],
+    }
+    for status in VERIFICATION_STATUSES:
+        buckets[f'verification:{status}'] = [('verification_status', f'eq.{status}')]
+    for status in OUTREACH_STATUSES:
+        buckets[f'outreach:{status}'] = [('outreach_status', f'eq.{status}')]
+
+    exporter = Exporter(SUPABASE_URL, SUPABASE_KEY)
+    counts = exporter.counts('investor_leads', buckets)
+    try:
+        by_source = exporter.count_by('investor_leads', 'source')
+        by_company = exporter.count_by('investor_leads', 'company')
+    except PostgrestError:
+        # Aggregates disabled on this project: group the mirror copy instead
+        supabase_mirror.sync(['investor_leads'], quiet=True)
+        by_source = supabase_mirror.count_by('investor_leads', 'source')
+        by_company = supabase_mirror.count_by('investor_leads', 'company')
+    exporter.close()
+
+    return {
+        'total': counts['total'],
+        'has_candidates': counts['has_candidates'],
+        'has_verified': counts['has_verified'],
+        'verification': {s: counts[f'verification:{s}'] for s in VERIFICATION_STATUSES},
+        'outreach': {s: counts[f'outreach:{s}'] for s in OUTREACH_STATUSES},
+        'source': by_source,
+        'company': by_company,
+    }
+
+
+def mirror_stats():
+    """The same counts as server_stats, as GROUP BY queries on the local mirror."""
+    supabase_mirror.sync(['investor_leads'], quiet=True)
+    return {
+        'total': supabase_mirror.count_rows('investor_leads'),
+        'has_candidates': supabase_mirror.count_rows(
+            'investor_leads', "WHERE candidate_emails IS NOT NULL AND candidate_emails != '[]'"),
+        'has_verified': supabase_mirror.count_rows(
+            'investor_leads', "WHERE verified_email IS NOT NULL AND verified_email != ''"),
+        'verification': supabase_mirror.count_by('investor_leads', 'verification_status'),
+        'outreach': supabase_mirror.count_by('investor_leads', 'outreach_status'),
+        'source': supabase_mirror.count_by('investor_leads', 'source'),
+        'company': supabase_mirror.count_by('investor_leads', 'company'),
+    }
+
+
+def show_stats(from_mirror=False):
     """Show pipeline progress stats."""
-    supabase = get_supabase()
-    leads = fetch_all(supabase, 'investor_leads')
+    stats = mirror_stats() if from_mirror else server_stats()
 
-    total = len(leads)
+    total = stats['total']
     if total == 0:
         print("\n  Pipeline is empty. Run: python pipeline.py discover\n")
         return
 
-    # Count by status
-    status_counts = {}
-    for lead in leads:
-        status = lead.get('verification_status', 'pending')
-        status_counts[status] = status_counts.get(status, 0) + 1
-
-    # Count with candidate emails
-    has_candidates = sum(1 for l in leads if l.get('candidate_emails') and l['candidate_emails'] != [])
-    has_verified = sum(1 for l in leads if l.get('verified_email'))
-    emailed = sum(1 for l in leads if l.get('outreach_status') == 'emailed')
-
-    # Count by company
-    company_counts = {}
-    for lead in leads:
-        company = lead.get('company', 'Unknown')
-        company_counts[company] = company_counts.get(company, 0) + 1
-
-    # Count by source
-    source_counts = {}
-    for lead in leads:
-        source = lead.get('source', 'unknown')
-        source_counts[source] = source_counts.get(source, 0) + 1
+    status_counts = stats['verification']
+    outreach_counts = stats['outreach']
+    source_counts = stats['source']
+    company_counts = stats['company']
+    has_candidates = stats['has_candidates']
+    has_verified = stats['has_verified']
+    emailed = outreach_counts.get('emailed', 0)
 
     print(f"\n{'=' * 65}")
     print(f"  INVESTOR PIPELINE STATUS")
@@ -126,20 +164,14 @@ def show_stats():
     print(f"  With verified/best email:   {has_verified}")
     print(f"  Emailed:                    {emailed}")
 
-    # Count by outreach status
-    outreach_counts = {}
-    for lead in leads:
-        status = lead.get('outreach_status', 'pending')
-        outreach_counts[status] = outreach_counts.get(status, 0) + 1
-
     print(f"\n  Verification Status:")
-    for status in ['pending', 'verified', 'failed', 'catch_all', 'unverifiable']:
+    for status in VERIFICATION_STATUSES:
         count = status_counts.get(status, 0)
         bar = '#' * min(count, 40)
         print(f"    {status:15s} {count:4d}  {bar}")
 
     print(f"\n  Outreach Status:")
-    for status in ['pending', 'emailed', 'responded', 'meeting', 'passed']:
+    for status in OUTREACH_STATUSES:
         count = outreach_counts.get(status, 0)
         if count > 0:
             bar = '#' * min(count, 40)
@@ -166,7 +198,7 @@ def import_external():
 def export_leads(output_file='investor_leads_export.csv'):
     """Export all leads with emails to CSV."""
     supabase = get_supabase()
-    leads = fetch_all(supabase, 'investor_leads')
+    leads = fetch_all(supabase, 'investor_leads', columns=EXPORT_COLUMNS)
 
     # Filter to leads with some email
     with_email = [l for l in leads if l.get('verified_email')]
@@ -224,12 +256,14 @@ Commands:
                         help='Discovery source for discover command')
     parser.add_argument('--extra-queries', action='store_true',
                         help='Include general angel investor queries')
+    parser.add_argument('--from-mirror', action='store_true',
+                        help='Read stats from the local Supabase mirror (delta sync first)')
     parser.add_argument('--skip-catch-all', action='store_true',
                         help='Skip catch-all detection during verification')
     args = parser.parse_args()
 
     if args.command == 'stats':
-        show_stats()
+        show_stats(from_mirror=args.from_mirror)
         return
 
     if args.command == 'export':
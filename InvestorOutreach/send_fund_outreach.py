@@ -24,11 +24,14 @@ import os
 import sys
 import time
 from dotenv import load_dotenv
-from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import (
     Mail, Email, To, Bcc, Personalization, Content
 )
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from sendgrid_retry import send_with_retry
+from suppressions import SuppressionIndex
+
 load_dotenv(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '.env'))
 
 # ─── Configuration ───────────────────────────────────────────────────────────
@@ -200,8 +203,7 @@ def send_email(to_email, subject, html_content, bcc_email=None):
     message.add_content(Content('text/html', html_content))
 
     try:
-        sg       = SendGridAPIClient(SENDGRID_API_KEY)
-        response = sg.send(message)
+        response = send_with_retry(SENDGRID_API_KEY, message)
         return response.status_code, None
     except Exception as e:
         return None, str(e)
@@ -269,8 +271,13 @@ def send_live_outreach(dry_run=False, type_filter=None):
     print(f"  CVC:  {cvc_count}")
     print(f"  MENA: {mena_count}\n")
 
+    suppressed = SuppressionIndex()
+
     for i, (fund_name, fund_type, contact_email) in enumerate(funds):
         label = FUND_TYPES.get(fund_type, {}).get('label', fund_type)
+        if contact_email in suppressed:
+            print(f"  [{i+1}/{len(funds)}] {fund_name} ({contact_email}) — skipped (suppressed)")
+            continue
         html, subject = build_fund_email(fund_name, fund_type)
 
         print(f"  [{i+1}/{len(funds)}] {fund_name} ({contact_email}) — {label}")
@@ -24,12 +24,17 @@ import sys
 import time
 from datetime import datetime, timezone
 from dotenv import load_dotenv
-from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import (
     Mail, Email, To, Bcc, Personalization, Content
 )
 from supabase import create_client
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from sendgrid_retry import send_with_retry
+from suppressions import SuppressionIndex
+from sequence_state import MarkFailed, mark_rows
+from write_behind import WriteBehindLog
+
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
 
 # ─── Configuration ───────────────────────────────────────────────────────────
@@ -198,8 +203,7 @@ def send_email(to_email, subject, html_content, bcc_email=None):
     message.add_content(Content('text/html', html_content))
 
     try:
-        sg = SendGridAPIClient(SENDGRID_API_KEY)
-        response = sg.send(message)
+        response = send_with_retry(SENDGRID_API_KEY, message)
         return response.status_code, None
     except Exception as e:
         return None, str(e)
@@ -237,29 +241,40 @@ def fetch_pending_prospects(supabase):
     return all_prospects
 
 
-def log_outreach_sent(supabase, email, subject, status='sent'):
-    """Log to investor_email_log."""
-    try:
-        supabase.table('investor_email_log').insert({
-            'contact_email': email,
-            'list_type': 'prospect',
-            'email_type': 'cold_outreach',
-            'subject': subject,
-            'status': status,
-        }).execute()
-    except Exception:
-        pass
-
-
-def mark_prospect_sent(supabase, lead_id):
-    """Update lead outreach_status to 'emailed' and set emailed_at."""
-    try:
-        supabase.table('investor_leads').update({
-            'outreach_status': 'emailed',
-            'emailed_at': datetime.now(timezone.utc).isoformat(),
-        }).eq('id', lead_id).execute()
-    except Exception:
-        pass
+def write_prospect_marks(supabase, rows):
+    """Mark a batch of leads emailed with chunked bulk updates."""
+    failed = mark_rows(supabase, 'investor_leads', [dict(row, outreach_status='emailed') for row in rows])
+    if failed:
+        raise MarkFailed('investor_leads', failed)
+
+
+def open_send_logs(supabase):
+    """Write-behind logs for investor_email_log inserts and investor_leads marks."""
+    email_log = WriteBehindLog(
+        'investor_email_log',
+        lambda rows: supabase.table('investor_email_log').insert(rows).execute(),
+    )
+    lead_marks = WriteBehindLog('investor_lead_marks', lambda rows: write_prospect_marks(supabase, rows))
+    return email_log, lead_marks
+
+
+def log_outreach_sent(email_log, email, subject, status='sent'):
+    """Queue an investor_email_log row."""
+    email_log.record({
+        'contact_email': email,
+        'list_type': 'prospect',
+        'email_type': 'cold_outreach',
+        'subject': subject,
+        'status': status,
+    })
+
+
+def mark_prospect_sent(lead_marks, lead_id):
+    """Queue setting lead outreach_status to 'emailed' and emailed_at."""
+    lead_marks.record({
+        'id': lead_id,
+        'emailed_at': datetime.now(timezone.utc).replace(microsecond=0).isoformat(),
+    })
 
 
 # ─── Test Mode ───────────────────────────────────────────────────────────────
@@ -330,11 +345,17 @@ def send_live_outreach(dry_run=False):
         print(f"  {label}: {count}")
     print()
 
+    suppressed = SuppressionIndex()
+    email_log, lead_marks = (None, None) if dry_run else open_send_logs(supabase)
+
     for i, p in enumerate(prospects):
         first_name = p.get('first_name', '') or ''
         email = p.get('verified_email', '')
         if not email:
             continue
+        if email in suppressed:
+            print(f"  [{i+1}/{len(prospects)}] {email} - skipped (suppressed)")
+            continue
         inv_type = p.get('investor_type', 'vc') or 'vc'
         # Map health_vc to vc for email variant
         if inv_type == 'health_vc':
@@ -361,14 +382,18 @@ def send_live_outreach(dry_run=False):
 
         if status and 200 <= status < 300:
             print(f"           Sent (status {status})")
-            log_outreach_sent(supabase, email, subject, 'sent')
-            mark_prospect_sent(supabase, p['id'])
+            log_outreach_sent(email_log, email, subject, 'sent')
+            mark_prospect_sent(lead_marks, p['id'])
         else:
             print(f"           Failed: {error}")
-            log_outreach_sent(supabase, email, subject, f'failed: {error}')
+            log_outreach_sent(email_log, email, subject, f'failed: {error}')
 
         time.sleep(SEND_DELAY)
 
+    if not dry_run:
+        email_log.close()
+        lead_marks.close()
+
     print(f"\n{'=' * 60}")
     if dry_run:
         print(f"  DRY RUN COMPLETE - no emails sent")
@@ -20,12 +20,15 @@ import sys
 import time
 from datetime import datetime, timezone
 from dotenv import load_dotenv
-from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import (
     Mail, Email, To, Bcc, ReplyTo, Personalization, Content
 )
 from supabase import create_client
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from sendgrid_retry import send_with_retry
+from suppressions import SuppressionIndex
+
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
 
 # ─── Configuration ───────────────────────────────────────────────────────────
@@ -162,8 +165,7 @@ def send_email(to_email, subject, html_content, bcc_email=None):
     message.add_content(Content('text/html', html_content))
 
     try:
-        sg = SendGridAPIClient(SENDGRID_API_KEY)
-        response = sg.send(message)
+        response = send_with_retry(SENDGRID_API_KEY, message)
         return response.status_code, None
     except Exception as e:
         return None, str(e)
@@ -281,11 +283,17 @@ def send_live_update(dry_run=False, subject_override=None, content_override=None
         print("  No active contacts found. Insert contacts first.")
         return
 
+    suppressed = SuppressionIndex()
+
     for i, c in enumerate(contacts):
         name = f"{c.get('first_name', '')} {c.get('last_name', '')}".strip()
         company = c.get('company') or '—'
         print(f"  [{i+1}/{len(contacts)}] {name} ({c['email']}) — {company}")
 
+        if c['email'] in suppressed:
+            print(f"           ⊘ Skipped (suppressed)")
+            continue
+
         if dry_run:
             continue
 
@@ -11,9 +11,12 @@ import os
 import sys
 import time
 from dotenv import load_dotenv
-from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import Mail, Email, To, Personalization, Content
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from sendgrid_retry import send_with_retry
+from suppressions import SuppressionIndex
+
 load_dotenv(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '.env'))
 
 SENDGRID_API_KEY = os.getenv('SENDGRID_API_KEY_MATIN') or os.getenv('SENDGRID_API_KEY')
@@ -99,8 +102,7 @@ def send_email(to_email, html):
     message.add_content(Content('text/html', html))
 
     try:
-        sg = SendGridAPIClient(SENDGRID_API_KEY)
-        r  = sg.send(message)
+        r = send_with_retry(SENDGRID_API_KEY, message)
         return r.status_code, None
     except Exception as e:
         return None, str(e)
@@ -141,10 +143,12 @@ def main():
                 print("Aborted.")
                 sys.exit(0)
 
+        suppressed = SuppressionIndex()
+
         for i, c in enumerate(contacts):
             first_name = c.get('first_name') or 'there'
             email      = c.get('email')
-            if not email:
+            if not email or email in suppressed:
                 continue
             html = build_email(first_name=first_name)
             status, error = send_email(email, html)
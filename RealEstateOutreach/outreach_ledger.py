@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Vora Real Estate Outreach Ledger
+Indexed SQLite ledger of realtor sends and zip sweeps, replacing the
+load-everything / rewrite-everything sent_emails.json and the flat
+completed_zips.txt.
+
+- sends: one row per email (primary key), indexed by zip; recording a send
+  is a single-row insert, membership is a primary-key lookup
+- claim-then-send: claim_email() atomically reserves an address before it is
+  emailed, so two zip sweeps running at once can never both mail the same
+  realtor; mark_sent() / release() settle the claim
+- zips: one row per zip with its status (running / completed), who claimed
+  it, and sent counts kept current by a trigger, so per-zip aggregates need
+  no scan
+- WAL + BEGIN IMMEDIATE: concurrent sweeps (separate processes) serialize
+  their short write transactions instead of clobbering a shared JSON file
+
+The legacy files are still understood: `import` folds them in (idempotent)
+and `export` writes them back out (atomically) for anything that reads them.
+
+Usage:
+    from outreach_ledger import OutreachLedger
+
+    ledger = OutreachLedger()
+    if ledger.claim_zip(zip_code, worker='sweep-1'):
+        for lead in leads:
+            if ledger.claim_email(lead['email'], lead['business_name'], zip_code):
+                ok = send(lead)
+                ledger.mark_sent(lead['email']) if ok else ledger.release(lead['email'])
+        ledger.complete_zip(zip_code)
+
+    python outreach_ledger.py import        # sent_emails.json + completed_zips.txt
+    python outreach_ledger.py stats
+    python outreach_ledger.py check someone@gmail.com
+    python outreach_ledger.py export        # rewrite the legacy files from the ledger
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime
+
+LEDGER_DIR = os.path.dirname(os.path.abspath(__file__))
+LEDGER_DB = os.getenv('REAL_ESTATE_LEDGER_DB', os.path.join(LEDGER_DIR, 'ledger.db'))
+SENT_JSON = os.path.join(LEDGER_DIR, 'sent_emails.json')
+COMPLETED_ZIPS = os.path.join(LEDGER_DIR, 'completed_zips.txt')
+
+CLAIM_TIMEOUT = 15 * 60  # a claim older than this (crashed sweep) can be taken over
+
+
+def now_iso():
+    return datetime.now().isoformat()
+
+
+class OutreachLedger:
+    def __init__(self, path=None):
+        self.path = path or LEDGER_DB
+        self.conn = sqlite3.connect(self.path, timeout=60, isolation_level=None, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS sends (
+                email TEXT PRIMARY KEY,
+                business_name TEXT,
+                zip_code TEXT,
+                status TEXT NOT NULL,           -- claimed | sent
+                claimed_at REAL,
+                sent_at TEXT
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_sends_zip ON sends (zip_code, status);
+
+            CREATE TABLE IF NOT EXISTS zips (
+                zip_code TEXT PRIMARY KEY,
+                status TEXT NOT NULL DEFAULT 'pending',   -- pending | running | completed
+                worker TEXT,
+                claimed_at REAL,
+                completed_at TEXT,
+                sent INTEGER NOT NULL DEFAULT 0,
+                last_sent_at TEXT
+            );
+
+            CREATE TRIGGER IF NOT EXISTS sends_count_insert AFTER INSERT ON sends
+            WHEN NEW.status = 'sent' AND NEW.zip_code IS NOT NULL
+            BEGIN
+                INSERT INTO zips (zip_code, sent, last_sent_at) VALUES (NEW.zip_code, 1, NEW.sent_at)
+                ON CONFLICT (zip_code) DO UPDATE SET sent = sent + 1,
+                    last_sent_at = max(coalesce(last_sent_at, ''), coalesce(NEW.sent_at, ''));
+            END;
+            CREATE TRIGGER IF NOT EXISTS sends_count_update AFTER UPDATE OF status ON sends
+            WHEN NEW.status = 'sent' AND OLD.status != 'sent' AND NEW.zip_code IS NOT NULL
+            BEGIN
+                INSERT INTO zips (zip_code, sent, last_sent_at) VALUES (NEW.zip_code, 1, NEW.sent_at)
+                ON CONFLICT (zip_code) DO UPDATE SET sent = sent + 1,
+                    last_sent_at = max(coalesce(last_sent_at, ''), coalesce(NEW.sent_at, ''));
+            END;
+        """)
+
+    def _write(self, sql, params=()):
+        """One statement in its own immediate transaction. Returns rows changed."""
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            changed = self.conn.execute(sql, params).rowcount
+            self.conn.execute('COMMIT')
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+        return changed
+
+    # ─── Sends ───────────────────────────────────────────────────────────────
+
+    def __contains__(self, email):
+        """True if the address was sent to (or is claimed by a running sweep)."""
+        return self.conn.execute(
+            'SELECT 1 FROM sends WHERE email = ?', ((email or '').strip().lower(),),
+        ).fetchone() is not None
+
+    def emails(self):
+        """Every address in the ledger, for filtering a batch of leads at once."""
+        return {e for (e,) in self.conn.execute('SELECT email FROM sends')}
+
+    def claim_email(self, email, business_name=None, zip_code=None):
+        """Reserve an address before sending. False if it was sent or claimed elsewhere."""
+        email = (email or '').strip().lower()
+        stale = time.time() - CLAIM_TIMEOUT
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            # A claim left by a crashed sweep can be taken over
+            self.conn.execute("DELETE FROM sends WHERE email = ? AND status = 'claimed' AND claimed_at < ?",
+                              (email, stale))
+            claimed = self.conn.execute(
+                "INSERT OR IGNORE INTO sends (email, business_name, zip_code, status, claimed_at) "
+                "VALUES (?, ?, ?, 'claimed', ?)", (email, business_name, zip_code, time.time()),
+            ).rowcount
+            self.conn.execute('COMMIT')
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+        return claimed == 1
+
+    def mark_sent(self, email, sent_at=None):
+        return self._write("UPDATE sends SET status = 'sent', sent_at = ? WHERE email = ? AND status = 'claimed'",
+                           (sent_at or now_iso(), (email or '').strip().lower())) == 1
+
+    def release(self, email):
+        """Drop a claim whose send failed, so a later sweep can retry it."""
+        return self._write("DELETE FROM sends WHERE email = ? AND status = 'claimed'",
+                           ((email or '').strip().lower(),)) == 1
+
+    def record_sent(self, email, business_name=None, zip_code=None, sent_at=None):
+        """Record a completed send directly (no claim). False if already recorded."""
+        return self._write(
+            "INSERT OR IGNORE INTO sends (email, business_name, zip_code, status, sent_at) VALUES (?, ?, ?, 'sent', ?)",
+            ((email or '').strip().lower(), business_name, zip_code, sent_at or now_iso()),
+        ) == 1
+
+    # ─── Zips ────────────────────────────────────────────────────────────────
+
+    def claim_zip(self, zip_code, worker=None):
+        """Start sweeping a zip. False if it is completed or another live sweep has it."""
+        stale = time.time() - CLAIM_TIMEOUT
+        return self._write(
+            "INSERT INTO zips (zip_code, status, worker, claimed_at) VALUES (?, 'running', ?, ?) "
+            "ON CONFLICT (zip_code) DO UPDATE SET status = 'running', worker = excluded.worker, "
+            "claimed_at = excluded.claimed_at "
+            "WHERE zips.status = 'pending' OR (zips.status = 'running' AND zips.claimed_at < ?)",
+            (zip_code, worker or f'pid-{os.getpid()}', time.time(), stale),
+        ) == 1
+
+    def heartbeat_zip(self, zip_code):
+        """Keep a long-running zip claim from looking stale."""
+        self._write("UPDATE zips SET claimed_at = ? WHERE zip_code = ? AND status = 'running'",
+                    (time.time(), zip_code))
+
+    def complete_zip(self, zip_code, completed_at=None):
+        self._write(
+            "INSERT INTO zips (zip_code, status, completed_at) VALUES (?, 'completed', ?) "
+            "ON CONFLICT (zip_code) DO UPDATE SET status = 'completed', completed_at = excluded.completed_at",
+            (zip_code, completed_at or now_iso()),
+        )
+
+    def completed_zips(self):
+        return {z for (z,) in self.conn.execute("SELECT zip_code FROM zips WHERE status = 'completed'")}
+
+    def zip_stats(self, zip_code=None):
+        """[{zip_code, status, sent, last_sent_at, completed_at}, ...] from the maintained aggregates."""
+        sql = 'SELECT zip_code, status, sent, last_sent_at, completed_at FROM zips'
+        params = ()
+        if zip_code:
+            sql += ' WHERE zip_code = ?'
+            params = (zip_code,)
+        cursor = self.conn.execute(sql + ' ORDER BY sent DESC, zip_code', params)
+        names = [d[0] for d in cursor.description]
+        return [dict(zip(names, row)) for row in cursor]
+
+    def counts(self):
+        return dict(self.conn.execute('SELECT status, COUNT(*) FROM sends GROUP BY status'))
+
+    # ─── Legacy files ────────────────────────────────────────────────────────
+
+    def import_legacy(self, sent_json=SENT_JSON, completed_zips=COMPLETED_ZIPS):
+        """Fold sent_emails.json and completed_zips.txt in. Returns (new sends, new completed zips)."""
+        new_sends = new_zips = 0
+        if os.path.exists(sent_json):
+            with open(sent_json) as f:
+                sent = json.load(f)
+            rows = [(email.strip().lower(), info.get('business_name'), info.get('zip_code'), info.get('sent_at'))
+                    for email, info in sent.items()]
+            self.conn.execute('BEGIN IMMEDIATE')
+            new_sends = self.conn.executemany(
+                "INSERT OR IGNORE INTO sends (email, business_name, zip_code, status, sent_at) "
+                "VALUES (?, ?, ?, 'sent', ?)", rows,
+            ).rowcount
+            self.conn.execute('COMMIT')
+        if os.path.exists(completed_zips):
+            done = self.completed_zips()
+            with open(completed_zips) as f:
+                for line in f:
+                    zip_code, _, completed_at = line.strip().partition('|')
+                    if zip_code and zip_code not in done:
+                        self.complete_zip(zip_code, completed_at or None)
+                        done.add(zip_code)
+                        new_zips += 1
+        return new_sends, new_zips
+
+    def export_legacy(self, sent_json=SENT_JSON, completed_zips=COMPLETED_ZIPS):
+        """Write both legacy files from the ledger (temp file + rename, so readers never see half)."""
+        sent = {
+            email: {'business_name': name, 'sent_at': sent_at, 'zip_code': zip_code}
+            for email, name, sent_at, zip_code in self.conn.execute(
+                "SELECT email, business_name, sent_at, zip_code FROM sends WHERE status = 'sent' ORDER BY sent_at")
+        }
+        with open(sent_json + '.tmp', 'w') as f:
+            json.dump(sent, f, indent=2)
+        os.replace(sent_json + '.tmp', sent_json)
+        lines = [f"{z}|{at or ''}" for z, at in self.conn.execute(
+            "SELECT zip_code, completed_at FROM zips WHERE status = 'completed' ORDER BY completed_at")]
+        with open(completed_zips + '.tmp', 'w') as f:
+            f.write('\n'.join(lines) + ('\n' if lines else ''))
+        os.replace(completed_zips + '.tmp', completed_zips)
+        return len(sent), len(lines)
+
+    def close(self):
+        self.conn.close()
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description='Real estate outreach ledger')
+    parser.add_argument('--db', type=str, help=f'Ledger path (default: {LEDGER_DB})')
+    sub = parser.add_subparsers(dest='command')
+    sub.add_parser('import', help='Import sent_emails.json and completed_zips.txt (idempotent)')
+    sub.add_parser('export', help='Rewrite sent_emails.json and completed_zips.txt from the ledger')
+    p_check = sub.add_parser('check', help='Check whether addresses were emailed')
+    p_check.add_argument('emails', nargs='+')
+    p_stats = sub.add_parser('stats', help='Send counts, per zip')
+    p_stats.add_argument('--zip', dest='zip_code', help='Only this zip')
+    args = parser.parse_args()
+
+    ledger = OutreachLedger(args.db)
+    if args.command == 'import':
+        sends, zips = ledger.import_legacy()
+        print(f"  Imported {sends} new sends and {zips} completed zips")
+    elif args.command == 'export':
+        sends, zips = ledger.export_legacy()
+        print(f"  Wrote {sends} sends to {SENT_JSON}")
+        print(f"  Wrote {zips} completed zips to {COMPLETED_ZIPS}")
+    elif args.command == 'check':
+        for email in args.emails:
+            row = ledger.conn.execute('SELECT status, zip_code, sent_at FROM sends WHERE email = ?',
+                                      (email.strip().lower(),)).fetchone()
+            if row:
+                print(f"  ✗ {email}: {row[0]} (zip {row[1]}, {row[2] or 'in progress'})")
+            else:
+                print(f"  ✓ {email}: not emailed")
+    elif args.command == 'stats':
+        counts = ledger.counts()
+        print(f"  {counts.get('sent', 0):,} sent, {counts.get('claimed', 0)} claimed by running sweeps\n")
+        print(f"  {'Zip':<8} {'Status':<10} {'Sent':>6}  Last send")
+        for z in ledger.zip_stats(args.zip_code):
+            print(f"  {z['zip_code']:<8} {z['status']:<10} {z['sent']:>6}  {z['last_sent_at'] or '-'}")
+    else:
+        parser.print_help()
+        sys.exit(1)
+    ledger.close()
+
+
+if __name__ == '__main__':
+    main()
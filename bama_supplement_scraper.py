@@ -10,13 +10,15 @@ UA uses varied URL structures across departments:
 """
 
 import requests
-from bs4 import BeautifulSoup
 import re
 import csv
 import json
 import time
 from urllib.parse import urljoin
 
+from lead_store import write_contacts
+from page_cache import PAGES
+
 
 def log(msg):
     print(msg, flush=True)
@@ -190,10 +192,13 @@ def is_admin_email(email):
 
 def get_soup(url, session):
     """Fetch a page and return BeautifulSoup object."""
+    cached = PAGES.lookup(url)
+    if cached:
+        return cached
     try:
         resp = session.get(url, headers=HEADERS, timeout=20, allow_redirects=True)
         if resp.status_code == 200:
-            return BeautifulSoup(resp.text, 'html.parser'), resp.url
+            return PAGES.store(url, resp)
         else:
             log(f"    HTTP {resp.status_code}")
             return None, None
@@ -253,6 +258,7 @@ def try_get_name_for_email(soup, email):
 # STRUCTURED EXTRACTION
 # ============================================================
 
+@PAGES.memoize
 def extract_from_person_cards(soup, url, department):
     """Extract people from card/grid-based layouts."""
     results = []
@@ -414,6 +420,10 @@ def scrape_department(config, session):
         if final_url:
             all_pages_scraped.add(final_url)
 
+        if not PAGES.first_visit(soup, department):
+            log(f"    -> Same content as an earlier page, skipped")
+            continue
+
         page_text = soup.get_text(separator=' ', strip=True)
         log(f"    -> Page loaded (final URL: {final_url})")
 
@@ -482,6 +492,9 @@ def scrape_department(config, session):
                 page_soup, page_final = get_soup(page_url, session)
                 if page_soup is None:
                     continue
+                if not PAGES.first_visit(page_soup, department):
+                    log(f"    -> Same content as an earlier page, skipped")
+                    continue
 
                 pg_text = page_soup.get_text(separator=' ', strip=True)
                 pg_text_emails = extract_ua_emails(pg_text)
@@ -620,6 +633,7 @@ def main():
     log(f"RESULTS SUMMARY")
     log(f"{'=' * 70}")
     log(f"Total unique UA emails: {len(all_results)}")
+    log(f"Page cache: {PAGES.summary()}")
 
     # Save CSV
     with open(OUTPUT_CSV, 'w', newline='') as f:
@@ -633,6 +647,8 @@ def main():
     with open(OUTPUT_JSON, 'w') as f:
         json.dump(all_results, f, indent=2)
     log(f"Saved to {OUTPUT_JSON}")
+    n = write_contacts(all_results, OUTPUT_CSV)
+    log(f"Stored {n} contacts in the lead store")
 
     # Summary by department
     log(f"\n{'=' * 70}")
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Vora Sender Load Benchmark
+Drives the real send loops against sendgrid_mock.py and reports messages/sec
+and p50/p99 send latency. Nothing leaves the machine: SENDGRID_API_HOST is
+pointed at an in-process mock before any sender is imported, and Supabase
+writes go to a no-op sink.
+
+Targets:
+    college   college_outreach.run_live_send
+    outreach  outreach.run_batch (synthetic enriched CSV, test mode)
+    investor  InvestorOutreach/send_investor_outreach.send_live_outreach
+    fund      InvestorOutreach/send_fund_outreach.send_live_outreach
+    update    InvestorOutreach/send_investor_update.send_live_update
+
+Usage:
+    python bench_senders.py --count 300 --no-delay
+    python bench_senders.py --targets college --count 2000 --latency-ms 120 --rate-429 0.05
+"""
+
+import argparse
+import contextlib
+import csv
+import importlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_DIR, 'InvestorOutreach'))
+
+from sendgrid_mock import start_mock_server
+import sendgrid_retry
+
+ALL_TARGETS = ['college', 'outreach', 'investor', 'fund', 'update']
+BENCH_DOMAINS = ['ucla.test', 'umich.test', 'osu.test', 'usc.test', 'tamu.test']
+
+
+class NullSupabase:
+    """Accepts any supabase-py query chain and returns no rows."""
+
+    data = []
+    count = 0
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    def execute(self):
+        return self
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of a list of floats."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(p / 100 * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def instrument(mod):
+    """Wrap mod.send_with_retry to time each send (retries included)."""
+    samples = []
+    original = mod.send_with_retry
+
+    def timed(api_key, message, **kwargs):
+        start = time.perf_counter()
+        try:
+            return original(api_key, message, **kwargs)
+        finally:
+            samples.append((start, time.perf_counter()))
+
+    mod.send_with_retry = timed
+    return samples
+
+
+def synthetic_emails(count):
+    return [f"bench{i}@{BENCH_DOMAINS[i % len(BENCH_DOMAINS)]}" for i in range(count)]
+
+
+# ─── Targets ─────────────────────────────────────────────────────────────────
+
+def run_college(count, no_delay):
+    mod = importlib.import_module('college_outreach')
+    mod.SENDGRID_API_KEY = mod.SENDGRID_API_KEY or 'SG.mock'
+    if no_delay:
+        mod.SEND_DELAY = 0
+    variants = mod.VARIANT_COMBOS + ['grad', 'coach']
+    send_list = [{
+        'email': email,
+        'university': 'UCLA',
+        'role': 'student',
+        'first_name': 'Alex',
+        'variant': variants[i % len(variants)],
+    } for i, email in enumerate(synthetic_emails(count))]
+    samples = instrument(mod)
+    mod.run_live_send(send_list, NullSupabase(), dry_run=False, domain_rate=0 if no_delay else mod.DOMAIN_MAX_PER_MINUTE)
+    return samples
+
+
+def run_outreach(count, no_delay):
+    mod = importlib.import_module('outreach')
+    mod.SENDGRID_API_KEY = mod.SENDGRID_API_KEY or 'SG.mock'
+    if no_delay:
+        mod.SEND_DELAY = 0
+    tmp = tempfile.NamedTemporaryFile('w', suffix='_enriched.csv', delete=False, newline='', encoding='utf-8')
+    with tmp:
+        writer = csv.DictWriter(tmp, fieldnames=mod.ENRICHED_FIELDS)
+        writer.writeheader()
+        for i, email in enumerate(synthetic_emails(count)):
+            writer.writerow({
+                'business_name': f"Bench Physical Therapy {i}",
+                'email': email,
+                'website': '',
+                'category': 'physical_therapy',
+                'description': 'Sports rehab and recovery clinic.',
+                'services': 'physical therapy; dry needling',
+                'contact_name': 'Sam Lee',
+                'contact_title': 'DPT',
+            })
+    samples = instrument(mod)
+    try:
+        mod.run_batch(tmp.name, test_mode=True, limit=count)
+    finally:
+        os.unlink(tmp.name)
+    return samples
+
+
+def run_investor(count, no_delay):
+    mod = importlib.import_module('send_investor_outreach')
+    mod.SENDGRID_API_KEY = mod.SENDGRID_API_KEY or 'SG.mock'
+    if no_delay:
+        mod.SEND_DELAY = 0
+    types = ['vc', 'accelerator', 'angel']
+    prospects = [{
+        'id': i, 'first_name': 'Jordan', 'last_name': f"Bench{i}",
+        'verified_email': email, 'investor_type': types[i % len(types)],
+    } for i, email in enumerate(synthetic_emails(count))]
+    mod.get_supabase = lambda: NullSupabase()
+    mod.fetch_pending_prospects = lambda supabase: prospects
+    samples = instrument(mod)
+    mod.send_live_outreach(dry_run=False)
+    return samples
+
+
+def run_fund(count, no_delay):
+    mod = importlib.import_module('send_fund_outreach')
+    mod.SENDGRID_API_KEY = mod.SENDGRID_API_KEY or 'SG.mock'
+    if no_delay:
+        mod.SEND_DELAY = 0
+    mod.FUNDS = [
+        (f"Bench Fund {i}", 'cvc' if i % 2 else 'mena', email)
+        for i, email in enumerate(synthetic_emails(count))
+    ]
+    samples = instrument(mod)
+    mod.send_live_outreach(dry_run=False)
+    return samples
+
+
+def run_update(count, no_delay):
+    mod = importlib.import_module('send_investor_update')
+    mod.SENDGRID_API_KEY = mod.SENDGRID_API_KEY or 'SG.mock'
+    if no_delay:
+        mod.SEND_DELAY = 0
+    contacts = [{
+        'email': email, 'first_name': 'Casey', 'last_name': f"Bench{i}", 'company': 'Bench Capital',
+    } for i, email in enumerate(synthetic_emails(count))]
+    mod.get_supabase = lambda: NullSupabase()
+    mod.fetch_active_contacts = lambda supabase: contacts
+    samples = instrument(mod)
+    mod.send_live_update(dry_run=False)
+    return samples
+
+
+RUNNERS = {
+    'college': run_college,
+    'outreach': run_outreach,
+    'investor': run_investor,
+    'fund': run_fund,
+    'update': run_update,
+}
+
+
+# ─── Main ────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark SendGrid senders against a local mock')
+    parser.add_argument('--targets', type=str, default=','.join(ALL_TARGETS),
+                        help=f"Comma-separated targets (default: {','.join(ALL_TARGETS)})")
+    parser.add_argument('--count', type=int, default=200, help='Messages per target (default: 200)')
+    parser.add_argument('--no-delay', action='store_true',
+                        help='Zero each sender\'s SEND_DELAY and domain ceiling to measure the raw send path')
+    parser.add_argument('--latency-ms', type=float, default=50, help='Mock latency (default: 50)')
+    parser.add_argument('--jitter-ms', type=float, default=20, help='Mock latency jitter (default: 20)')
+    parser.add_argument('--rate-429', type=float, default=0.0, help='Fraction of 429 responses')
+    parser.add_argument('--rate-5xx', type=float, default=0.0, help='Fraction of 5xx responses')
+    parser.add_argument('--retry-after', type=int, default=1, help='Retry-After seconds on 429s')
+    parser.add_argument('--record', type=str, help='Record accepted payloads to this JSONL file')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--verbose', action='store_true', help='Show sender output')
+    args = parser.parse_args()
+
+    targets = [t.strip() for t in args.targets.split(',') if t.strip()]
+    unknown = [t for t in targets if t not in RUNNERS]
+    if unknown:
+        print(f"Unknown target(s): {', '.join(unknown)}. Valid: {', '.join(ALL_TARGETS)}")
+        sys.exit(1)
+
+    server, url = start_mock_server(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        rate_429=args.rate_429, rate_5xx=args.rate_5xx,
+        retry_after=args.retry_after, record_path=args.record, seed=args.seed,
+    )
+    os.environ['SENDGRID_API_HOST'] = url
+    sendgrid_retry._clients.clear()
+
+    print(f"\n{'=' * 60}")
+    print(f"  SENDER BENCHMARK — mock at {url}")
+    print(f"  {args.count} msgs/target, latency {args.latency_ms:.0f}±{args.jitter_ms:.0f}ms, "
+          f"429 {args.rate_429:.0%}, 5xx {args.rate_5xx:.0%}"
+          f"{', no delay' if args.no_delay else ''}")
+    print(f"{'=' * 60}\n")
+
+    results = []
+    for target in targets:
+        sendgrid_retry.BREAKER.failures = 0
+        sendgrid_retry.BREAKER.opened_until = 0.0
+        before = server.state.stats()
+
+        sink = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+        with sink:
+            samples = RUNNERS[target](args.count, args.no_delay)
+
+        after = server.state.stats()
+        latencies = [end - start for start, end in samples]
+        span = (samples[-1][1] - samples[0][0]) if samples else 0.0
+        accepted = after['accepted'] - before['accepted']
+        results.append({
+            'target': target,
+            'sends': len(samples),
+            'accepted': accepted,
+            'requests': after['requests'] - before['requests'],
+            'msgs_per_sec': accepted / span if span > 0 else 0.0,
+            'p50_ms': percentile(latencies, 50) * 1000,
+            'p99_ms': percentile(latencies, 99) * 1000,
+        })
+        r = results[-1]
+        print(f"  {target:<9} {r['accepted']:>6}/{r['sends']:<6} accepted  "
+              f"{r['msgs_per_sec']:>7.1f} msg/s  p50 {r['p50_ms']:>7.1f}ms  p99 {r['p99_ms']:>7.1f}ms  "
+              f"({r['requests']} HTTP requests)")
+
+    server.shutdown()
+    print(f"\n  Mock status counts: {server.state.stats()['status_counts']}")
+    print()
+
+
+if __name__ == '__main__':
+    main()
@@ -14,6 +14,8 @@ import json
 import time
 from urllib.parse import urljoin
 
+from record_linkage import link
+
 
 def log(msg):
     print(msg, flush=True)
@@ -752,18 +754,11 @@ def main():
     
     log(f"\nNew emails from pass 2: {len(all_new_results)}")
     
-    # Merge all results
-    final_results = cleaned_pass1 + all_new_results
-    
-    # Remove duplicates, keep first occurrence
-    seen = set()
-    deduplicated = []
-    for r in final_results:
-        if r['email'] not in seen:
-            seen.add(r['email'])
-            deduplicated.append(r)
-    
-    final_results = deduplicated
+    # Merge all results: link pass 1 and pass 2 rows into one per person
+    # (alias addresses, profile-page duplicates), pass 1 winning conflicts
+    final_results = link([{**r, 'source': 'pass1'} for r in cleaned_pass1] +
+                         [{**r, 'source': 'pass2'} for r in all_new_results])
+    log(f"Linked {len(cleaned_pass1) + len(all_new_results)} records into {len(final_results)} people")
     
     log(f"\n{'=' * 70}")
     log(f"FINAL RESULTS")
@@ -773,7 +768,8 @@ def main():
     # Save CSV
     output_csv = 'berkeley_dept_emails.csv'
     with open(output_csv, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=['email', 'name', 'department', 'source_url'])
+        writer = csv.DictWriter(f, fieldnames=['email', 'name', 'department', 'source_url'],
+                                extrasaction='ignore')
         writer.writeheader()
         for r in final_results:
             writer.writerow(r)
@@ -13,6 +13,8 @@ import json
 import time
 from urllib.parse import urljoin
 
+from record_linkage import link
+
 
 def log(msg):
     print(msg, flush=True)
@@ -465,18 +467,10 @@ def main():
     
     log(f"\nNew emails from pass 3: {len(all_new)}")
     
-    # Merge with existing
-    final = current_results + all_new
-    
-    # Deduplicate
-    seen = set()
-    deduped = []
-    for r in final:
-        email = r['email'].lower().strip()
-        if email not in seen:
-            seen.add(email)
-            deduped.append(r)
-    final = deduped
+    # Merge with existing: link into one row per person, current results first
+    final = link([{**r, 'source': 'current'} for r in current_results] +
+                 [{**r, 'source': 'pass3'} for r in all_new])
+    log(f"Linked {len(current_results) + len(all_new)} records into {len(final)} people")
     
     log(f"\n{'=' * 70}")
     log(f"FINAL MERGED RESULTS")
@@ -485,7 +479,8 @@ def main():
     
     # Save
     with open('berkeley_dept_emails.csv', 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=['email', 'name', 'department', 'source_url'])
+        writer = csv.DictWriter(f, fieldnames=['email', 'name', 'department', 'source_url'],
+                                extrasaction='ignore')
         writer.writeheader()
         for r in final:
             writer.writerow(r)
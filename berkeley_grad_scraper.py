@@ -5,13 +5,13 @@ Scrapes @berkeley.edu emails from department people/graduate-student pages.
 """
 
 import requests
-from bs4 import BeautifulSoup
 import re
-import csv
-import json
 import time
 from urllib.parse import urljoin
 
+from contact_records import CONTACT_FIELDS, ContactList, write_csv, write_json
+from page_cache import PAGES
+
 
 def log(msg):
     print(msg, flush=True)
@@ -367,10 +367,13 @@ def is_admin_email(email):
 
 def get_soup(url, session):
     """Fetch a page and return BeautifulSoup object."""
+    cached = PAGES.lookup(url)
+    if cached:
+        return cached
     try:
         resp = session.get(url, headers=HEADERS, timeout=20, allow_redirects=True)
         if resp.status_code == 200:
-            return BeautifulSoup(resp.text, 'html.parser'), resp.url
+            return PAGES.store(url, resp)
         else:
             return None, None
     except Exception as e:
@@ -426,6 +429,7 @@ def try_get_name_for_email(soup, email):
 # STRUCTURED EXTRACTION: Card/grid-based people listings
 # ============================================================
 
+@PAGES.memoize
 def extract_from_person_cards(soup, url, department):
     """Extract people from card/grid-based layouts (common in Drupal/Open Berkeley)."""
     results = []
@@ -597,6 +601,10 @@ def scrape_department(config, session):
         if final_url:
             all_pages_scraped.add(final_url)
 
+        if not PAGES.first_visit(soup, department):
+            log(f"    -> Same content as an earlier page, skipped")
+            continue
+
         page_text = soup.get_text(separator=' ', strip=True)
 
         # Check if this looks like a people/student listing page
@@ -678,6 +686,9 @@ def scrape_department(config, session):
                 page_soup, page_final = get_soup(page_url, session)
                 if page_soup is None:
                     continue
+                if not PAGES.first_visit(page_soup, department):
+                    log(f"    -> Same content as an earlier page, skipped")
+                    continue
 
                 # Extract from paginated page
                 pg_text = page_soup.get_text(separator=' ', strip=True)
@@ -743,7 +754,7 @@ def scrape_department(config, session):
 
 def main():
     session = requests.Session()
-    all_results = []
+    all_results = ContactList()
     global_seen_emails = set()
 
     log("=" * 70)
@@ -769,20 +780,16 @@ def main():
     log(f"RESULTS SUMMARY")
     log(f"{'=' * 70}")
     log(f"Total unique @berkeley.edu emails: {len(all_results)}")
+    log(f"Page cache: {PAGES.summary()}")
 
     # Save CSV
     output_csv = 'berkeley_dept_emails.csv'
-    with open(output_csv, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=['email', 'name', 'department', 'source_url'])
-        writer.writeheader()
-        for r in all_results:
-            writer.writerow(r)
+    write_csv(all_results, output_csv, CONTACT_FIELDS)
     log(f"\nSaved to {output_csv}")
 
     # Save JSON
     output_json = 'berkeley_dept_emails.json'
-    with open(output_json, 'w') as f:
-        json.dump(all_results, f, indent=2)
+    write_json(all_results, output_json)
     log(f"Saved to {output_json}")
 
     # Print summary by department
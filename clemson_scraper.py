@@ -10,13 +10,14 @@ Scrapes @clemson.edu and @g.clemson.edu emails from:
 """
 
 import requests
-from bs4 import BeautifulSoup
 import re
-import csv
-import json
 import time
 from urllib.parse import urljoin
 
+from contact_records import CONTACT_FIELDS, ContactList, write_csv, write_json
+from lead_store import write_contacts
+from page_cache import PAGES
+
 
 def log(msg):
     print(msg, flush=True)
@@ -92,10 +93,13 @@ def is_admin_email(email):
 
 def get_soup(url, session):
     """Fetch a page and return BeautifulSoup object."""
+    cached = PAGES.lookup(url)
+    if cached:
+        return cached
     try:
         resp = session.get(url, headers=HEADERS, timeout=20, allow_redirects=True)
         if resp.status_code == 200:
-            return BeautifulSoup(resp.text, 'html.parser'), resp.url
+            return PAGES.store(url, resp)
         else:
             log(f"    HTTP {resp.status_code}")
             return None, None
@@ -155,6 +159,7 @@ def try_get_name_for_email(soup, email):
 # STRUCTURED EXTRACTION: Person cards / grid layouts
 # ============================================================
 
+@PAGES.memoize
 def extract_from_person_cards(soup, url, department):
     """Extract people from card/grid-based layouts (Clemson sites use various CMS layouts)."""
     results = []
@@ -568,6 +573,10 @@ def scrape_department(config, session):
         if final_url:
             all_pages_scraped.add(final_url)
 
+        if not PAGES.first_visit(soup, department):
+            log(f"    -> Same content as an earlier page, skipped")
+            continue
+
         page_text = soup.get_text(separator=' ', strip=True)
         log(f"    -> Page loaded (final URL: {final_url})")
 
@@ -636,6 +645,9 @@ def scrape_department(config, session):
                 page_soup, page_final = get_soup(page_url, session)
                 if page_soup is None:
                     continue
+                if not PAGES.first_visit(page_soup, department):
+                    log(f"    -> Same content as an earlier page, skipped")
+                    continue
 
                 pg_text = page_soup.get_text(separator=' ', strip=True)
                 pg_text_emails = extract_clemson_emails(pg_text)
@@ -941,7 +953,7 @@ def scrape_athletics(session):
 
 def main():
     session = requests.Session()
-    all_results = []
+    all_results = ContactList()
     global_seen_emails = set()
 
     def add_results(results):
@@ -1041,19 +1053,17 @@ def main():
     log(f"RESULTS SUMMARY")
     log(f"{'=' * 70}")
     log(f"Total unique Clemson emails: {len(all_results)}")
+    log(f"Page cache: {PAGES.summary()}")
 
     # Save CSV
-    with open(OUTPUT_CSV, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=['email', 'name', 'department', 'source_url'])
-        writer.writeheader()
-        for r in sorted(all_results, key=lambda x: (x['department'], x['email'])):
-            writer.writerow(r)
+    write_csv(sorted(all_results, key=lambda x: (x['department'], x['email'])), OUTPUT_CSV, CONTACT_FIELDS)
     log(f"\nSaved to {OUTPUT_CSV}")
 
     # Save JSON
-    with open(OUTPUT_JSON, 'w') as f:
-        json.dump(all_results, f, indent=2)
+    write_json(all_results, OUTPUT_JSON)
     log(f"Saved to {OUTPUT_JSON}")
+    n = write_contacts(all_results, OUTPUT_CSV)
+    log(f"Stored {n} contacts in the lead store")
 
     # Summary by department
     log(f"\n{'=' * 70}")
@@ -15,21 +15,30 @@ Usage:
 
     # Live send with limit
     python college_followup.py --live --limit 1000
+
+    # Read recipients from the local Supabase mirror (see supabase_mirror.py)
+    python college_followup.py --live --from-mirror
 """
 
 import argparse
 import os
 import sys
 import time
-from datetime import datetime, timezone
 from dotenv import load_dotenv
-from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import (
     Mail, Email, To, Bcc, Personalization, Content, Category, CustomArg,
     TrackingSettings, OpenTracking,
 )
 from supabase import create_client
 
+from sequence_state import MarkFailed, mark_rows, now_iso, step_column
+from send_shaping import interleave_by_domain, DomainScheduler, DEFAULT_MAX_PER_MINUTE
+from sendgrid_retry import send_with_retry
+from suppressions import SuppressionIndex
+from supabase_paging import iter_rows
+import supabase_mirror
+from write_behind import WriteBehindLog
+
 load_dotenv()
 
 SENDGRID_API_KEY = os.getenv('SENDGRID_API_KEY')
@@ -41,6 +50,7 @@ SUPABASE_KEY = os.getenv('SUPABASE_KEY')
 
 SEND_DELAY = 0.03
 BATCH_LOG_INTERVAL = 100
+DOMAIN_MAX_PER_MINUTE = DEFAULT_MAX_PER_MINUTE
 
 VORA = {
     'app_store': 'https://apps.apple.com/us/app/vora-health/id6754351240',
@@ -191,7 +201,7 @@ def build_followup_body(audience, first_name, university):
 
 def send_email(to_email, subject, html_content, bcc_email=None,
                categories=None, custom_args=None):
-    """Send email via SendGrid. Retries once on rate limit."""
+    """Send email via SendGrid. 429/5xx responses are retried by sendgrid_retry."""
     message = Mail()
     message.from_email = Email(FROM_EMAIL, VORA['ceo_name'])
     message.subject = subject
@@ -216,19 +226,11 @@ def send_email(to_email, subject, html_content, bcc_email=None,
         for cat in categories:
             message.add_category(Category(cat))
 
-    for attempt in range(2):
-        try:
-            sg = SendGridAPIClient(SENDGRID_API_KEY)
-            response = sg.send(message)
-            return response.status_code, None
-        except Exception as e:
-            error_msg = str(e)
-            if attempt == 0 and ('429' in error_msg or 'rate' in error_msg.lower()):
-                time.sleep(2)
-                continue
-            return None, error_msg
-
-    return None, "Max retries exceeded"
+    try:
+        response = send_with_retry(SENDGRID_API_KEY, message)
+        return response.status_code, None
+    except Exception as e:
+        return None, str(e)
 
 
 # ── Supabase Helpers ─────────────────────────────────────────────────────────
@@ -240,39 +242,39 @@ def get_supabase():
     return create_client(SUPABASE_URL, SUPABASE_KEY)
 
 
-def fetch_first_round_recipients(supabase):
+def fetch_first_round_recipients(supabase, from_mirror=False):
     """Fetch everyone who was sent the first round email and hasn't received follow-up 1."""
-    all_recipients = []
-    page_size = 1000
-    offset = 0
-
-    while True:
-        response = (
-            supabase.table('college_outreach_sent')
-            .select('id,email,university,variant,first_name_used')
-            .eq('status', 'sent')
-            .is_('followup_1_at', 'null')
-            .is_('unsubscribed_at', 'null')
-            .range(offset, offset + page_size - 1)
-            .execute()
+    if from_mirror:
+        return supabase_mirror.synced_rows(
+            'college_outreach_sent', 'id,email,university,variant,first_name_used',
+            "WHERE status = 'sent' AND followup_1_at IS NULL AND unsubscribed_at IS NULL ORDER BY id",
         )
-        all_recipients.extend(response.data)
-        if len(response.data) < page_size:
-            break
-        offset += page_size
-        print(f"    ...fetched {len(all_recipients)} so far", flush=True)
+    return list(iter_rows(
+        supabase, 'college_outreach_sent', 'id,email,university,variant,first_name_used',
+        filters=lambda q: q.eq('status', 'sent').is_('followup_1_at', 'null').is_('unsubscribed_at', 'null'),
+        progress_every=10000,
+    ))
 
-    return all_recipients
 
+def write_followup_marks(supabase, rows):
+    """Set followup_1_at for a batch of records with chunked bulk updates."""
+    failed = mark_rows(supabase, 'college_outreach_sent', rows)
+    if failed:
+        # Keep the batch queued; the write-behind log retries it
+        raise MarkFailed('college_outreach_sent', failed)
+
+
+def open_followup_log(supabase):
+    """Write-behind log for follow-up marks; updates are batched off the send loop."""
+    return WriteBehindLog('college_followup_marks', lambda rows: write_followup_marks(supabase, rows))
 
-def mark_followup_sent(supabase, record_id):
-    """Mark a record as having received follow-up 1."""
-    try:
-        supabase.table('college_outreach_sent').update({
-            'followup_1_at': datetime.now(timezone.utc).isoformat(),
-        }).eq('id', record_id).execute()
-    except Exception:
-        pass
+
+def mark_followup_sent(followup_log, record_id):
+    """Queue marking a record as having received follow-up 1."""
+    followup_log.record({
+        'id': record_id,
+        step_column(1): now_iso(),
+    })
 
 
 def determine_audience(variant):
@@ -350,8 +352,9 @@ def send_test():
 
 # ── Live Send ────────────────────────────────────────────────────────────────
 
-def run_live(dry_run=False, limit=0, auto_confirm=False):
-    """Send follow-ups to all first-round recipients."""
+def run_live(dry_run=False, limit=0, auto_confirm=False, domain_rate=DOMAIN_MAX_PER_MINUTE,
+             from_mirror=False):
+    """Send follow-ups to all first-round recipients, paced per receiving domain."""
     supabase = get_supabase()
 
     print(f"\n{'='*60}", flush=True)
@@ -359,13 +362,21 @@ def run_live(dry_run=False, limit=0, auto_confirm=False):
     print(f"{'='*60}\n", flush=True)
 
     print("  Fetching first-round recipients...", flush=True)
-    recipients = fetch_first_round_recipients(supabase)
+    recipients = fetch_first_round_recipients(supabase, from_mirror)
     print(f"  Found {len(recipients)} first-round recipients", flush=True)
 
     if limit and limit > 0:
         recipients = recipients[:limit]
         print(f"  Limited to {limit}")
 
+    suppressed = SuppressionIndex()
+    before = len(recipients)
+    recipients = [r for r in recipients if r['email'] not in suppressed]
+    if before != len(recipients):
+        print(f"  Excluded {before - len(recipients)} suppressed (bounce/spam/unsubscribe)")
+
+    recipients = interleave_by_domain(recipients)
+
     # Validate: every record must have a variant we recognize
     valid_variants = {'A1', 'A2', 'A3', 'B1', 'B2', 'B3', 'grad', 'coach'}
     bad = [r for r in recipients if r.get('variant') not in valid_variants]
@@ -413,9 +424,11 @@ def run_live(dry_run=False, limit=0, auto_confirm=False):
 
     sent = 0
     failed = 0
+    followup_log = None if dry_run else open_followup_log(supabase)
     start_time = time.time()
+    scheduler = DomainScheduler(recipients, max_per_minute=domain_rate, dry_run=dry_run)
 
-    for i, r in enumerate(recipients):
+    for i, r in enumerate(scheduler):
         email = r['email']
         record_id = r.get('id')
         university = r['university'] or ''
@@ -432,6 +445,9 @@ def run_live(dry_run=False, limit=0, auto_confirm=False):
                 print(f"           Subject: {subject}", flush=True)
             continue
 
+        if email in suppressed:
+            continue
+
         html = build_followup_body(audience, first_name, university)
 
         categories = ['college_followup', f'audience_{audience}']
@@ -455,7 +471,7 @@ def run_live(dry_run=False, limit=0, auto_confirm=False):
 
         if status and 200 <= status < 300:
             sent += 1
-            mark_followup_sent(supabase, record_id)
+            mark_followup_sent(followup_log, record_id)
         else:
             failed += 1
 
@@ -470,6 +486,9 @@ def run_live(dry_run=False, limit=0, auto_confirm=False):
 
         time.sleep(SEND_DELAY)
 
+    if followup_log:
+        log_stats = followup_log.close()
+
     elapsed = time.time() - start_time
     elapsed_min = int(elapsed // 60)
     elapsed_sec = int(elapsed % 60)
@@ -482,9 +501,11 @@ def run_live(dry_run=False, limit=0, auto_confirm=False):
     else:
         print(f"  Sent: {sent}")
         print(f"  Failed: {failed}")
+        print(f"  Marked in Supabase: {log_stats['flushed']} in {log_stats['batches']} batches")
         print(f"  Time: {elapsed_min}m {elapsed_sec}s")
         if elapsed > 0:
             print(f"  Rate: {sent / elapsed:.1f} emails/sec")
+        scheduler.print_report()
     print()
 
 
@@ -497,6 +518,10 @@ def main():
     parser.add_argument('--dry-run', action='store_true', help='Show what would be sent without sending')
     parser.add_argument('--confirm', action='store_true', help='Skip confirmation prompt')
     parser.add_argument('--limit', type=int, default=0, help='Limit number of emails')
+    parser.add_argument('--from-mirror', action='store_true',
+                        help='Read recipients from the local Supabase mirror (delta sync first)')
+    parser.add_argument('--domain-rate', type=int, default=DOMAIN_MAX_PER_MINUTE,
+                        help=f'Max sends per minute to one receiving domain (default: {DOMAIN_MAX_PER_MINUTE})')
 
     args = parser.parse_args()
 
@@ -507,7 +532,8 @@ def main():
     if args.test:
         send_test()
     elif args.live:
-        run_live(dry_run=args.dry_run, limit=args.limit, auto_confirm=args.confirm)
+        run_live(dry_run=args.dry_run, limit=args.limit, auto_confirm=args.confirm,
+                 domain_rate=args.domain_rate, from_mirror=args.from_mirror)
     else:
         parser.print_help()
 
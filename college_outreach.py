@@ -21,6 +21,12 @@ Usage:
 
     # Live mode with limit
     python college_outreach.py --live --limit 1000
+
+    # Render-only: render the full send list to an archive, nothing is sent
+    python college_outreach.py --render-only
+
+    # Plan from the local Supabase mirror (see supabase_mirror.py)
+    python college_outreach.py --live --dry-run --from-mirror
 """
 
 import argparse
@@ -32,13 +38,22 @@ import random
 import json
 from datetime import datetime, timezone
 from dotenv import load_dotenv
-from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import (
     Mail, Email, To, Bcc, Personalization, Content, Category, CustomArg,
     TrackingSettings, OpenTracking,
 )
 from supabase import create_client
 
+from render_archive import render_to_archive, print_render_stats
+from send_shaping import interleave_by_domain, DomainScheduler, DEFAULT_MAX_PER_MINUTE
+from sendgrid_retry import send_with_retry
+from suppressions import SuppressionIndex
+from email_index import EmailIndex, CONTACTED
+from email_canon import canonical_email
+from supabase_export import export_tables
+import supabase_mirror
+from write_behind import WriteBehindLog
+
 load_dotenv()
 
 # ─── Configuration ───────────────────────────────────────────────────────────
@@ -52,6 +67,7 @@ SUPABASE_KEY = os.getenv('SUPABASE_KEY')
 
 SEND_DELAY = 0.03  # seconds between sends (~33/sec)
 BATCH_LOG_INTERVAL = 100  # print progress every N emails
+DOMAIN_MAX_PER_MINUTE = DEFAULT_MAX_PER_MINUTE  # per receiving domain (e.g. ucla.edu)
 
 # ─── Vora Info ───────────────────────────────────────────────────────────────
 
@@ -674,7 +690,7 @@ def build_email_body(variant, first_name, university, test_label=None):
 def send_email(to_email, subject, html_content, bcc_email=None,
                categories=None, custom_args=None):
     """Send email via SendGrid with optional BCC, categories, and custom args.
-    Retries once on failure."""
+    429/5xx responses are retried by the shared sendgrid_retry policy."""
 
     message = Mail()
     message.from_email = Email(FROM_EMAIL, VORA['ceo_name'])
@@ -703,19 +719,11 @@ def send_email(to_email, subject, html_content, bcc_email=None,
         for cat in categories:
             message.add_category(Category(cat))
 
-    for attempt in range(2):
-        try:
-            sg = SendGridAPIClient(SENDGRID_API_KEY)
-            response = sg.send(message)
-            return response.status_code, None
-        except Exception as e:
-            error_msg = str(e)
-            if attempt == 0 and ('429' in error_msg or 'rate' in error_msg.lower()):
-                time.sleep(2)  # wait on rate limit then retry
-                continue
-            return None, error_msg
-
-    return None, "Max retries exceeded"
+    try:
+        response = send_with_retry(SENDGRID_API_KEY, message)
+        return response.status_code, None
+    except Exception as e:
+        return None, str(e)
 
 
 # ─── Supabase Helpers ────────────────────────────────────────────────────────
@@ -728,85 +736,54 @@ def get_supabase():
     return create_client(SUPABASE_URL, SUPABASE_KEY)
 
 
-def fetch_all_contacts(supabase):
-    """Fetch all eligible contacts from college_contacts with pagination."""
-    all_contacts = []
-    page_size = 1000
-    offset = 0
+CONTACT_ROLES = ['student', 'student_org', 'coach']
 
-    while True:
-        response = (
-            supabase.table('college_contacts')
-            .select('id,email,name,role,segment,university,department')
-            .in_('role', ['student', 'student_org', 'coach'])
-            .range(offset, offset + page_size - 1)
-            .execute()
-        )
-        all_contacts.extend(response.data)
-        if len(response.data) < page_size:
-            break
-        offset += page_size
-
-    return all_contacts
-
-
-def fetch_already_sent(supabase):
-    """Fetch all emails already in college_outreach_sent."""
-    already_sent = set()
-    page_size = 1000
-    offset = 0
-
-    while True:
-        response = (
-            supabase.table('college_outreach_sent')
-            .select('email')
-            .range(offset, offset + page_size - 1)
-            .execute()
-        )
-        for row in response.data:
-            already_sent.add(row['email'].lower())
-        if len(response.data) < page_size:
-            break
-        offset += page_size
-
-    return already_sent
-
-
-def fetch_b2b_sent(supabase):
-    """Fetch emails already sent via B2B outreach (to avoid double-emailing)."""
-    b2b_sent = set()
-    page_size = 1000
-    offset = 0
-
-    while True:
-        response = (
-            supabase.table('outreach_sent_emails')
-            .select('email')
-            .range(offset, offset + page_size - 1)
-            .execute()
-        )
-        for row in response.data:
-            b2b_sent.add(row['email'].lower())
-        if len(response.data) < page_size:
-            break
-        offset += page_size
 
-    return b2b_sent
+def fetch_send_list_tables(from_mirror=False):
+    """
+    Pull college_contacts, college_outreach_sent and outreach_sent_emails in
+    parallel (each split into concurrent id ranges), or with from_mirror,
+    delta-sync the local mirror and read them from SQLite. Returns
+    (contacts, already_sent, b2b_sent).
+    """
+    if from_mirror:
+        supabase_mirror.sync(['college_contacts', 'college_outreach_sent', 'outreach_sent_emails'])
+        contacts = supabase_mirror.read_rows(
+            'college_contacts', 'id,email,name,role,segment,university,department',
+            f"WHERE role IN ({','.join('?' for _ in CONTACT_ROLES)})", CONTACT_ROLES,
+        )
+        return (contacts,
+                supabase_mirror.read_column_set('college_outreach_sent', 'email'),
+                supabase_mirror.read_column_set('outreach_sent_emails', 'email'))
+
+    tables = export_tables([
+        {'table': 'college_contacts', 'columns': 'id,email,name,role,segment,university,department',
+         'filters': {'role': f"in.({','.join(CONTACT_ROLES)})"}},
+        {'table': 'college_outreach_sent', 'columns': 'id,email'},
+        {'table': 'outreach_sent_emails', 'columns': 'id,email'},
+    ], supabase_url=SUPABASE_URL, supabase_key=SUPABASE_KEY)
+    already_sent = {r['email'].lower() for r in tables['college_outreach_sent'] if r.get('email')}
+    b2b_sent = {r['email'].lower() for r in tables['outreach_sent_emails'] if r.get('email')}
+    return tables['college_contacts'], already_sent, b2b_sent
+
+
+def open_sent_log(supabase):
+    """Write-behind log for college_outreach_sent; rows are inserted in bulk off the send loop."""
+    return WriteBehindLog(
+        'college_outreach_sent',
+        lambda rows: supabase.table('college_outreach_sent').insert(rows).execute(),
+    )
 
 
-def log_sent_email(supabase, email, university, variant, first_name_used, status='sent'):
-    """Log a sent email to college_outreach_sent."""
-    try:
-        supabase.table('college_outreach_sent').insert({
-            'email': email,
-            'university': university,
-            'variant': variant,
-            'first_name_used': first_name_used or '',
-            'status': status,
-        }).execute()
-    except Exception as e:
-        # If insert fails (e.g. duplicate), just log and continue
-        pass
+def log_sent_email(sent_log, email, university, variant, first_name_used, status='sent'):
+    """Queue a college_outreach_sent row."""
+    sent_log.record({
+        'email': email,
+        'university': university,
+        'variant': variant,
+        'first_name_used': first_name_used or '',
+        'status': status,
+    })
 
 
 # ─── Live Send Pipeline ─────────────────────────────────────────────────────
@@ -814,42 +791,57 @@ def log_sent_email(supabase, email, university, variant, first_name_used, status
 VARIANT_COMBOS = ['A1', 'A2', 'A3', 'B1', 'B2', 'B3']
 
 
-def prepare_send_list(supabase, limit=0):
+def prepare_send_list(supabase, limit=0, from_mirror=False):
     """
     Build the full send list:
     1. Fetch eligible contacts
-    2. Remove already-sent and B2B-sent
+    2. Remove already-sent and B2B-sent (matched on canonical keys, so
+       aliases of an address that was already emailed are skipped too)
     3. Remove non-individual names
     4. Clean names and extract first names
     5. Shuffle and assign variants round-robin
     6. Apply limit if set
+    7. Interleave by receiving domain so no school gets a burst
     """
-    print("  Fetching contacts from Supabase...")
-    contacts = fetch_all_contacts(supabase)
+    print("  Fetching contacts, already-sent and B2B-sent emails from Supabase...")
+    contacts, already_sent, b2b_sent = fetch_send_list_tables(from_mirror)
     print(f"  Found {len(contacts)} eligible contacts (student/student_org/coach)")
-
-    print("  Fetching already-sent emails...")
-    already_sent = fetch_already_sent(supabase)
     print(f"  Found {len(already_sent)} already sent")
-
-    print("  Fetching B2B sent emails...")
-    b2b_sent = fetch_b2b_sent(supabase)
     print(f"  Found {len(b2b_sent)} B2B emails to exclude")
 
+    suppressed = SuppressionIndex()
+    print(f"  Found {len(suppressed)} suppressed (bounce/spam/unsubscribe)")
+
+    # One batch lookup against the global email index (other channels' sends, known-bad addresses)
+    email_index = EmailIndex()
+    contacted = email_index.find([c['email'] for c in contacts], statuses=CONTACTED)
+    email_index.close()
+    print(f"  Found {len(contacted)} contacts the email index has as sent/bounced/suppressed/invalid")
+
+    sent_keys = {canonical_email(e) for e in already_sent | b2b_sent}
+    queued_keys = set()
+
     # Filter out already sent, non-individuals, and mislabeled staff
     excluded_sent = 0
     excluded_non_individual = 0
     excluded_mislabeled = 0
+    excluded_suppressed = 0
     eligible = []
 
     for contact in contacts:
         email_lower = contact['email'].lower()
+        key = canonical_email(email_lower)
 
-        # Skip already sent
-        if email_lower in already_sent or email_lower in b2b_sent:
+        # Skip already sent, and a second alias of an address already queued
+        if key in sent_keys or key in queued_keys:
             excluded_sent += 1
             continue
 
+        # Skip bounced / complained / unsubscribed
+        if email_lower in suppressed or email_lower in contacted:
+            excluded_suppressed += 1
+            continue
+
         # Skip non-individual names
         raw_name = contact.get('name', '') or ''
         if raw_name.strip() and is_non_individual(raw_name):
@@ -864,6 +856,7 @@ def prepare_send_list(supabase, limit=0):
 
         # Clean name
         first_name = clean_name(raw_name)
+        queued_keys.add(key)
 
         eligible.append({
             'email': contact['email'],
@@ -875,7 +868,7 @@ def prepare_send_list(supabase, limit=0):
             'first_name': first_name,
         })
 
-    print(f"  Excluded {excluded_sent} already-sent, {excluded_non_individual} non-individual names, {excluded_mislabeled} mislabeled staff")
+    print(f"  Excluded {excluded_sent} already-sent, {excluded_suppressed} suppressed, {excluded_non_individual} non-individual names, {excluded_mislabeled} mislabeled staff")
     print(f"  Eligible to send: {len(eligible)}")
 
     # Separate by audience: coaches, grad students, undergrads
@@ -910,6 +903,8 @@ def prepare_send_list(supabase, limit=0):
     if limit and limit > 0:
         eligible = eligible[:limit]
 
+    eligible = interleave_by_domain(eligible)
+
     # Print summary
     print(f"\n  SEND LIST SUMMARY ({len(eligible)} contacts):")
     print(f"  {'─' * 50}")
@@ -940,8 +935,9 @@ def prepare_send_list(supabase, limit=0):
     return eligible
 
 
-def run_live_send(send_list, supabase, dry_run=False):
-    """Send emails to the full send list. If dry_run, just print without sending."""
+def run_live_send(send_list, supabase, dry_run=False, domain_rate=DOMAIN_MAX_PER_MINUTE):
+    """Send emails to the full send list. If dry_run, just print without sending.
+    Sends are paced per receiving domain by DomainScheduler (domain_rate/min)."""
 
     total = len(send_list)
     mode_label = "DRY RUN" if dry_run else "LIVE SEND"
@@ -956,9 +952,13 @@ def run_live_send(send_list, supabase, dry_run=False):
 
     sent = 0
     failed = 0
+    skipped_suppressed = 0
+    suppressed = SuppressionIndex()
+    sent_log = None if dry_run else open_sent_log(supabase)
     start_time = time.time()
+    scheduler = DomainScheduler(send_list, max_per_minute=domain_rate, dry_run=dry_run)
 
-    for i, contact in enumerate(send_list):
+    for i, contact in enumerate(scheduler):
         email = contact['email']
         university = contact['university']
         first_name = contact['first_name']
@@ -984,6 +984,11 @@ def run_live_send(send_list, supabase, dry_run=False):
                 print(f"           Subject: {subject}")
             continue
 
+        # Suppressions can land mid-run via the event webhook
+        if email in suppressed:
+            skipped_suppressed += 1
+            continue
+
         # Build HTML
         html = build_email_body(
             variant=body_key,
@@ -1014,10 +1019,10 @@ def run_live_send(send_list, supabase, dry_run=False):
 
         if status and 200 <= status < 300:
             sent += 1
-            log_sent_email(supabase, email, university, variant, first_name, 'sent')
+            log_sent_email(sent_log, email, university, variant, first_name, 'sent')
         else:
             failed += 1
-            log_sent_email(supabase, email, university, variant, first_name, f'failed: {error}')
+            log_sent_email(sent_log, email, university, variant, first_name, f'failed: {error}')
 
         # Progress logging
         if (i + 1) % BATCH_LOG_INTERVAL == 0:
@@ -1031,6 +1036,9 @@ def run_live_send(send_list, supabase, dry_run=False):
 
         time.sleep(SEND_DELAY)
 
+    if sent_log:
+        log_stats = sent_log.close()
+
     # Final summary
     elapsed = time.time() - start_time
     elapsed_min = int(elapsed // 60)
@@ -1045,9 +1053,12 @@ def run_live_send(send_list, supabase, dry_run=False):
     else:
         print(f"  Sent: {sent}")
         print(f"  Failed: {failed}")
+        print(f"  Suppressed mid-run: {skipped_suppressed}")
+        print(f"  Logged to Supabase: {log_stats['flushed']} rows in {log_stats['batches']} batches")
         print(f"  Time: {elapsed_min}m {elapsed_sec}s")
         if elapsed > 0:
             print(f"  Rate: {sent / elapsed:.1f} emails/sec")
+        scheduler.print_report()
 
     # Variant breakdown
     print(f"\n  By variant:")
@@ -1070,6 +1081,48 @@ def run_live_send(send_list, supabase, dry_run=False):
     print()
 
 
+def render_contact(contact):
+    """Render one send-list contact for --render-only. Returns (subject, html, meta)."""
+    variant = contact['variant']
+    if variant in ('coach', 'grad'):
+        subj_key = variant
+        body_key = variant
+    else:
+        subj_key = variant[0]
+        body_key = variant[1]
+
+    subject = SUBJECT_VARIANTS[subj_key](contact['first_name'], contact['university'])
+    html = build_email_body(
+        variant=body_key,
+        first_name=contact['first_name'],
+        university=contact['university'],
+    )
+    meta = {
+        'variant': variant,
+        'university': contact['university'],
+        'role': contact.get('role', ''),
+        'first_name': contact['first_name'],
+    }
+    return subject, html, meta
+
+
+def run_render_only(send_list, workers=None, archive_path=None):
+    """Render every email in the send list into a compressed archive without sending."""
+    print(f"\n{'=' * 60}")
+    print(f"  RENDER ONLY: {len(send_list)} emails")
+    print(f"  No emails will be sent.")
+    print(f"{'=' * 60}")
+
+    if not archive_path:
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        archive_path = f"college_rendered_{stamp}.zip"
+
+    items = [(c['email'], c) for c in send_list]
+    stats = render_to_archive(render_contact, items, archive_path, workers=workers)
+    print_render_stats(stats)
+    return stats
+
+
 # ─── Test Mode ───────────────────────────────────────────────────────────────
 
 def send_test_variants(specific_variant=None):
@@ -1189,9 +1242,28 @@ def main():
     parser.add_argument('--dry-run', action='store_true', help='Show what would be sent without sending')
     parser.add_argument('--confirm', action='store_true', help='Skip confirmation prompt (use with caution)')
     parser.add_argument('--limit', type=int, default=0, help='Limit number of contacts to send to')
+    parser.add_argument('--render-only', action='store_true', help='Render the send list to a compressed archive without sending')
+    parser.add_argument('--workers', type=int, help='Worker processes for --render-only (default: CPU count)')
+    parser.add_argument('--archive', type=str, help='Archive path for --render-only')
+    parser.add_argument('--from-mirror', action='store_true',
+                        help='Plan the send list from the local Supabase mirror (delta sync first)')
+    parser.add_argument('--domain-rate', type=int, default=DOMAIN_MAX_PER_MINUTE,
+                        help=f'Max sends per minute to one receiving domain (default: {DOMAIN_MAX_PER_MINUTE})')
 
     args = parser.parse_args()
 
+    if args.render_only:
+        supabase = get_supabase()
+        print(f"\n{'=' * 60}")
+        print(f"  VORA COLLEGE OUTREACH — PREPARING SEND LIST")
+        print(f"{'=' * 60}\n")
+        send_list = prepare_send_list(supabase, limit=args.limit, from_mirror=args.from_mirror)
+        if not send_list:
+            print("\n  No contacts to render. Exiting.")
+            sys.exit(0)
+        run_render_only(send_list, workers=args.workers, archive_path=args.archive)
+        return
+
     if not SENDGRID_API_KEY:
         print("ERROR: SENDGRID_API_KEY not set in .env")
         sys.exit(1)
@@ -1203,14 +1275,14 @@ def main():
         print(f"\n{'=' * 60}")
         print(f"  VORA COLLEGE OUTREACH — PREPARING SEND LIST")
         print(f"{'=' * 60}\n")
-        send_list = prepare_send_list(supabase, limit=args.limit)
+        send_list = prepare_send_list(supabase, limit=args.limit, from_mirror=args.from_mirror)
 
         if not send_list:
             print("\n  No contacts to send to. Exiting.")
             sys.exit(0)
 
         if args.dry_run:
-            run_live_send(send_list, supabase, dry_run=True)
+            run_live_send(send_list, supabase, dry_run=True, domain_rate=args.domain_rate)
         else:
             if not args.confirm:
                 confirm = input(f"\n  Ready to send {len(send_list)} emails LIVE. Type 'yes' to confirm: ")
@@ -1219,7 +1291,7 @@ def main():
                     sys.exit(0)
             else:
                 print(f"\n  --confirm flag set. Sending {len(send_list)} emails LIVE.")
-            run_live_send(send_list, supabase, dry_run=False)
+            run_live_send(send_list, supabase, dry_run=False, domain_rate=args.domain_rate)
     else:
         parser.print_help()
 
@@ -2,11 +2,15 @@
 """
 Compile Stanford graduate student emails from department directories.
 Combines directly-scraped emails with name-based email construction.
+Rows are linked by record_linkage before writing, so a student listed by
+several departments (or once with an email, once name-only) is one row.
 """
 
 import csv
 import re
 
+from record_linkage import link
+
 results = []
 
 # =============================================================================
@@ -636,12 +640,19 @@ for name in anthropology_names:
         "source_url": "https://anthropology.stanford.edu/people/graduate-students"
     })
 
+# =============================================================================
+# Link duplicates across department listings
+# =============================================================================
+listed = len(results)
+results = link(results)
+print(f"Linked {listed} listings into {len(results)} people")
+
 # =============================================================================
 # Write CSV
 # =============================================================================
 output_path = "/Users/jaiashar/Documents/VoraBusinessFinder/stanford_dept_emails.csv"
 with open(output_path, "w", newline="", encoding="utf-8") as f:
-    writer = csv.DictWriter(f, fieldnames=["email", "name", "department", "source_url"])
+    writer = csv.DictWriter(f, fieldnames=["email", "name", "department", "source_url"], extrasaction="ignore")
     writer.writeheader()
     writer.writerows(results)
 
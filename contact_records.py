@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Vora Contact Records
+Compact in-memory rows for scraper result sets, plus streaming CSV/JSON
+writers, so a multi-school run holds tens of thousands of contacts without
+one dict (and one copy of the department and page URL) per row.
+
+- Contact is a __slots__ record for the common email / name / department /
+  source_url row; any other columns a scraper adds (title, role, lab, ...)
+  go in a small per-row dict that stays None for plain rows
+- department, source_url and the other category-like columns are interned:
+  every row from the same page shares one string object
+- Contact is a mutable mapping, so r['email'], r.get('name'),
+  r['name'] = ... and dict(r) keep working in existing scraper code
+- ContactList is a list that converts dict rows on append/extend, so a
+  scraper only changes `all_results = []` to `all_results = ContactList()`
+- write_csv / write_json stream rows to disk (tmp file + rename) instead
+  of building the whole output first; the JSON is still a plain array that
+  json.load and lead_store read, one record per line instead of indent=2
+
+Usage:
+    from contact_records import CONTACT_FIELDS, ContactList, write_csv, write_json
+
+    all_results = ContactList()
+    all_results.extend(scrape_department(config, session))   # dicts in, Contacts stored
+    write_csv(sorted(all_results, key=lambda x: x['email']), OUTPUT_CSV, CONTACT_FIELDS)
+    write_json(all_results, OUTPUT_JSON)
+
+    python contact_records.py osu_dept_emails.json     # memory: dicts vs Contacts
+"""
+
+import csv
+import json
+import os
+import sys
+import time
+import tracemalloc
+from collections.abc import MutableMapping
+
+CONTACT_FIELDS = ['email', 'name', 'department', 'source_url']
+INTERNED_FIELDS = frozenset(['department', 'source_url', 'university', 'school', 'program', 'lab',
+                             'role', 'type', 'source', 'title'])
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+# ─── Records ─────────────────────────────────────────────────────────────────
+
+class Contact(MutableMapping):
+    """One scraped contact; dict-compatible, core fields always present."""
+
+    __slots__ = ('email', 'name', 'department', 'source_url', 'extra')
+
+    def __init__(self, email='', name='', department='', source_url='', **extra):
+        self.email = email
+        self.name = name
+        self.department = _intern(department)
+        self.source_url = _intern(source_url)
+        self.extra = None
+        for key, value in extra.items():
+            self[key] = value
+
+    @classmethod
+    def from_row(cls, row):
+        if isinstance(row, cls):
+            return row
+        return cls(**row)
+
+    def __getitem__(self, key):
+        if key in CONTACT_FIELDS:
+            return getattr(self, key)
+        if self.extra is None:
+            raise KeyError(key)
+        return self.extra[key]
+
+    def __setitem__(self, key, value):
+        if key in CONTACT_FIELDS:
+            setattr(self, key, _intern(value) if key in INTERNED_FIELDS else value)
+            return
+        if self.extra is None:
+            self.extra = {}
+        self.extra[sys.intern(key)] = _intern(value) if key in INTERNED_FIELDS else value
+
+    def __delitem__(self, key):
+        if key in CONTACT_FIELDS:
+            raise KeyError(f"{key} is a core field and cannot be removed")
+        if self.extra is None:
+            raise KeyError(key)
+        del self.extra[key]
+        if not self.extra:
+            self.extra = None
+
+    def __iter__(self):
+        yield from CONTACT_FIELDS
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self):
+        return len(CONTACT_FIELDS) + (len(self.extra) if self.extra else 0)
+
+    def __contains__(self, key):
+        return key in CONTACT_FIELDS or (self.extra is not None and key in self.extra)
+
+    def __repr__(self):
+        return f"Contact({dict(self)!r})"
+
+    def __getstate__(self):
+        return (self.email, self.name, self.department, self.source_url, self.extra)
+
+    def __setstate__(self, state):
+        self.email, self.name, self.department, self.source_url, self.extra = state
+
+
+class ContactList(list):
+    """A list of Contacts that converts dict rows as they are added."""
+
+    def __init__(self, rows=()):
+        super().__init__(map(Contact.from_row, rows))
+
+    def append(self, row):
+        super().append(Contact.from_row(row))
+
+    def insert(self, index, row):
+        super().insert(index, Contact.from_row(row))
+
+    def extend(self, rows):
+        super().extend(map(Contact.from_row, rows))
+
+    def __iadd__(self, rows):
+        self.extend(rows)
+        return self
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = map(Contact.from_row, value)
+        else:
+            value = Contact.from_row(value)
+        super().__setitem__(index, value)
+
+
+# ─── Streaming Writers ───────────────────────────────────────────────────────
+
+def write_csv(rows, path, fieldnames=CONTACT_FIELDS, **fmtparams):
+    """Write `fieldnames` of each row (dict or Contact); other columns are ignored. Returns rows written."""
+    tmp = path + '.tmp'
+    count = 0
+    with open(tmp, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, **fmtparams)
+        writer.writerow(fieldnames)
+        for row in rows:
+            writer.writerow([row.get(k, '') for k in fieldnames])
+            count += 1
+    os.replace(tmp, path)
+    return count
+
+
+def write_json(rows, path, ensure_ascii=True):
+    """Write rows as a JSON array with one record per line. Returns rows written."""
+    encode = json.JSONEncoder(ensure_ascii=ensure_ascii).encode
+    tmp = path + '.tmp'
+    count = 0
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write('[')
+        for row in rows:
+            f.write(',\n  ' if count else '\n  ')
+            f.write(encode(row if type(row) is dict else dict(row)))
+            count += 1
+        f.write('\n]\n' if count else ']\n')
+    os.replace(tmp, path)
+    return count
+
+
+def read_contacts(path):
+    """A scraper JSON output (list of rows) as a ContactList."""
+    with open(path, encoding='utf-8') as f:
+        return ContactList(r for r in json.load(f) if isinstance(r, dict))
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+def measure(build):
+    tracemalloc.start()
+    rows = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return rows, size
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    for path in sys.argv[1:]:
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+        dicts, dict_bytes = measure(lambda: json.loads(text))
+        contacts, contact_bytes = measure(lambda: ContactList(json.loads(text)))
+        tmp = path + '.check'
+        t0 = time.time()
+        with open(tmp, 'w') as out:
+            json.dump(dicts, out, indent=2)
+        t_dump = time.time() - t0
+        t0 = time.time()
+        write_json(contacts, tmp)
+        t_stream = time.time() - t0
+        size = os.path.getsize(tmp)
+        os.remove(tmp)
+        print(f"  {path}: {len(contacts):,} rows")
+        print(f"    memory: {dict_bytes / 1e6:.1f} MB as dicts, {contact_bytes / 1e6:.1f} MB as Contacts")
+        print(f"    write:  json.dump indent=2 {t_dump:.2f}s ({os.path.getsize(path) / 1e6:.2f} MB on disk), "
+              f"write_json {t_stream:.2f}s ({size / 1e6:.2f} MB)")
+
+
+if __name__ == '__main__':
+    main()
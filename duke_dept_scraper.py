@@ -8,11 +8,11 @@ athletics, student orgs, and research centers.
 import requests
 from bs4 import BeautifulSoup
 import re
-import csv
-import json
 import time
 from urllib.parse import urljoin
 
+from contact_records import CONTACT_FIELDS, ContactList, write_csv, write_json
+
 
 def log(msg):
     print(msg, flush=True)
@@ -932,7 +932,7 @@ def scrape_athletics(session, global_seen_emails):
 
 def main():
     session = requests.Session()
-    all_results = []
+    all_results = ContactList()
     global_seen_emails = set()
 
     log("=" * 70)
@@ -991,17 +991,12 @@ def main():
 
     # Save CSV
     output_csv = 'duke_dept_emails.csv'
-    with open(output_csv, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=['email', 'name', 'department', 'source_url'])
-        writer.writeheader()
-        for r in sorted(all_results, key=lambda x: (x['department'], x['email'])):
-            writer.writerow(r)
+    write_csv(sorted(all_results, key=lambda x: (x['department'], x['email'])), output_csv, CONTACT_FIELDS)
     log(f"\nSaved to {output_csv}")
 
     # Save JSON
     output_json = 'duke_dept_emails.json'
-    with open(output_json, 'w') as f:
-        json.dump(all_results, f, indent=2)
+    write_json(all_results, output_json)
     log(f"Saved to {output_json}")
 
     # Print summary by department
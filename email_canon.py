@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Vora Email Canonicalization
+One canonical key per mailbox, so dedup and suppression checks match
+Jane.Doe@gmail.com, janedoe+fit@gmail.com and janedoe@googlemail.com
+(or jdoe@ucla.edu and jdoe@g.ucla.edu) as the same person.
+
+- Unicode: NFKC, zero-width characters removed, casefolded; the domain is
+  IDNA-encoded so lookalike forms of the same domain compare equal
+- alias domains that deliver to the same mailbox are mapped to one domain
+  (googlemail.com -> gmail.com, g.ucla.edu -> ucla.edu, ...)
+- providers that ignore +tags have them stripped (Gmail, Outlook/Hotmail,
+  iCloud, Proton, Fastmail, and .edu domains, which are hosted on Google or
+  Microsoft almost everywhere)
+- Gmail also ignores dots in the local part
+
+The key is for comparing, never for sending: store it next to the raw
+address and keep emailing the raw one.
+
+Usage:
+    from email_canon import canonical_email
+    canonical_email('Jane.Doe+fit@GoogleMail.com')   # 'janedoe@gmail.com'
+
+    python email_canon.py Jane.Doe+fit@gmail.com jdoe@g.ucla.edu
+"""
+
+import sys
+import unicodedata
+
+ZERO_WIDTH = dict.fromkeys(map(ord, '\u200b\u200c\u200d\u2060\ufeff\u00ad'))
+
+# Alias domain -> the domain its mailboxes are known by
+DOMAIN_ALIASES = {
+    'googlemail.com': 'gmail.com',
+    'g.ucla.edu': 'ucla.edu',
+    'eid.utexas.edu': 'utexas.edu',
+    'buckeyemail.osu.edu': 'osu.edu',
+    'u.northwestern.edu': 'northwestern.edu',
+    'uiuc.edu': 'illinois.edu',
+}
+
+DOTLESS_DOMAINS = {'gmail.com'}
+PLUS_TAG_DOMAINS = {
+    'gmail.com', 'outlook.com', 'hotmail.com', 'live.com', 'msn.com', 'icloud.com', 'me.com', 'mac.com',
+    'protonmail.com', 'proton.me', 'pm.me', 'fastmail.com',
+}
+
+
+def canonical_domain(domain):
+    domain = domain.strip().strip('.')
+    try:
+        domain = domain.encode('idna').decode('ascii')
+    except UnicodeError:
+        pass  # not a valid IDNA label; compare it as-is
+    return DOMAIN_ALIASES.get(domain, domain)
+
+
+def canonical_email(email):
+    """Canonical key of an address ('' if it is not one)."""
+    text = unicodedata.normalize('NFKC', email or '').translate(ZERO_WIDTH).strip().casefold()
+    if text.startswith('mailto:'):
+        text = text[len('mailto:'):]
+    local, sep, domain = text.rpartition('@')
+    if not sep or not local or not domain:
+        return ''
+    domain = canonical_domain(domain)
+    if domain in PLUS_TAG_DOMAINS or domain.endswith('.edu'):
+        local = local.split('+', 1)[0] or local
+    if domain in DOTLESS_DOMAINS:
+        local = local.replace('.', '')
+    return f"{local}@{domain}"
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python email_canon.py <email> [email ...]")
+        sys.exit(1)
+    for email in sys.argv[1:]:
+        print(f"  {email:<40} -> {canonical_email(email)}")
+
+
+if __name__ == '__main__':
+    main()
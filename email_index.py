@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""
+Vora Email Index
+One persistent membership index over every address we have discovered,
+sent to, seen bounce, suppressed or found invalid, so harvesters and
+senders check candidates against everything at once instead of each
+loading its own partial sets.
+
+- email_index.db holds the exact (email, status, source) rows, plus each
+  address's canonical key (email_canon); lookups match on the key, so
+  jane.doe+fit@gmail.com finds janedoe@gmail.com
+- email_index.bloom is a Bloom filter over every indexed key, read
+  through mmap: most new candidates are rejected by a few bit lookups,
+  and only the rest go to SQLite, in batches of IN (...) queries
+- writers set bloom bits inside the SQLite write transaction, so
+  concurrent processes never race on the bit array; when the index grows
+  past the filter's capacity it is rebuilt at twice the size and readers
+  reopen it (tracked by a generation number in the db)
+- `import` folds in the existing sources: the suppression store, the lead
+  store, the Supabase mirror, the real estate ledger (and its legacy
+  sent_emails.json) and the legacy instagram_test lists; re-importing is
+  idempotent
+
+Statuses: discovered, sent, bounced, suppressed, invalid.
+
+Usage:
+    # Build / refresh the index from every known source
+    python email_index.py import
+
+    # Statuses of some addresses
+    python email_index.py check someone@gmail.com
+
+    # Candidates (one per line) that are not indexed as sent/bounced/suppressed/invalid
+    python email_index.py filter candidates.txt --status sent bounced suppressed invalid
+
+    from email_index import EmailIndex
+    index = EmailIndex()
+    fresh = index.new_emails(candidates)                  # not indexed at all
+    blocked = index.find(emails, statuses=CONTACTED)      # {email: {statuses}}
+    index.add(found, 'discovered', 'web_email_harvester')
+"""
+
+import argparse
+import csv
+import glob
+import hashlib
+import json
+import math
+import mmap
+import os
+import sqlite3
+import struct
+import sys
+import time
+
+from email_canon import canonical_email
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+INDEX_DB = os.getenv('EMAIL_INDEX_DB', os.path.join(BASE_DIR, 'email_index.db'))
+REAL_ESTATE_LEDGER_DB = os.getenv('REAL_ESTATE_LEDGER_DB', os.path.join(BASE_DIR, 'RealEstateOutreach', 'ledger.db'))
+
+STATUSES = ('discovered', 'sent', 'bounced', 'suppressed', 'invalid')
+CONTACTED = ('sent', 'bounced', 'suppressed', 'invalid')  # never worth another first-touch email
+
+BLOOM_MAGIC = b'VBLOOM01'
+BLOOM_HEADER = struct.Struct('<8sQI4x')  # magic, bits, hashes
+BLOOM_FP_RATE = 0.01
+MIN_CAPACITY = 100_000
+QUERY_CHUNK = 500
+
+# Suppression reasons -> index status
+SUPPRESSION_STATUS = {
+    'bounce': 'bounced',
+    'dropped': 'bounced',
+    'smtp_invalid': 'invalid',
+    'invalid': 'invalid',
+}
+
+# (path relative to repo root, status)
+LEGACY_FILES = [
+    ('RealEstateOutreach/sent_emails.json', 'sent'),
+    ('instagram_test/final_unsent.json', 'discovered'),
+    ('instagram_test/unsent_emails.json', 'discovered'),
+    ('instagram_test/verified_ready.json', 'discovered'),
+    ('instagram_test/smtp_bad_all.json', 'invalid'),
+]
+LEGACY_CSV_GLOBS = ['instagram_test/*leads*.csv']
+
+# Supabase mirror table -> status of its emails
+MIRROR_STATUS = {
+    'college_contacts': 'discovered',
+    'consumer_leads': 'discovered',
+    'investor_leads': 'discovered',
+    'college_outreach_sent': 'sent',
+    'outreach_sent_emails': 'sent',
+}
+
+
+def normalize_email(email):
+    return (email or '').strip().lower()
+
+
+def bloom_size(capacity, fp_rate=BLOOM_FP_RATE):
+    """(bits, hashes) for `capacity` emails at `fp_rate` false positives."""
+    bits = int(math.ceil(-capacity * math.log(fp_rate) / (math.log(2) ** 2)))
+    bits = (bits + 7) // 8 * 8
+    return bits, max(1, round(bits / capacity * math.log(2)))
+
+
+# ─── Index ───────────────────────────────────────────────────────────────────
+
+class EmailIndex:
+    def __init__(self, path=None):
+        self.path = path or INDEX_DB
+        self.bloom_path = os.path.splitext(self.path)[0] + '.bloom'
+        self.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS memberships (
+                email TEXT NOT NULL,
+                status TEXT NOT NULL,
+                source TEXT,
+                added_at REAL NOT NULL,
+                canonical TEXT,
+                PRIMARY KEY (email, status)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_memberships_status ON memberships (status);
+            CREATE TABLE IF NOT EXISTS index_meta (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+        """)
+        self._add_canonical_keys()
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_memberships_canonical ON memberships (canonical)')
+        self.bloom = None
+        self.bloom_file = None
+        self.generation = None
+        self._open_bloom()
+
+    def _add_canonical_keys(self):
+        """Give indexes built before canonical keys their keys (and a filter rebuilt over them)."""
+        columns = [row[1] for row in self.conn.execute('PRAGMA table_info(memberships)')]
+        if 'canonical' in columns:
+            return
+        self.conn.execute('BEGIN IMMEDIATE')
+        self.conn.execute('ALTER TABLE memberships ADD COLUMN canonical TEXT')
+        self.conn.executemany('UPDATE memberships SET canonical = ? WHERE email = ?',
+                              [(canonical_email(e), e) for (e,) in
+                               self.conn.execute('SELECT DISTINCT email FROM memberships').fetchall()])
+        self.conn.execute("DELETE FROM index_meta WHERE key = 'bloom_generation'")
+        self.conn.execute('COMMIT')
+
+    def _meta(self, key, default=None):
+        row = self.conn.execute('SELECT value FROM index_meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, key, value):
+        self.conn.execute('INSERT OR REPLACE INTO index_meta (key, value) VALUES (?, ?)', (key, value))
+
+    # ─── Bloom filter ────────────────────────────────────────────────────────
+
+    def _open_bloom(self):
+        """Map the current filter, rebuilding it if it is missing or stale."""
+        self._close_bloom()
+        generation = self._meta('bloom_generation')
+        try:
+            f = open(self.bloom_path, 'r+b')
+        except FileNotFoundError:
+            f = None
+        if f is not None:
+            magic, bits, hashes = BLOOM_HEADER.unpack(f.read(BLOOM_HEADER.size))
+            if generation is not None and magic == BLOOM_MAGIC and \
+                    os.fstat(f.fileno()).st_size == BLOOM_HEADER.size + bits // 8:
+                self.bloom_file = f
+                self.bloom = mmap.mmap(f.fileno(), 0)
+                self.bits, self.hashes = bits, hashes
+                self.generation = generation
+                return
+            f.close()
+        self.rebuild_bloom()
+
+    def _close_bloom(self):
+        if self.bloom is not None:
+            self.bloom.close()
+            self.bloom_file.close()
+            self.bloom = self.bloom_file = None
+
+    def _check_generation(self):
+        """Reopen the filter if another process rebuilt it."""
+        if self._meta('bloom_generation') != self.generation:
+            self._open_bloom()
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1, h2 = struct.unpack('<QQ', digest)
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def _bloom_has(self, key):
+        bloom, base = self.bloom, BLOOM_HEADER.size
+        return all(bloom[base + (p >> 3)] & (1 << (p & 7)) for p in self._positions(key))
+
+    def _bloom_add(self, key):
+        bloom, base = self.bloom, BLOOM_HEADER.size
+        for p in self._positions(key):
+            bloom[base + (p >> 3)] |= 1 << (p & 7)
+
+    def rebuild_bloom(self, capacity=None):
+        """Write a fresh filter sized for the index (with room to double) and bump the generation."""
+        self._close_bloom()
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            rows = self.conn.execute('SELECT COUNT(*) FROM memberships').fetchone()[0]
+            capacity = capacity or max(MIN_CAPACITY, rows * 2)
+            self.bits, self.hashes = bloom_size(capacity)
+            tmp = self.bloom_path + '.tmp'
+            with open(tmp, 'w+b') as f:
+                f.write(BLOOM_HEADER.pack(BLOOM_MAGIC, self.bits, self.hashes))
+                f.truncate(BLOOM_HEADER.size + self.bits // 8)
+                self.bloom = mmap.mmap(f.fileno(), 0)
+                for (key,) in self.conn.execute('SELECT canonical FROM memberships'):
+                    self._bloom_add(key)
+                self.bloom.flush()
+                self.bloom.close()
+            os.replace(tmp, self.bloom_path)
+            self.generation = (self._meta('bloom_generation') or 0) + 1
+            self._set_meta('bloom_generation', self.generation)
+            self._set_meta('bloom_capacity', capacity)
+            self._set_meta('rows', rows)
+            self.conn.execute('COMMIT')
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+        self.bloom_file = open(self.bloom_path, 'r+b')
+        self.bloom = mmap.mmap(self.bloom_file.fileno(), 0)
+
+    # ─── Writing ─────────────────────────────────────────────────────────────
+
+    def add(self, emails, status, source=None):
+        """Index emails under `status`. Returns the number of new (email, status) rows."""
+        if status not in STATUSES:
+            raise ValueError(f"Unknown status {status!r}; expected one of {', '.join(STATUSES)}")
+        emails = {normalize_email(e) for e in emails}
+        rows = [(e, canonical_email(e)) for e in emails if '@' in e]
+        if not rows:
+            return 0
+        self._check_generation()
+        now = time.time()
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO memberships (email, status, source, added_at, canonical) '
+                'VALUES (?, ?, ?, ?, ?)',
+                [(e, status, source, now, key) for e, key in rows],
+            )
+            added = self.conn.total_changes - before
+            for _, key in rows:
+                self._bloom_add(key)
+            total = (self._meta('rows') or 0) + added
+            self._set_meta('rows', total)
+            self.conn.execute('COMMIT')
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+        if total > self._meta('bloom_capacity', MIN_CAPACITY):
+            self.rebuild_bloom()
+        return added
+
+    # ─── Lookups ─────────────────────────────────────────────────────────────
+
+    def find(self, emails, statuses=None):
+        """
+        {email: {statuses}} for the given emails whose canonical key is indexed
+        (under `statuses`, if set). Keys of the result are the lowercased inputs.
+        """
+        self._check_generation()
+        by_key = {}
+        for e in map(normalize_email, emails):
+            key = canonical_email(e)
+            if key and self._bloom_has(key):
+                by_key.setdefault(key, []).append(e)
+        maybe = sorted(by_key)
+        found = {}
+        status_sql, status_params = '', []
+        if statuses:
+            status_sql = f" AND status IN ({', '.join('?' for _ in statuses)})"
+            status_params = list(statuses)
+        for start in range(0, len(maybe), QUERY_CHUNK):
+            chunk = maybe[start:start + QUERY_CHUNK]
+            for key, status in self.conn.execute(
+                    f"SELECT canonical, status FROM memberships WHERE canonical IN ({', '.join('?' for _ in chunk)})"
+                    f"{status_sql}", chunk + status_params):
+                for email in by_key[key]:
+                    found.setdefault(email, set()).add(status)
+        return found
+
+    def new_emails(self, emails, statuses=None, batch=10_000):
+        """Yield the candidates not indexed (under `statuses`, if set), `batch` at a time."""
+        emails = iter(emails)
+        while True:
+            chunk = [e for _, e in zip(range(batch), emails)]
+            if not chunk:
+                return
+            known = self.find(chunk, statuses)
+            for e in chunk:
+                if normalize_email(e) not in known:
+                    yield e
+
+    def __contains__(self, email):
+        return bool(self.find([email]))
+
+    def counts(self):
+        return dict(self.conn.execute('SELECT status, COUNT(*) FROM memberships GROUP BY status'))
+
+    def close(self):
+        self._close_bloom()
+        self.conn.close()
+
+
+# ─── Import ──────────────────────────────────────────────────────────────────
+
+def read_email_list(path):
+    """Emails from a JSON list (strings or dicts), a JSON {email: ...} map, or a CSV with an email column."""
+    if path.endswith('.csv'):
+        with open(path, encoding='utf-8', errors='replace', newline='') as f:
+            return [row.get('email') for row in csv.DictReader(f)]
+    with open(path) as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        return list(data)
+    return [e.get('email') if isinstance(e, dict) else e for e in data]
+
+
+def import_sources(index):
+    """Fold every known source into the index. Returns {source: new rows}."""
+    results = {}
+
+    from suppressions import SUPPRESSION_DB
+    if os.path.exists(SUPPRESSION_DB):
+        sconn = sqlite3.connect(SUPPRESSION_DB)
+        by_status = {}
+        for email, reason in sconn.execute('SELECT email, reason FROM suppressions'):
+            by_status.setdefault(SUPPRESSION_STATUS.get(reason, 'suppressed'), []).append(email)
+        sconn.close()
+        for status, emails in by_status.items():
+            results[f'suppressions.db ({status})'] = index.add(emails, status, 'suppressions.db')
+
+    from lead_store import LEAD_DB
+    if os.path.exists(LEAD_DB):
+        lconn = sqlite3.connect(LEAD_DB)
+        emails = [e for (e,) in lconn.execute('SELECT email FROM contacts')]
+        lconn.close()
+        results['leads.db'] = index.add(emails, 'discovered', 'leads.db')
+
+    import supabase_mirror
+    if os.path.exists(supabase_mirror.MIRROR_DB):
+        for table, status in MIRROR_STATUS.items():
+            try:
+                emails = [r['email'] for r in supabase_mirror.read_rows(table, 'email')]
+            except (supabase_mirror.MirrorMissing, sqlite3.OperationalError):
+                continue
+            results[f'mirror:{table}'] = index.add(emails, status, f'mirror:{table}')
+
+    if os.path.exists(REAL_ESTATE_LEDGER_DB):
+        rconn = sqlite3.connect(REAL_ESTATE_LEDGER_DB)
+        emails = [e for (e,) in rconn.execute("SELECT email FROM sends WHERE status = 'sent'")]
+        rconn.close()
+        results['RealEstateOutreach/ledger.db'] = index.add(emails, 'sent', 'RealEstateOutreach/ledger.db')
+
+    for rel_path, status in LEGACY_FILES:
+        path = os.path.join(BASE_DIR, rel_path)
+        if os.path.exists(path):
+            results[rel_path] = index.add(read_email_list(path), status, rel_path)
+    for pattern in LEGACY_CSV_GLOBS:
+        for path in sorted(glob.glob(os.path.join(BASE_DIR, pattern))):
+            rel_path = os.path.relpath(path, BASE_DIR)
+            results[rel_path] = index.add(read_email_list(path), 'discovered', rel_path)
+    return results
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description='Global email membership index')
+    parser.add_argument('--db', type=str, help=f'Index path (default: {INDEX_DB})')
+    sub = parser.add_subparsers(dest='command')
+    sub.add_parser('import', help='Index every known source (idempotent)')
+    p_check = sub.add_parser('check', help='Show the statuses of addresses')
+    p_check.add_argument('emails', nargs='+')
+    p_filter = sub.add_parser('filter', help='Print candidates that are not indexed')
+    p_filter.add_argument('file', nargs='?', help='One email per line (default: stdin)')
+    p_filter.add_argument('--status', nargs='+', choices=STATUSES, help='Only count these statuses as known')
+    p_add = sub.add_parser('add', help='Index emails (one per line) under a status')
+    p_add.add_argument('status', choices=STATUSES)
+    p_add.add_argument('file', nargs='?', help='One email per line (default: stdin)')
+    p_add.add_argument('--source', type=str)
+    sub.add_parser('stats', help='Counts by status')
+    sub.add_parser('rebuild', help='Rebuild the Bloom filter')
+    args = parser.parse_args()
+
+    if args.command is None:
+        parser.print_help()
+        sys.exit(1)
+
+    index = EmailIndex(args.db)
+    try:
+        if args.command == 'import':
+            for source, added in import_sources(index).items():
+                print(f"  {source:<45} +{added:,}")
+            print(f"\n  {sum(index.counts().values()):,} indexed (email, status) rows")
+        elif args.command == 'check':
+            found = index.find(args.emails)
+            for email in args.emails:
+                statuses = found.get(normalize_email(email))
+                print(f"  {email}: {', '.join(sorted(statuses)) if statuses else 'not indexed'}")
+        elif args.command in ('filter', 'add'):
+            f = open(args.file) if args.file else sys.stdin
+            lines = (line.strip() for line in f)
+            if args.command == 'filter':
+                for email in index.new_emails((e for e in lines if e), args.status):
+                    print(email)
+            else:
+                added = index.add([e for e in lines if e], args.status, args.source or args.file)
+                print(f"  {added:,} new {args.status} rows")
+        elif args.command == 'stats':
+            counts = index.counts()
+            print(f"  Index: {index.path} (bloom: {index.bits // 8 // 1024:,} KB, {index.hashes} hashes)\n")
+            for status in STATUSES:
+                print(f"    {status:<12} {counts.get(status, 0):>9,}")
+        elif args.command == 'rebuild':
+            index.rebuild_bloom()
+            print(f"  Rebuilt: {index.bits:,} bits, {index.hashes} hashes (generation {index.generation})")
+    finally:
+        index.close()
+
+
+if __name__ == '__main__':
+    main()
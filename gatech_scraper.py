@@ -12,13 +12,15 @@ Scrapes @gatech.edu emails from:
 """
 
 import requests
-from bs4 import BeautifulSoup
 import re
-import csv
 import json
 import time
 from urllib.parse import urljoin
 
+from contact_records import CONTACT_FIELDS, ContactList, write_csv, write_json
+from lead_store import write_contacts
+from page_cache import PAGES
+
 
 def log(msg):
     print(msg, flush=True)
@@ -99,10 +101,13 @@ def is_admin_email(email):
 
 def get_soup(url, session):
     """Fetch a page and return BeautifulSoup object."""
+    cached = PAGES.lookup(url)
+    if cached:
+        return cached
     try:
         resp = session.get(url, headers=HEADERS, timeout=20, allow_redirects=True)
         if resp.status_code == 200:
-            return BeautifulSoup(resp.text, 'html.parser'), resp.url
+            return PAGES.store(url, resp)
         else:
             log(f"    HTTP {resp.status_code} for {url}")
             return None, None
@@ -162,6 +167,7 @@ def try_get_name_for_email(soup, email):
 # STRUCTURED EXTRACTION: Person cards / grid layouts
 # ============================================================
 
+@PAGES.memoize
 def extract_from_person_cards(soup, url, department):
     """Extract people from card/grid-based layouts."""
     results = []
@@ -702,6 +708,10 @@ def scrape_department(config, session, global_seen_emails):
         if final_url:
             all_pages_scraped.add(final_url)
 
+        if not PAGES.first_visit(soup, department):
+            log(f"    -> Same content as an earlier page, skipped")
+            continue
+
         page_text = soup.get_text(separator=' ', strip=True)
         effective_url = final_url or url
         log(f"    -> Page loaded ({len(page_text)} chars)")
@@ -771,6 +781,9 @@ def scrape_department(config, session, global_seen_emails):
                 page_soup, page_final = get_soup(page_url, session)
                 if page_soup is None:
                     continue
+                if not PAGES.first_visit(page_soup, department):
+                    log(f"    -> Same content as an earlier page, skipped")
+                    continue
 
                 pg_text = page_soup.get_text(separator=' ', strip=True)
                 pg_text_emails = extract_gatech_emails(pg_text)
@@ -960,7 +973,7 @@ def try_gatech_directory_api(session, global_seen_emails):
 
 def main():
     session = requests.Session()
-    all_results = []
+    all_results = ContactList()
     global_seen_emails = set()
 
     def add_results(results):
@@ -1087,19 +1100,17 @@ def main():
     log(f"RESULTS SUMMARY")
     log(f"{'=' * 70}")
     log(f"Total unique @gatech.edu emails: {len(all_results)}")
+    log(f"Page cache: {PAGES.summary()}")
 
     # Save CSV
-    with open(OUTPUT_CSV, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=['email', 'name', 'department', 'source_url'])
-        writer.writeheader()
-        for r in sorted(all_results, key=lambda x: (x['department'], x['email'])):
-            writer.writerow(r)
+    write_csv(sorted(all_results, key=lambda x: (x['department'], x['email'])), OUTPUT_CSV, CONTACT_FIELDS)
     log(f"\nSaved to {OUTPUT_CSV}")
 
     # Save JSON
-    with open(OUTPUT_JSON, 'w') as f:
-        json.dump(all_results, f, indent=2)
+    write_json(all_results, OUTPUT_JSON)
     log(f"Saved to {OUTPUT_JSON}")
+    n = write_contacts(all_results, OUTPUT_CSV)
+    log(f"Stored {n} contacts in the lead store")
 
     # Summary by department
     log(f"\n{'=' * 70}")
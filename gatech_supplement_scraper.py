@@ -13,6 +13,8 @@ import json
 import time
 from urllib.parse import urljoin
 
+from lead_store import write_contacts
+
 
 def log(msg):
     print(msg, flush=True)
@@ -659,6 +661,8 @@ def main():
     with open(OUTPUT_JSON, 'w') as f:
         json.dump(all_results, f, indent=2)
     log(f"Saved to {OUTPUT_JSON}")
+    n = write_contacts(all_results, OUTPUT_CSV)
+    log(f"Stored {n} contacts in the lead store")
 
     # Summary
     log(f"\n{'=' * 70}")
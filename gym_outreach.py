@@ -12,6 +12,9 @@ Usage:
     python gym_outreach.py results/gyms/irvine_ca_enriched.csv --single
     python gym_outreach.py results/gyms/irvine_ca_enriched.csv --test --limit 5
     python gym_outreach.py results/gyms/irvine_ca_enriched.csv --live
+
+    # Render-only: write every email to an archive, no sends
+    python gym_outreach.py results/gyms/irvine_ca_enriched.csv --render-only
 """
 
 import argparse
@@ -26,11 +29,15 @@ import urllib.error
 from urllib.parse import urlparse, quote as urlquote
 import ssl
 from dotenv import load_dotenv
-from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import (
     Mail, Email, To, Bcc, Personalization, Content
 )
 
+from render_archive import render_to_archive, print_render_stats
+from sendgrid_retry import send_with_retry, call_with_retry
+from suppressions import SuppressionIndex
+from write_behind import WriteBehindLog
+
 load_dotenv()
 
 # ─── Configuration ───────────────────────────────────────────────────────────
@@ -40,12 +47,15 @@ FROM_EMAIL = os.getenv('FROM_EMAIL', 'jai@askvora.com')
 BCC_EMAIL = os.getenv('BCC_EMAIL', 'jai@askvora.com')
 TEST_RECIPIENT = os.getenv('TEST_RECIPIENT', 'jaikrish15@gmail.com')
 
+SEND_DELAY = 1.0  # seconds between sends
+
 ssl._create_default_https_context = ssl._create_unverified_context
 
 # ─── Supabase Dedup Config ────────────────────────────────────────────────────
 
 SUPABASE_URL = os.getenv('SUPABASE_URL')
 SUPABASE_KEY = os.getenv('SUPABASE_KEY')
+DEDUP_CHUNK = 100  # addresses per in.(...) query
 
 # ─── Junk Email Blacklist ─────────────────────────────────────────────────────
 
@@ -78,45 +88,57 @@ def is_junk_email(email):
 
 # ─── Supabase Dedup Functions ─────────────────────────────────────────────────
 
-def supabase_check_email(email):
-    """Check if an email already exists in the outreach_sent_emails table."""
-    try:
-        email_lower = email.strip().lower()
+def supabase_fetch_sent(emails, chunk_size=DEDUP_CHUNK):
+    """
+    Return the subset of `emails` already in outreach_sent_emails, using
+    chunked `email=in.(...)` queries. Raises if any chunk fails so a run never
+    proceeds on a partial snapshot.
+    """
+    wanted = sorted({e.strip().lower() for e in emails if e and e.strip()})
+    headers = {
+        "apikey": SUPABASE_KEY,
+        "Authorization": f"Bearer {SUPABASE_KEY}",
+    }
+    already_sent = set()
+    for i in range(0, len(wanted), chunk_size):
+        in_list = ','.join(f'"{e}"' for e in wanted[i:i + chunk_size])
         url = (
             f"{SUPABASE_URL}/rest/v1/outreach_sent_emails"
-            f"?email=eq.{urlquote(email_lower)}&select=email&limit=1"
+            f"?select=email&email=in.({urlquote(in_list, safe=',')})"
         )
-        req = urllib.request.Request(url, headers={
-            "apikey": SUPABASE_KEY,
-            "Authorization": f"Bearer {SUPABASE_KEY}",
-        })
-        resp = urllib.request.urlopen(req, timeout=5)
-        data = json.loads(resp.read())
-        return len(data) > 0
-    except Exception:
-        return False
+        req = urllib.request.Request(url, headers=headers)
+        resp = call_with_retry(lambda: urllib.request.urlopen(req, timeout=30), breaker=None)
+        for r in json.loads(resp.read()):
+            already_sent.add(r['email'].strip().lower())
+    return already_sent
 
 
-def supabase_record_sent(email, business_name, city, category=''):
-    """Record a sent email in Supabase for future dedup."""
-    try:
-        payload = json.dumps({
-            "email": email.strip().lower(),
-            "business_name": business_name[:200],
-            "city": city,
-            "category": category[:50],
-            "status": "sent",
-        }).encode()
-        url = f"{SUPABASE_URL}/rest/v1/outreach_sent_emails"
-        req = urllib.request.Request(url, data=payload, headers={
-            "apikey": SUPABASE_KEY,
-            "Authorization": f"Bearer {SUPABASE_KEY}",
-            "Content-Type": "application/json",
-            "Prefer": "resolution=ignore-duplicates",
-        }, method="POST")
-        urllib.request.urlopen(req, timeout=5)
-    except Exception:
-        pass
+def supabase_insert_sent(rows):
+    """Bulk insert sent-email rows into outreach_sent_emails (raises on failure)."""
+    url = f"{SUPABASE_URL}/rest/v1/outreach_sent_emails"
+    req = urllib.request.Request(url, data=json.dumps(rows).encode(), headers={
+        "apikey": SUPABASE_KEY,
+        "Authorization": f"Bearer {SUPABASE_KEY}",
+        "Content-Type": "application/json",
+        "Prefer": "resolution=ignore-duplicates,return=minimal",
+    }, method="POST")
+    urllib.request.urlopen(req, timeout=30)
+
+
+def open_sent_log():
+    """Write-behind log for outreach_sent_emails; rows are flushed in bulk off the send loop."""
+    return WriteBehindLog('gym_outreach_sent', supabase_insert_sent)
+
+
+def supabase_record_sent(sent_log, email, business_name, city, category=''):
+    """Queue a sent email for outreach_sent_emails (future dedup)."""
+    sent_log.record({
+        "email": email.strip().lower(),
+        "business_name": business_name[:200],
+        "city": city,
+        "category": category[:50],
+        "status": "sent",
+    })
 
 
 HEADERS = {
@@ -1027,8 +1049,7 @@ def send_outreach_email(to_email, subject, html_content, bcc_email=None):
     message.add_content(Content('text/html', html_content))
 
     try:
-        sg = SendGridAPIClient(SENDGRID_API_KEY)
-        response = sg.send(message)
+        response = send_with_retry(SENDGRID_API_KEY, message)
         return response.status_code, None
     except Exception as e:
         return None, str(e)
@@ -1297,10 +1318,30 @@ def run_batch(csv_path, test_mode=True, limit=None):
     failed = 0
     skipped_junk = 0
     skipped_dedup = 0
+    skipped_suppressed = 0
+    suppressed = SuppressionIndex()
 
     csv_basename = os.path.basename(csv_path).replace('_enriched', '').replace('.csv', '')
     city = csv_basename.replace('_ca', ', CA').replace('_', ' ').title().replace(', Ca', ', CA')
 
+    # Load the dedup snapshot once: one in.(...) query per chunk of addresses
+    already_sent = set()
+    sent_log = None
+    if not test_mode:
+        candidates = [
+            row.get('email', '').strip() for row in unique_rows
+            if not is_junk_email(row.get('email', '').strip())
+        ]
+        print(f"Loading dedup snapshot for {len(candidates)} addresses...")
+        try:
+            already_sent = supabase_fetch_sent(candidates)
+        except Exception as e:
+            print(f"ERROR: could not load outreach_sent_emails for dedup: {e}")
+            print("  Stopping — not sending without a dedup snapshot.")
+            sys.exit(1)
+        print(f"  {len(already_sent)} already contacted\n")
+        sent_log = open_sent_log()
+
     print(f"Processing {total} unique gym/fitness businesses (city: {city})\n")
 
     for i, row in enumerate(unique_rows):
@@ -1318,7 +1359,12 @@ def run_batch(csv_path, test_mode=True, limit=None):
             print(f"  ⊘ Skipped (junk/placeholder email)")
             continue
 
-        if not test_mode and supabase_check_email(actual_email):
+        if not test_mode and actual_email in suppressed:
+            skipped_suppressed += 1
+            print(f"  ⊘ Skipped (suppressed — bounce/spam/unsubscribe)")
+            continue
+
+        if not test_mode and actual_email.lower() in already_sent:
             skipped_dedup += 1
             print(f"  ⊘ Skipped (already sent — dedup)")
             continue
@@ -1342,15 +1388,20 @@ def run_batch(csv_path, test_mode=True, limit=None):
             sent += 1
             print(f"  ✓ Sent to {recipient} (status {status})")
             if not test_mode:
+                already_sent.add(actual_email.lower())
                 supabase_record_sent(
-                    actual_email, business_name, city,
+                    sent_log, actual_email, business_name, city,
                     business_info.get('category', ''),
                 )
         else:
             failed += 1
             print(f"  ✗ Failed: {error}")
 
-        time.sleep(1)
+        time.sleep(SEND_DELAY)
+
+    if sent_log:
+        log_stats = sent_log.close()
+        print(f"\n  Logged {log_stats['flushed']} sends to Supabase in {log_stats['batches']} batches")
 
     print(f"\n{'=' * 60}")
     print(f"  DONE!")
@@ -1358,10 +1409,77 @@ def run_batch(csv_path, test_mode=True, limit=None):
     print(f"  Failed:       {failed}")
     print(f"  Skipped junk: {skipped_junk}")
     print(f"  Skipped dedup:{skipped_dedup}")
+    print(f"  Suppressed:   {skipped_suppressed}")
     print(f"  Total:        {total}")
     print(f"{'=' * 60}")
 
 
+def render_row(payload):
+    """Render one CSV row for --render-only. Returns (subject, html, meta)."""
+    row, enriched = payload
+    business_name = row.get('business_name', 'Unknown')
+    if enriched:
+        business_info = build_info_from_enriched_row(row)
+    else:
+        # No website lookup: render-only never touches the network
+        business_info = scrape_business_info(business_name, None)
+    subject, html = generate_email(business_info, test_mode=False)
+    meta = {
+        'business_name': business_name,
+        'category': business_info.get('category', ''),
+        'contact': business_info['contacts'][0]['name'] if business_info['contacts'] else '',
+    }
+    return subject, html, meta
+
+
+def run_render_only(csv_path, limit=None, workers=None, archive_path=None):
+    """Render every email for a CSV into a compressed archive without sending."""
+
+    print()
+    print("=" * 60)
+    print(f"  VORA GYM OUTREACH — RENDER ONLY")
+    print("  No emails will be sent.")
+    print("=" * 60)
+    print()
+
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        rows = list(reader)
+
+    seen = set()
+    unique_rows = []
+    for row in rows:
+        biz = row.get('business_name', '').strip()
+        if biz and biz not in seen:
+            seen.add(biz)
+            unique_rows.append(row)
+
+    if limit:
+        unique_rows = unique_rows[:limit]
+
+    enriched = is_enriched_csv(csv_path)
+    if not enriched:
+        print("  ⚠ CSV is not enriched — rendering from business name only")
+
+    items = []
+    skipped_junk = 0
+    for row in unique_rows:
+        actual_email = row.get('email', '').strip()
+        if not actual_email:
+            continue
+        if is_junk_email(actual_email):
+            skipped_junk += 1
+            continue
+        items.append((actual_email, (row, enriched)))
+
+    print(f"  Rendering {len(items)} emails ({skipped_junk} junk skipped)")
+
+    archive_path = archive_path or csv_path.replace('_enriched', '').replace('.csv', '_rendered.zip')
+    stats = render_to_archive(render_row, items, archive_path, workers=workers)
+    print_render_stats(stats)
+    return stats
+
+
 # ─── CLI ─────────────────────────────────────────────────────────────────────
 
 if __name__ == '__main__':
@@ -1379,6 +1497,9 @@ Examples:
   python gym_outreach.py results/gyms/irvine_ca_enriched.csv --single --row 5
   python gym_outreach.py results/gyms/irvine_ca_enriched.csv --test --limit 10
   python gym_outreach.py results/gyms/irvine_ca_enriched.csv --live
+
+  # Preview: render every email to an archive, nothing is sent
+  python gym_outreach.py results/gyms/irvine_ca_enriched.csv --render-only
         """,
     )
     parser.add_argument('csv_path', nargs='?', help='Path to CSV with leads')
@@ -1406,6 +1527,18 @@ Examples:
         '--limit', type=int,
         help='Limit number of businesses to process',
     )
+    parser.add_argument(
+        '--render-only', action='store_true',
+        help='Render every email into a compressed archive without sending',
+    )
+    parser.add_argument(
+        '--workers', type=int,
+        help='Worker processes for --render-only (default: CPU count)',
+    )
+    parser.add_argument(
+        '--archive', type=str,
+        help='Archive path for --render-only (default: <csv>_rendered.zip)',
+    )
 
     args = parser.parse_args()
 
@@ -1417,6 +1550,14 @@ Examples:
             print("ERROR: CSV path required for --enrich")
             sys.exit(1)
         enrich_csv(args.csv_path, limit=args.limit)
+    elif args.render_only:
+        if not args.csv_path:
+            print("ERROR: CSV path required for --render-only")
+            sys.exit(1)
+        run_render_only(
+            args.csv_path, limit=args.limit,
+            workers=args.workers, archive_path=args.archive,
+        )
     elif args.single or not args.csv_path:
         run_single_test(args.csv_path, args.row)
     else:
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Vora Bulk Loader
+Chunked multi-row upserts into Supabase (PostgREST) for the push_* scripts.
+
+- rows are buffered as they are streamed in and sent `chunk_size` at a time
+  over one keep-alive HTTPS connection
+- `on_conflict=email` with `resolution=ignore-duplicates` skips rows that are
+  already in the table; inserted counts come from the Content-Range header
+  (`Prefer: count=exact`), duplicates are the rest of the chunk
+- addresses repeated within a run are dropped before they are sent
+- a chunk rejected by the database is split in half until the bad rows are
+  isolated, so one malformed row costs a few requests, not the whole chunk
+- 5xx / connection errors are retried with the shared retry policy
+
+Usage:
+    from bulk_loader import BulkLoader
+
+    loader = BulkLoader('college_contacts')
+    for row in rows:
+        loader.add(row)
+    stats = loader.close()
+    print(f"+{stats['inserted']} new, {stats['duplicates']} dupes, {stats['errors']} errors")
+"""
+
+import http.client
+import json
+import os
+import ssl
+import sys
+from urllib.parse import urlparse, urlencode
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from sendgrid_retry import call_with_retry
+
+CHUNK_SIZE = 1000
+
+SSL_CTX = ssl.create_default_context()
+SSL_CTX.check_hostname = False
+SSL_CTX.verify_mode = ssl.CERT_NONE
+
+
+class PostgrestError(Exception):
+    """Non-2xx response from PostgREST. `status` drives the retry policy."""
+
+    def __init__(self, status, body, headers=None):
+        super().__init__(f"HTTP {status}: {body[:200]}")
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+
+def parse_content_range(value):
+    """Total from a Content-Range header ('*/42' or '0-9/42'), or None."""
+    if not value or '/' not in value:
+        return None
+    total = value.rsplit('/', 1)[1]
+    return int(total) if total.isdigit() else None
+
+
+class BulkLoader:
+    """
+    Buffers rows for one table and flushes them as chunked upserts.
+    Stats: inserted, duplicates, errors, requests.
+    """
+
+    def __init__(self, table, supabase_url=None, supabase_key=None, on_conflict='email',
+                 resolution='ignore-duplicates', chunk_size=CHUNK_SIZE, verbose=False):
+        self.table = table
+        self.supabase_url = supabase_url or os.getenv('SUPABASE_URL')
+        self.supabase_key = supabase_key or os.getenv('SUPABASE_KEY')
+        self.on_conflict = on_conflict
+        self.resolution = resolution
+        self.chunk_size = chunk_size
+        self.verbose = verbose
+
+        parsed = urlparse(self.supabase_url)
+        self.scheme = parsed.scheme
+        self.netloc = parsed.netloc
+        self.base_path = parsed.path.rstrip('/')
+        self.conn = None
+
+        self.buffer = []
+        self.seen = set()
+        self.stats = {'inserted': 0, 'duplicates': 0, 'errors': 0, 'requests': 0}
+        self.error_samples = []
+
+    # ─── Connection ──────────────────────────────────────────────────────────
+
+    def _connect(self):
+        if self.scheme == 'https':
+            return http.client.HTTPSConnection(self.netloc, timeout=60, context=SSL_CTX)
+        return http.client.HTTPConnection(self.netloc, timeout=60)
+
+    def _post(self, rows):
+        """POST one chunk; returns the number of rows the database wrote."""
+        columns = []
+        for row in rows:
+            for key in row:
+                if key not in columns:
+                    columns.append(key)
+        query = {'columns': ','.join(columns)}
+        if self.on_conflict:
+            query['on_conflict'] = self.on_conflict
+        path = f"{self.base_path}/rest/v1/{self.table}?{urlencode(query, safe=',')}"
+
+        prefer = ['return=minimal', 'count=exact']
+        if self.resolution:
+            prefer.append(f"resolution={self.resolution}")
+        headers = {
+            'apikey': self.supabase_key,
+            'Authorization': f"Bearer {self.supabase_key}",
+            'Content-Type': 'application/json',
+            'Prefer': ','.join(prefer),
+        }
+        body = json.dumps(rows).encode('utf-8')
+
+        if self.conn is None:
+            self.conn = self._connect()
+        self.stats['requests'] += 1
+        try:
+            self.conn.request('POST', path, body=body, headers=headers)
+            resp = self.conn.getresponse()
+            payload = resp.read().decode('utf-8', errors='replace')
+        except (http.client.HTTPException, OSError):
+            # Stale keep-alive connection: drop it and let the retry reconnect
+            self.conn.close()
+            self.conn = None
+            raise
+
+        if resp.status >= 300:
+            raise PostgrestError(resp.status, payload, dict(resp.getheaders()))
+        written = parse_content_range(resp.getheader('Content-Range'))
+        return len(rows) if written is None else written
+
+    # ─── Loading ─────────────────────────────────────────────────────────────
+
+    def add(self, row):
+        """Queue a row. Returns False if its key was already queued this run."""
+        key = row.get(self.on_conflict) if self.on_conflict else None
+        if key is not None:
+            if key in self.seen:
+                self.stats['duplicates'] += 1
+                return False
+            self.seen.add(key)
+        self.buffer.append(row)
+        if len(self.buffer) >= self.chunk_size:
+            self.flush()
+        return True
+
+    def flush(self):
+        """Send everything buffered so far."""
+        rows, self.buffer = self.buffer, []
+        if rows:
+            self._send_chunk(rows)
+        return self.stats
+
+    def _send_chunk(self, rows):
+        try:
+            written = call_with_retry(lambda: self._post(rows), breaker=None)
+        except PostgrestError as e:
+            if e.status < 500 and len(rows) > 1:
+                # Rejected by the database (bad value, check constraint):
+                # bisect to keep the good rows
+                mid = len(rows) // 2
+                self._send_chunk(rows[:mid])
+                self._send_chunk(rows[mid:])
+                return
+            self._record_error(rows, str(e))
+            return
+        except Exception as e:
+            self._record_error(rows, str(e))
+            return
+
+        self.stats['inserted'] += written
+        self.stats['duplicates'] += len(rows) - written
+        if self.verbose:
+            print(f"  chunk of {len(rows)}: +{written} new, {len(rows) - written} dupes")
+
+    def _record_error(self, rows, message):
+        self.stats['errors'] += len(rows)
+        if len(self.error_samples) < 5:
+            self.error_samples.append((rows[0].get(self.on_conflict), message))
+            print(f"  Error for {rows[0].get(self.on_conflict)} ({len(rows)} rows): {message[:150]}")
+
+    def close(self):
+        """Flush and close the connection. Returns the stats dict."""
+        self.flush()
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+        return self.stats
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Vora Bulk Update
+Chunked column backfills by key (e.g. consumer_leads.name by email) over
+PostgREST, replacing hand-run `UPDATE ... SET name = CASE email ... END` SQL.
+
+- (key, value) pairs are streamed in with add(); keys that share a value
+  are grouped, and each group is sent as `PATCH ?email=in.(...)` with the
+  value as the body, over one keep-alive connection
+- chunk size is picked from the request size: keys are packed into the
+  in.(...) filter until the URL reaches MAX_URL_BYTES, so short keys get
+  big chunks and nothing trips the gateway's request-line limit
+- updated counts come from Content-Range (`Prefer: count=exact`); keys that
+  matched no row are reported as missing (PATCH never inserts rows)
+- a chunk the database rejects is split in half until the bad keys are
+  isolated; 5xx / connection errors use the shared retry policy
+
+Usage:
+    from bulk_update import BulkUpdater
+
+    updater = BulkUpdater('consumer_leads', key='email', column='name')
+    for email, name in pairs:
+        updater.add(email, name)
+    stats = updater.close()
+    print(f"{stats['updated']} updated, {stats['missing']} missing, {stats['rows_per_sec']:.0f} rows/sec")
+"""
+
+import http.client
+import json
+import os
+import sys
+import time
+from urllib.parse import urlparse, quote
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from sendgrid_retry import call_with_retry
+from bulk_loader import PostgrestError, SSL_CTX, parse_content_range
+
+MAX_URL_BYTES = 6000  # request-line budget; proxies in front of PostgREST reject ~8 KB+
+MAX_GROUP = 2000      # keys buffered for one value before it is sent early
+
+
+def in_filter_item(value):
+    """One quoted, URL-encoded item for a PostgREST in.(...) list."""
+    text = str(value).replace('\\', '\\\\').replace('"', '\\"')
+    return quote(f'"{text}"', safe='')
+
+
+class BulkUpdater:
+    """
+    Sets `column` = value on the rows whose `key` matches, for many
+    (key, value) pairs. Stats: updated, missing, errors, requests, rows_per_sec.
+    """
+
+    def __init__(self, table, key='email', column='name', supabase_url=None, supabase_key=None,
+                 max_url_bytes=MAX_URL_BYTES, verbose=False):
+        self.table = table
+        self.key = key
+        self.column = column
+        self.supabase_url = supabase_url or os.getenv('SUPABASE_URL')
+        self.supabase_key = supabase_key or os.getenv('SUPABASE_KEY')
+        self.max_url_bytes = max_url_bytes
+        self.verbose = verbose
+
+        parsed = urlparse(self.supabase_url)
+        self.scheme = parsed.scheme
+        self.netloc = parsed.netloc
+        self.path_prefix = f"{parsed.path.rstrip('/')}/rest/v1/{table}?{key}=in."
+        self.conn = None
+
+        self.groups = {}
+        self.seen = set()
+        self.stats = {'updated': 0, 'missing': 0, 'errors': 0, 'requests': 0, 'rows_per_sec': 0.0}
+        self.start = None
+
+    # ─── Connection ──────────────────────────────────────────────────────────
+
+    def _connect(self):
+        if self.scheme == 'https':
+            return http.client.HTTPSConnection(self.netloc, timeout=60, context=SSL_CTX)
+        return http.client.HTTPConnection(self.netloc, timeout=60)
+
+    def _patch(self, items, value):
+        """PATCH one chunk of encoded keys; returns the number of rows updated."""
+        path = f"{self.path_prefix}({','.join(items)})"
+        headers = {
+            'apikey': self.supabase_key,
+            'Authorization': f"Bearer {self.supabase_key}",
+            'Content-Type': 'application/json',
+            'Prefer': 'return=minimal,count=exact',
+        }
+        body = json.dumps({self.column: value}).encode('utf-8')
+
+        if self.conn is None:
+            self.conn = self._connect()
+        self.stats['requests'] += 1
+        try:
+            self.conn.request('PATCH', path, body=body, headers=headers)
+            resp = self.conn.getresponse()
+            payload = resp.read().decode('utf-8', errors='replace')
+        except (http.client.HTTPException, OSError):
+            self.conn.close()
+            self.conn = None
+            raise
+
+        if resp.status >= 300:
+            raise PostgrestError(resp.status, payload, dict(resp.getheaders()))
+        updated = parse_content_range(resp.getheader('Content-Range'))
+        return len(items) if updated is None else updated
+
+    # ─── Updating ────────────────────────────────────────────────────────────
+
+    def add(self, key_value, value):
+        """Queue one (key, value) pair. Returns False if the key was already queued."""
+        if not key_value or key_value in self.seen:
+            return False
+        if self.start is None:
+            self.start = time.time()
+        self.seen.add(key_value)
+        group = self.groups.setdefault(value, [])
+        group.append(in_filter_item(key_value))
+        if len(group) >= MAX_GROUP:
+            self._send_group(value, self.groups.pop(value))
+        return True
+
+    def flush(self):
+        """Send every buffered group."""
+        groups, self.groups = self.groups, {}
+        for value, items in groups.items():
+            self._send_group(value, items)
+        return self.stats
+
+    def _send_group(self, value, items):
+        """Pack a value's keys into URL-sized chunks."""
+        budget = self.max_url_bytes - len(self.path_prefix) - 2
+        chunk, size = [], 0
+        for item in items:
+            if chunk and size + len(item) + 1 > budget:
+                self._send_chunk(chunk, value)
+                chunk, size = [], 0
+            chunk.append(item)
+            size += len(item) + 1
+        if chunk:
+            self._send_chunk(chunk, value)
+
+    def _send_chunk(self, items, value):
+        try:
+            updated = call_with_retry(lambda: self._patch(items, value), breaker=None)
+        except PostgrestError as e:
+            if e.status < 500 and len(items) > 1:
+                mid = len(items) // 2
+                self._send_chunk(items[:mid], value)
+                self._send_chunk(items[mid:], value)
+                return
+            self._record_error(items, value, str(e))
+            return
+        except Exception as e:
+            self._record_error(items, value, str(e))
+            return
+
+        self.stats['updated'] += updated
+        self.stats['missing'] += len(items) - updated
+        if self.verbose:
+            print(f"  {self.column}={value!r}: {updated}/{len(items)} rows")
+
+    def _record_error(self, items, value, message):
+        self.stats['errors'] += len(items)
+        print(f"  Error updating {len(items)} rows ({self.column}={value!r}): {message[:150]}")
+
+    def close(self):
+        """Flush, close the connection and compute rows/sec. Returns the stats dict."""
+        self.flush()
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+        if self.start is not None:
+            elapsed = max(time.time() - self.start, 1e-6)
+            self.stats['rows_per_sec'] = (self.stats['updated'] + self.stats['missing']) / elapsed
+        return self.stats
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
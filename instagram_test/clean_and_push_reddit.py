@@ -7,6 +7,8 @@ Applies aggressive business filtering before push.
 import os, re, json, sys
 from datetime import datetime
 
+from progress_journal import load_progress
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 PERSONAL_PROVIDERS = {
@@ -195,8 +197,7 @@ def main():
         print("  No pullpush_progress.json found.")
         return
 
-    with open(progress_file) as f:
-        data = json.load(f)
+    data = load_progress(progress_file)
 
     raw_emails = data.get("emails", {})
     print(f"  Raw emails from PullPush: {len(raw_emails)}")
@@ -7,12 +7,16 @@ Real-time bounce monitoring via SendGrid API - pauses if bounce rate spikes.
 
 import os, sys, json, time, urllib.request, urllib.parse, ssl
 from dotenv import load_dotenv
-from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import (
     Mail, Email, To, Personalization, Content, Category, CustomArg,
     TrackingSettings, ClickTracking, OpenTracking, Ganalytics
 )
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from sendgrid_retry import send_with_retry
+from suppressions import SuppressionIndex, add_suppressions
+import supabase_mirror
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 load_dotenv(os.path.join(os.path.dirname(BASE_DIR), '.env'))
 
@@ -49,7 +53,9 @@ BOUNCE_CHECK_EVERY = 100
 MAX_BOUNCE_RATE = 0.03
 
 
-def fetch_all_contacts():
+def fetch_all_contacts(from_mirror=False):
+    if from_mirror:
+        return supabase_mirror.synced_rows('consumer_leads', 'email,name,category', 'ORDER BY email')
     all_contacts = []
     batch = 1000
     for offset in range(0, 20000, batch):
@@ -209,8 +215,7 @@ def send_email(to_email, subject, html, variant='', categories=None, custom_args
     )
     message.tracking_settings = tracking
 
-    sg = SendGridAPIClient(SENDGRID_API_KEY)
-    response = sg.send(message)
+    response = send_with_retry(SENDGRID_API_KEY, message)
     return response.status_code
 
 
@@ -253,7 +258,9 @@ def main():
     already_sent_r2 = set(progress["sent"])
     print(f"  Already sent in R2: {len(already_sent_r2)}")
 
-    to_send = [c for c in contacts if c['email'] not in already_sent_r2]
+    suppressed = SuppressionIndex()
+    to_send = [c for c in contacts if c['email'] not in already_sent_r2 and c['email'] not in suppressed]
+    print(f"  Suppressed (bounce/spam/unsubscribe): {len(suppressed)}")
     print(f"  Remaining to send: {len(to_send)}")
 
     if not to_send:
@@ -275,6 +282,9 @@ def main():
         category = contact.get('category', 'fitness_consumer')
         variant = CATEGORY_TO_VARIANT.get(category, 'fitness')
 
+        if email in suppressed:
+            continue
+
         subject = get_subject(variant, name)
         html = build_email_html(variant, name)
 
@@ -353,6 +363,8 @@ def main():
         with open(os.path.join(BASE_DIR, 'r2_bounces.json'), 'w') as f:
             json.dump(our_bounces, f, indent=2)
         print(f"  Bounced emails saved to r2_bounces.json")
+        added = add_suppressions(suppressed.conn, [(e, 'bounce', None) for e in our_bounces], 'check_bounces')
+        print(f"  {added} new addresses added to the suppression store")
 
 
 if __name__ == "__main__":
@@ -30,6 +30,9 @@ import html as html_lib
 from datetime import datetime
 from urllib.parse import urlparse, quote_plus
 
+from progress_journal import ProgressJournal, load_progress
+from progress_stats import ProgressCounters, OK
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 SSL_CTX = ssl.create_default_context()
@@ -572,30 +575,33 @@ def phase2_extract():
         data = json.load(f)
     all_usernames = data.get("usernames", [])
 
+    # Each result is appended to the consumer progress journal as it comes in
+    progress = ProgressJournal(progress_file)
+    saved = len(progress)
+
     # Also merge in progress from mass_progress.json (don't re-process)
-    progress = {}
     mass_progress_file = os.path.join(BASE_DIR, "mass_progress.json")
     if os.path.exists(mass_progress_file):
         with open(mass_progress_file) as f:
-            progress = json.load(f)
-        print(f"  Loaded {len(progress)} from previous mass extraction")
-
-    if os.path.exists(progress_file):
-        with open(progress_file) as f:
-            saved = json.load(f)
-        progress.update(saved)
-        print(f"  Loaded {len(saved)} from consumer progress (total: {len(progress)})")
+            mass = json.load(f)
+        progress.preload(mass)
+        print(f"  Loaded {len(mass)} from previous mass extraction")
+    print(f"  Loaded {saved} from consumer progress (total: {len(progress)})")
 
     to_process = [u for u in all_usernames if u not in progress]
     total = len(to_process)
     emails_found = 0
     processed = 0
     businesses_skipped = 0
+    counters = open_stats_counters()
+    counters.refresh()
+    unsaved = []
 
     print(f"  {len(progress)} already processed, {total} remaining\n")
 
     for i, username in enumerate(to_process):
         processed += 1
+        unsaved.append(username)
         print(f"  [{processed}/{total}] @{username}...", end=" ", flush=True)
 
         all_emails = set()
@@ -658,19 +664,20 @@ def phase2_extract():
         else:
             print("no email")
 
-        # Save every 50 accounts
+        # Report every 50 accounts (results are already journaled)
         if processed % 50 == 0:
-            with open(progress_file, 'w') as f:
-                json.dump(progress, f, indent=1, default=str)
+            counters.record({u: progress[u] for u in unsaved}, progress_file)
+            unsaved = []
             rate = emails_found * 100 // max(processed, 1)
             total_e = count_emails(progress)
             print(f"  ── saved | {processed}/{total} | batch: {emails_found} ({rate}%) | biz skipped: {businesses_skipped} | total emails: {total_e} ──")
 
         time.sleep(random.uniform(8, 15))
 
-    # Final save
-    with open(progress_file, 'w') as f:
-        json.dump(progress, f, indent=1, default=str)
+    # Final save: fold the journal back into consumer_progress.json
+    progress.close()
+    counters.record({u: progress[u] for u in unsaved}, progress_file)
+    counters.close()
 
     build_consumer_csv(progress, csv_path)
 
@@ -751,41 +758,43 @@ def build_consumer_csv(progress, csv_path):
     return len(rows)
 
 
+def stats_entry(username, p):
+    """Reduce a progress entry to (outcome, emails) for the stats counters."""
+    if not isinstance(p, dict):
+        return OK, []
+    if p.get("error"):
+        return str(p["error"]), []
+    emails = set(p.get("emails_from_bio", []) + p.get("url_emails", []))
+    if p.get("business_email"):
+        emails.add(p["business_email"].lower())
+    return OK, emails
+
+
+def open_stats_counters():
+    return ProgressCounters(
+        'consumer_pipeline',
+        [os.path.join(BASE_DIR, "mass_progress.json"), os.path.join(BASE_DIR, "consumer_progress.json")],
+        stats_entry,
+    )
+
+
 def show_stats():
-    """Show current extraction stats."""
-    progress_file = os.path.join(BASE_DIR, "consumer_progress.json")
-    mass_file = os.path.join(BASE_DIR, "mass_progress.json")
+    """Show current extraction stats (from counters kept in progress_stats.db)."""
+    counters = open_stats_counters()
+    counters.refresh()
+    c = counters.counts()
+    counters.close()
 
-    all_progress = {}
-    if os.path.exists(mass_file):
-        with open(mass_file) as f:
-            all_progress.update(json.load(f))
-    if os.path.exists(progress_file):
-        with open(progress_file) as f:
-            all_progress.update(json.load(f))
-
-    total = len(all_progress)
-    errors = sum(1 for p in all_progress.values() if isinstance(p, dict) and p.get("error"))
-    businesses = sum(1 for p in all_progress.values() if isinstance(p, dict) and p.get("error") == "business")
-    with_email = 0
-    unique_emails = set()
-
-    for p in all_progress.values():
-        if not isinstance(p, dict) or p.get("error"):
-            continue
-        emails = set(p.get("emails_from_bio", []) + p.get("url_emails", []))
-        if p.get("business_email"):
-            emails.add(p["business_email"].lower())
-        if emails:
-            with_email += 1
-            unique_emails.update(emails)
+    total = c['total']
+    errors = total - c['outcomes'].get(OK, 0)
+    businesses = c['outcomes'].get("business", 0)
 
     print(f"  Total processed: {total}")
     print(f"  Errors/gone: {errors - businesses}")
     print(f"  Businesses skipped: {businesses}")
-    print(f"  With email: {with_email}")
-    print(f"  Unique emails: {len(unique_emails)}")
-    print(f"  Hit rate: {with_email * 100 // max(total - errors, 1)}%")
+    print(f"  With email: {c['with_email']}")
+    print(f"  Unique emails: {c['unique_emails']}")
+    print(f"  Hit rate: {c['with_email'] * 100 // max(total - errors, 1)}%")
 
 
 def main():
@@ -805,9 +814,7 @@ def main():
         if os.path.exists(mf):
             with open(mf) as f:
                 progress.update(json.load(f))
-        if os.path.exists(pf):
-            with open(pf) as f:
-                progress.update(json.load(f))
+        progress.update(load_progress(pf))
         build_consumer_csv(progress, os.path.join(BASE_DIR, "consumer_leads_all.csv"))
     elif mode in ("discover", "all"):
         print("  PHASE 1: DISCOVERY")
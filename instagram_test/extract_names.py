@@ -3,11 +3,19 @@
 Extract first names from email addresses for consumer_leads where name is NULL.
 Only extracts when pattern is OBVIOUS (firstname.lastname@).
 Validates against a large common-names list. Defaults to no name if unsure.
+
+Usage:
+  python extract_names.py                       # extract, save extracted_names.json for review
+  python extract_names.py --push                # push the reviewed extracted_names.json
+  python extract_names.py --push --extract      # extract and push in one step
+  python extract_names.py --push --from-sql name_update_batch_*.sql   # run old CASE batches
 """
 
-import os, json, re, urllib.request, ssl
+import os, json, re, sys, glob, argparse, urllib.request, ssl
 from dotenv import load_dotenv
 
+from bulk_update import BulkUpdater
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 load_dotenv(os.path.join(os.path.dirname(BASE_DIR), '.env'))
 
@@ -317,7 +325,33 @@ def extract_name(email):
     return candidate.title()
 
 
-def main():
+def load_sql_batches(paths):
+    """(email, name) pairs from UPDATE ... SET name = CASE email WHEN ... THEN ... batches."""
+    pairs = {}
+    for path in paths:
+        with open(path) as f:
+            sql = f.read()
+        for email, name in re.findall(r"WHEN '((?:[^']|'')*)' THEN '((?:[^']|'')*)'", sql):
+            pairs[email.replace("''", "'")] = name.replace("''", "'")
+    return pairs
+
+
+def push_names(found):
+    """Set consumer_leads.name for each email in one bulk pass."""
+    print(f"Pushing {len(found)} names to consumer_leads...")
+    updater = BulkUpdater('consumer_leads', key='email', column='name',
+                          supabase_url=SUPABASE_URL, supabase_key=SUPABASE_KEY)
+    for email, name in found.items():
+        updater.add(email, name)
+    stats = updater.close()
+    print(f"  Updated: {stats['updated']}")
+    print(f"  No matching lead: {stats['missing']}")
+    print(f"  Errors: {stats['errors']}")
+    print(f"  {stats['requests']} requests, {stats['rows_per_sec']:.0f} rows/sec")
+    return stats
+
+
+def extract_all():
     print("Fetching nameless emails from Supabase...")
     emails = fetch_nameless_emails()
     print(f"Found {len(emails)} emails without names.\n")
@@ -337,10 +371,42 @@ def main():
     print(f"\n{'='*60}")
     print(f"Total confident extractions: {len(found)} out of {len(emails)}")
     print(f"{'='*60}")
+    return found
 
-    with open(os.path.join(BASE_DIR, 'extracted_names.json'), 'w') as f:
-        json.dump(found, f, indent=2)
-    print(f"\nSaved to extracted_names.json for review before pushing.")
+
+def main():
+    parser = argparse.ArgumentParser(description='Extract first names for nameless consumer_leads')
+    parser.add_argument('--push', action='store_true', help='Write names to consumer_leads')
+    parser.add_argument('--extract', action='store_true', help='With --push: extract first instead of reading the JSON')
+    parser.add_argument('--from-sql', nargs='+', metavar='FILE', help='With --push: names from old CASE-statement batches')
+    args = parser.parse_args()
+
+    names_path = os.path.join(BASE_DIR, 'extracted_names.json')
+
+    if not args.push:
+        found = extract_all()
+        with open(names_path, 'w') as f:
+            json.dump(found, f, indent=2)
+        print(f"\nSaved to extracted_names.json for review before pushing.")
+        print(f"Push with: python extract_names.py --push")
+        return
+
+    if args.from_sql:
+        paths = [p for pattern in args.from_sql for p in sorted(glob.glob(pattern))]
+        found = load_sql_batches(paths)
+        print(f"Read {len(found)} names from {len(paths)} SQL batch file(s).")
+    elif args.extract:
+        found = extract_all()
+    else:
+        if not os.path.exists(names_path):
+            print("extracted_names.json not found. Run without --push first, or use --extract.")
+            sys.exit(1)
+        with open(names_path) as f:
+            found = json.load(f)
+
+    stats = push_names(found)
+    if stats['errors']:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -35,6 +35,9 @@ import html as html_lib
 from datetime import datetime
 from urllib.parse import urlparse
 
+from progress_journal import ProgressJournal, load_progress
+from progress_stats import ProgressCounters, OK
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 SSL_CTX = ssl.create_default_context()
@@ -253,6 +256,12 @@ def main():
 
     # Load usernames
     usernames_file = os.path.join(BASE_DIR, "consumer_usernames.json")
+    if mode == "stats":
+        counters = open_stats_counters()
+        counters.refresh()
+        show_stats(counters)
+        counters.close()
+        return
     if not os.path.exists(usernames_file):
         print("  No usernames file found.")
         return
@@ -261,21 +270,18 @@ def main():
         data = json.load(f)
     all_usernames = data.get("usernames", [])
 
-    # Load progress (merge from all sources so we don't re-process)
-    progress = {}
-    for pf in ["mass_progress.json", "consumer_progress.json", "ig_api_progress.json"]:
-        fp = os.path.join(BASE_DIR, pf)
-        if os.path.exists(fp):
-            with open(fp) as f:
-                p = json.load(f)
-            old = len(progress)
-            progress.update(p)
+    # Load progress (merge from all sources so we don't re-process);
+    # new results are appended to the ig_api progress journal
+    progress = ProgressJournal(progress_file)
+    print(f"  Loaded {len(progress)} from ig_api_progress.json")
+    for pf in ["consumer_progress.json", "mass_progress.json"]:
+        p = load_progress(os.path.join(BASE_DIR, pf))
+        if p:
+            progress.preload(p)
             print(f"  Loaded {len(p)} from {pf}")
 
-    if mode == "stats":
-        show_stats(progress, all_usernames)
-        return
     if mode == "csv":
+        progress.close()
         build_csv(progress, csv_path)
         return
 
@@ -289,8 +295,12 @@ def main():
     print(f"\n  {len(progress)} already processed, {total} remaining")
     print(f"  Rate: 1 req / {DELAY_MIN}-{DELAY_MAX}s, cooldown {COOLDOWN_SECONDS}s every {REQUESTS_PER_BATCH}\n")
 
+    counters = open_stats_counters()
+    counters.refresh()
+    unsaved = []
     for username in to_process:
         processed += 1
+        unsaved.append(username)
 
         # Cooldown
         if api_requests > 0 and api_requests % REQUESTS_PER_BATCH == 0:
@@ -305,6 +315,7 @@ def main():
         except urllib.error.HTTPError as e:
             if e.code in (401, 429):
                 print(f"\n  RATE LIMITED after {api_requests} requests. Re-run later to continue.")
+                unsaved.pop()
                 break
             progress[username] = {"error": str(e.code)}
             print(f"http {e.code}")
@@ -380,19 +391,20 @@ def main():
         else:
             print(f"  ~   {followers:>7,} flw | no email")
 
-        # Save every 20
+        # Report every 20 (results are already journaled)
         if processed % 20 == 0:
-            with open(progress_file, 'w') as f:
-                json.dump(progress, f, indent=1, default=str)
+            counters.record({u: progress[u] for u in unsaved}, progress_file)
+            unsaved = []
             total_e = count_consumer_emails(progress)
             rate_pct = emails_found * 100 // max(processed, 1)
             print(f"  ── saved | {processed}/{total} | {emails_found} new ({rate_pct}%) | biz={businesses_skipped} | total={total_e} ──")
 
         time.sleep(random.uniform(DELAY_MIN, DELAY_MAX))
 
-    # Final save
-    with open(progress_file, 'w') as f:
-        json.dump(progress, f, indent=1, default=str)
+    # Final save: fold the journal back into ig_api_progress.json
+    progress.close()
+    counters.record({u: progress[u] for u in unsaved}, progress_file)
+    counters.close()
 
     build_csv(progress, csv_path)
 
@@ -476,22 +488,46 @@ def build_csv(progress, csv_path):
     print(f"  Consumer emails: {len(rows)}")
 
 
-def show_stats(progress, all_usernames):
-    total = len(progress)
-    errors = sum(1 for p in progress.values() if isinstance(p, dict) and p.get("error"))
-    biz = sum(1 for p in progress.values() if isinstance(p, dict) and p.get("error") == "business")
-    celeb = sum(1 for p in progress.values() if isinstance(p, dict) and p.get("error") == "celebrity")
-    tiny = sum(1 for p in progress.values() if isinstance(p, dict) and p.get("error") == "too_small")
-    consumer_emails = count_consumer_emails(progress)
-    remaining = len([u for u in all_usernames if u not in progress])
-
-    print(f"  Total processed: {total}")
+def stats_entry(username, p):
+    """Reduce a progress entry to (outcome, consumer emails) for the stats counters."""
+    if not isinstance(p, dict):
+        return OK, []
+    if p.get("error"):
+        return str(p["error"]), []
+    if is_business_account(p.get("full_name", ""), p.get("bio", ""), username):
+        return OK, []
+    emails = {e for e in p.get("bio_emails", []) + p.get("url_emails", []) + p.get("emails_from_bio", [])
+              if is_consumer_email(e)}
+    biz_e = p.get("business_email", "")
+    if biz_e and is_consumer_email(biz_e):
+        emails.add(biz_e.lower())
+    return OK, emails
+
+
+def open_stats_counters():
+    return ProgressCounters(
+        'ig_api_harvester',
+        [os.path.join(BASE_DIR, pf) for pf in ["mass_progress.json", "consumer_progress.json", "ig_api_progress.json"]],
+        stats_entry,
+        targets_file=os.path.join(BASE_DIR, "consumer_usernames.json"),
+    )
+
+
+def show_stats(counters):
+    c = counters.counts()
+    outcomes = c['outcomes']
+    errors = c['total'] - outcomes.get(OK, 0)
+    biz = outcomes.get("business", 0)
+    celeb = outcomes.get("celebrity", 0)
+    tiny = outcomes.get("too_small", 0)
+
+    print(f"  Total processed: {c['total']}")
     print(f"  Businesses skipped: {biz}")
     print(f"  Celebrities skipped: {celeb}")
     print(f"  Too small skipped: {tiny}")
     print(f"  Other errors: {errors - biz - celeb - tiny}")
-    print(f"  Consumer emails: {consumer_emails}")
-    print(f"  Remaining: {remaining}")
+    print(f"  Consumer emails: {c['unique_emails']}")
+    print(f"  Remaining: {c['remaining']}")
 
 
 if __name__ == "__main__":
@@ -1,22 +1,29 @@
 #!/usr/bin/env python3
 """
 Merge all UCLA email sources into one master CSV.
-Combines scraper V2 output + manually discovered emails from agents.
+Combines scraper V2 output + manually discovered emails from agents, linked
+into one record per person (record_linkage), so jdoe@ucla.edu and
+jdoe@g.ucla.edu, or an agent row and a scraped row for the same student, merge.
 """
-import csv, json, os
+import csv, json, os, sys
 from datetime import datetime
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from record_linkage import link
+
 BASE = os.path.dirname(os.path.abspath(__file__))
 
 # Load existing contacts from scraper
-existing = {}
+scraped = []
 csv_path = os.path.join(BASE, "ucla_contacts_v2.csv")
 with open(csv_path, 'r') as f:
     reader = csv.DictReader(f)
     for row in reader:
-        existing[row["email"].lower()] = row
+        row["email"] = row["email"].lower()
+        row["source"] = "ucla_contacts_v2"
+        scraped.append(row)
 
-print(f"Loaded {len(existing)} existing contacts from scraper")
+print(f"Loaded {len(scraped)} existing contacts from scraper")
 
 # ── Additional emails discovered by agents ──
 AGENT_EMAILS = {
@@ -148,32 +155,35 @@ AGENT_EMAILS = {
     ],
 }
 
-added = 0
+agent_rows = []
 for dept, entries in AGENT_EMAILS.items():
     for name, email in entries:
         email = email.lower().strip()
-        if email not in existing:
-            is_student = '@g.ucla.edu' in email or '@gmail.com' in email
-            existing[email] = {
-                "name": name,
-                "email": email,
-                "title": "",
-                "department": dept,
-                "role": "student" if is_student else "staff",
-                "source_url": "agent_discovery",
-            }
-            added += 1
+        is_student = '@g.ucla.edu' in email or '@gmail.com' in email
+        agent_rows.append({
+            "name": name,
+            "email": email,
+            "title": "",
+            "department": dept,
+            "role": "student" if is_student else "staff",
+            "source_url": "agent_discovery",
+            "source": "agent_discovery",
+        })
+
+# Scraped rows first: they win field conflicts, agent rows fill the gaps
+contacts = link(scraped + agent_rows)
+added = sum(1 for c in contacts if c["linked_sources"] == ["agent_discovery"])
 
 print(f"Added {added} new emails from agent discoveries")
-print(f"Total unique contacts: {len(existing)}")
+print(f"Merged {len(scraped) + len(agent_rows) - len(contacts)} duplicate records")
+print(f"Total unique contacts: {len(contacts)}")
 
 # ── Save master CSV ──
 master_csv = os.path.join(BASE, "ucla_master.csv")
 fieldnames = ["name", "email", "title", "department", "role", "source_url"]
-contacts = list(existing.values())
 
 with open(master_csv, 'w', newline='', encoding='utf-8') as f:
-    writer = csv.DictWriter(f, fieldnames=fieldnames)
+    writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
     writer.writeheader()
     writer.writerows(contacts)
 
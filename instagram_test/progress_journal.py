@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Vora Progress Journal
+Append-only checkpoints for the harvest progress files, instead of
+re-serializing the whole progress JSON every few items.
+
+- each processed item is one JSON line appended (and flushed) to
+  <name>.journal.jsonl next to the progress file, so a checkpoint costs the
+  same at 100 entries as at 100,000 and a crash loses at most the line
+  being written
+- every COMPACT_EVERY lines the journal is rotated and a background thread
+  folds it into the progress JSON (same format as before: indent=1); the
+  harvester keeps appending to a fresh journal meanwhile
+- load_progress() = progress JSON + replayed journal(s); anything that reads a
+  journaled progress file should use it instead of json.load
+- close() compacts synchronously, so after a clean exit the progress JSON
+  is complete on its own
+
+Journal lines are ["set", [key, ...], value] (nested dict assignment) or
+["add", [key], item] (append to a list if missing); both replay idempotently,
+so a compaction interrupted mid-way is simply redone on the next start.
+
+Usage:
+    from progress_journal import ProgressJournal, load_progress
+
+    progress = ProgressJournal(progress_file)      # dict: snapshot + journal
+    progress[username] = entry                      # journaled
+    handles = progress.section("handles")           # handles[h] = {...} journaled
+    done_subs = progress.members("done_subs")       # done_subs.add(sub) journaled
+    progress.close()
+
+    data = load_progress(progress_file)             # read-only, journal included
+"""
+
+import json
+import os
+import threading
+
+COMPACT_EVERY = 2000  # journal lines between background compactions
+
+
+def journal_paths(path):
+    """[rotated journal (being compacted), live journal] for a progress file."""
+    live = os.path.splitext(path)[0] + '.journal.jsonl'
+    return [live + '.compacting', live]
+
+
+def _ends_with_newline(path):
+    with open(path, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b'\n'
+
+
+def _walk(state, keys):
+    for key in keys:
+        node = state.get(key)
+        if not isinstance(node, dict):
+            node = state[key] = {}
+        state = node
+    return state
+
+
+def replay(state, journal_path):
+    """Apply one journal file to `state` in place. Returns lines applied."""
+    if not os.path.exists(journal_path):
+        return 0
+    seen = {}
+    applied = 0
+    with open(journal_path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                op, keys, value = json.loads(line)
+            except ValueError:
+                continue  # torn last line from a crash
+            parent = _walk(state, keys[:-1])
+            if op == 'set':
+                parent[keys[-1]] = value
+            elif op == 'add':
+                items = parent.get(keys[-1])
+                if not isinstance(items, list):
+                    items = parent[keys[-1]] = []
+                ident = tuple(keys)
+                if ident not in seen:
+                    seen[ident] = set(map(json.dumps, items))
+                marker = json.dumps(value)
+                if marker not in seen[ident]:
+                    seen[ident].add(marker)
+                    items.append(value)
+            applied += 1
+    return applied
+
+
+def load_progress(path):
+    """Progress JSON plus any journal lines not yet compacted into it ({} if none)."""
+    state = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            state = json.load(f)
+    for journal in journal_paths(path):
+        replay(state, journal)
+    return state
+
+
+def compact(path, indent=1):
+    """Fold the rotated journal into the progress JSON, then delete it."""
+    rotated = journal_paths(path)[0]
+    state = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            state = json.load(f)
+    replay(state, rotated)
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(state, f, indent=indent, default=str)
+    os.replace(tmp, path)
+    if os.path.exists(rotated):
+        os.remove(rotated)
+
+
+class ProgressJournal(dict):
+    """
+    A progress dict backed by a JSON snapshot + journal. Item assignment,
+    update(), and the section()/members() views are journaled; anything
+    else (mutating a stored entry in place, setdefault, del) is not.
+    """
+
+    def __init__(self, path, compact_every=COMPACT_EVERY, indent=1):
+        self.path = path
+        self.compact_every = compact_every
+        self.indent = indent
+        self.rotated, self.journal_path = journal_paths(path)
+        if os.path.exists(self.rotated):
+            compact(path, indent)  # left over from an interrupted compaction
+        super().__init__(load_progress(path))
+        self.lines = 0
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, encoding='utf-8') as f:
+                self.lines = sum(1 for _ in f)
+        self.fh = open(self.journal_path, 'a', encoding='utf-8')
+        if self.fh.tell() and not _ends_with_newline(self.journal_path):
+            self.fh.write('\n')  # don't glue the next line onto a torn one
+        self.compactor = None
+
+    # ─── Journaling ──────────────────────────────────────────────────────────
+
+    def append(self, op, keys, value):
+        self.fh.write(json.dumps([op, keys, value], default=str) + '\n')
+        self.fh.flush()
+        self.lines += 1
+        if self.lines >= self.compact_every:
+            self.compact_in_background()
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.append('set', [key], value)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def preload(self, entries):
+        """Merge entries read from other files, without journaling them; existing keys win."""
+        for key, value in entries.items():
+            if key not in self:
+                super().__setitem__(key, value)
+
+    def section(self, key):
+        """The dict stored under `key`, with its item assignments journaled."""
+        current = self.get(key)
+        view = JournalSection(self, key, current if isinstance(current, dict) else {})
+        super().__setitem__(key, view)
+        return view
+
+    def members(self, key):
+        """The list stored under `key` as a set whose add() is journaled."""
+        view = JournalMembers(self, key, self.get(key) or [])
+        super().__setitem__(key, view)
+        return view
+
+    # ─── Compaction ──────────────────────────────────────────────────────────
+
+    def _rotate(self):
+        """Move the live journal aside for compaction. False if empty or one is still running."""
+        if self.lines == 0 or (self.compactor is not None and self.compactor.is_alive()):
+            return False
+        if os.path.exists(self.rotated):
+            return False  # a failed compaction left it; the next start retries it
+        self.fh.close()
+        if os.path.exists(self.journal_path):
+            os.replace(self.journal_path, self.rotated)
+        self.fh = open(self.journal_path, 'a', encoding='utf-8')
+        self.lines = 0
+        return True
+
+    def compact_in_background(self):
+        if self._rotate():
+            self.compactor = threading.Thread(target=compact, args=(self.path, self.indent), daemon=True)
+            self.compactor.start()
+
+    def close(self):
+        """Wait for any background compaction, then compact the rest of the journal."""
+        if self.compactor is not None:
+            self.compactor.join()
+        if self._rotate():
+            compact(self.path, self.indent)
+        self.fh.close()
+        if os.path.exists(self.journal_path) and os.path.getsize(self.journal_path) == 0:
+            os.remove(self.journal_path)
+
+
+class JournalSection(dict):
+    """Nested dict of a ProgressJournal; assignments are journaled as [key, subkey]."""
+
+    def __init__(self, journal, key, data):
+        super().__init__(data)
+        self.journal = journal
+        self.key = key
+
+    def __setitem__(self, subkey, value):
+        super().__setitem__(subkey, value)
+        self.journal.append('set', [self.key, subkey], value)
+
+
+class JournalMembers(set):
+    """Set stored as a list in the progress JSON; new members are journaled."""
+
+    def __init__(self, journal, key, items):
+        super().__init__(items)
+        self.journal = journal
+        self.key = key
+
+    def add(self, item):
+        if item not in self:
+            super().add(item)
+            self.journal.append('add', [self.key], item)
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Vora Progress Stats
+Materialized counters for the Instagram harvest progress files, so `stats`
+subcommands answer from a few indexed queries instead of re-reading and
+re-scanning multi-MB progress JSON.
+
+- each script has a scope: its ordered list of progress files (later files
+  win for the same username, like dict.update) and a classify(username,
+  entry) that reduces an entry to (outcome, emails)
+- harvesters refresh() once at start, then record() the usernames they
+  processed each time they save progress, which also stamps the file with
+  its size/mtime (and its journal's, see progress_journal)
+- refresh() only rebuilds a scope when one of its files no longer matches
+  its stamp (edited by hand, or written by another script)
+- counts() is GROUP BY / COUNT(DISTINCT) over progress_stats.db
+
+Usage:
+    from progress_stats import ProgressCounters
+
+    counters = ProgressCounters('consumer_pipeline', [mass_file, progress_file], classify)
+    counters.refresh()
+    c = counters.counts()   # total, outcomes, with_email, unique_emails, remaining
+"""
+
+import json
+import os
+import sqlite3
+
+from progress_journal import journal_paths, load_progress
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATS_DB = os.path.join(BASE_DIR, 'progress_stats.db')
+
+OK = 'ok'
+
+
+def file_stamp(path):
+    """(size, mtime_ns) of a file and its journals; None for each that does not exist."""
+    stamps = []
+    for p in [path] + journal_paths(path):
+        try:
+            st = os.stat(p)
+        except FileNotFoundError:
+            stamps.append(None)
+            continue
+        stamps.append([st.st_size, st.st_mtime_ns])
+    return stamps
+
+
+class ProgressCounters:
+    """
+    Counters for one scope. `classify(username, entry)` returns
+    (outcome, emails): outcome is 'ok' or the entry's error ('business',
+    'gone', ...), emails the addresses it contributes to the totals.
+    `targets_file` (optional) is a usernames JSON whose unprocessed names
+    are reported as remaining.
+    """
+
+    def __init__(self, scope, files, classify, targets_file=None, path=None):
+        self.scope = scope
+        self.files = list(files)
+        self.classify = classify
+        self.targets_file = targets_file
+        self.synced = False
+        self.conn = sqlite3.connect(path or STATS_DB)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                scope TEXT NOT NULL,
+                username TEXT NOT NULL,
+                rank INTEGER NOT NULL,
+                outcome TEXT NOT NULL,
+                n_emails INTEGER NOT NULL,
+                PRIMARY KEY (scope, username)
+            );
+            CREATE INDEX IF NOT EXISTS idx_entries_outcome ON entries (scope, outcome);
+            CREATE TABLE IF NOT EXISTS emails (
+                scope TEXT NOT NULL,
+                username TEXT NOT NULL,
+                email TEXT NOT NULL,
+                PRIMARY KEY (scope, username, email)
+            );
+            CREATE INDEX IF NOT EXISTS idx_emails_email ON emails (scope, email);
+            CREATE TABLE IF NOT EXISTS targets (
+                scope TEXT NOT NULL,
+                username TEXT NOT NULL,
+                PRIMARY KEY (scope, username)
+            );
+            CREATE TABLE IF NOT EXISTS stamps (
+                scope TEXT NOT NULL,
+                path TEXT NOT NULL,
+                stamp TEXT,
+                PRIMARY KEY (scope, path)
+            );
+        """)
+        self.conn.commit()
+
+    # ─── Maintenance ─────────────────────────────────────────────────────────
+
+    def _stored_stamp(self, path):
+        row = self.conn.execute('SELECT stamp FROM stamps WHERE scope = ? AND path = ?',
+                                (self.scope, path)).fetchone()
+        return json.loads(row[0]) if row and row[0] else None
+
+    def _save_stamp(self, path):
+        self.conn.execute('INSERT OR REPLACE INTO stamps (scope, path, stamp) VALUES (?, ?, ?)',
+                          (self.scope, path, json.dumps(file_stamp(path))))
+
+    def _upsert(self, username, entry, rank):
+        outcome, emails = self.classify(username, entry)
+        emails = sorted(set(emails))
+        cur = self.conn.execute(
+            'INSERT INTO entries (scope, username, rank, outcome, n_emails) VALUES (?, ?, ?, ?, ?) '
+            'ON CONFLICT (scope, username) DO UPDATE SET rank = excluded.rank, '
+            'outcome = excluded.outcome, n_emails = excluded.n_emails '
+            'WHERE excluded.rank >= entries.rank',
+            (self.scope, username, rank, outcome, len(emails)),
+        )
+        if cur.rowcount:
+            self.conn.execute('DELETE FROM emails WHERE scope = ? AND username = ?', (self.scope, username))
+            self.conn.executemany('INSERT INTO emails (scope, username, email) VALUES (?, ?, ?)',
+                                  [(self.scope, username, e) for e in emails])
+
+    def rebuild(self):
+        """Re-read every file of the scope from scratch."""
+        for table in ('entries', 'emails', 'targets', 'stamps'):
+            self.conn.execute(f'DELETE FROM {table} WHERE scope = ?', (self.scope,))
+        for rank, path in enumerate(self.files):
+            for username, entry in load_progress(path).items():
+                self._upsert(username, entry, rank)
+            self._save_stamp(path)
+        if self.targets_file:
+            if os.path.exists(self.targets_file):
+                with open(self.targets_file) as f:
+                    usernames = json.load(f).get('usernames', [])
+                self.conn.executemany('INSERT OR IGNORE INTO targets (scope, username) VALUES (?, ?)',
+                                      [(self.scope, u) for u in usernames])
+            self._save_stamp(self.targets_file)
+        self.conn.commit()
+
+    def refresh(self):
+        """Rebuild only if a file changed behind the counters' back. Returns True if rebuilt."""
+        watched = self.files + ([self.targets_file] if self.targets_file else [])
+        self.synced = True
+        if all(self._stored_stamp(p) == file_stamp(p) for p in watched):
+            return False
+        self.rebuild()
+        return True
+
+    def record(self, entries, path):
+        """
+        Apply {username: entry} just saved to `path` (one of the scope's
+        files) and stamp the file, so the next refresh() skips it. If the
+        counters were not refreshed before the save, the saved files are
+        simply re-read instead.
+        """
+        if not self.synced:
+            self.refresh()
+            return
+        rank = self.files.index(path)
+        for username, entry in entries.items():
+            self._upsert(username, entry, rank)
+        self._save_stamp(path)
+        self.conn.commit()
+
+    # ─── Queries ─────────────────────────────────────────────────────────────
+
+    def counts(self):
+        """Totals for the scope: total, outcomes{}, with_email, unique_emails, remaining."""
+        outcomes = dict(self.conn.execute(
+            'SELECT outcome, COUNT(*) FROM entries WHERE scope = ? GROUP BY outcome', (self.scope,)))
+        with_email = self.conn.execute(
+            'SELECT COUNT(*) FROM entries WHERE scope = ? AND outcome = ? AND n_emails > 0',
+            (self.scope, OK)).fetchone()[0]
+        unique_emails = self.conn.execute(
+            'SELECT COUNT(DISTINCT m.email) FROM emails m JOIN entries e '
+            'ON e.scope = m.scope AND e.username = m.username '
+            'WHERE m.scope = ? AND e.outcome = ?', (self.scope, OK)).fetchone()[0]
+        remaining = None
+        if self.targets_file:
+            remaining = self.conn.execute(
+                'SELECT COUNT(*) FROM targets t WHERE t.scope = ? AND NOT EXISTS '
+                '(SELECT 1 FROM entries e WHERE e.scope = t.scope AND e.username = t.username)',
+                (self.scope,)).fetchone()[0]
+        return {
+            'total': sum(outcomes.values()),
+            'outcomes': outcomes,
+            'with_email': with_email,
+            'unique_emails': unique_emails,
+            'remaining': remaining,
+        }
+
+    def close(self):
+        self.conn.close()
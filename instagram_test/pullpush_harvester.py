@@ -17,6 +17,8 @@ import urllib.request, urllib.error
 from datetime import datetime
 from urllib.parse import quote_plus
 
+from progress_journal import load_progress
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 SSL_CTX = ssl.create_default_context()
@@ -147,10 +149,7 @@ def main():
     print("+" + "=" * 60 + "+\n")
 
     # Load existing progress
-    progress = {}
-    if os.path.exists(PROGRESS_FILE):
-        with open(PROGRESS_FILE) as f:
-            progress = json.load(f)
+    progress = load_progress(PROGRESS_FILE)
 
     all_handles = progress.get("handles", {})
     all_emails = progress.get("emails", {})
@@ -14,6 +14,8 @@ import urllib.request, urllib.error
 from datetime import datetime
 from urllib.parse import quote_plus
 
+from progress_journal import ProgressJournal
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 SSL_CTX = ssl.create_default_context()
@@ -348,15 +350,6 @@ def process_items(items, all_handles, all_emails, sub, is_post=False):
     return new_h, new_e
 
 
-def save_progress(progress, all_handles, all_emails, done_subs, done_queries):
-    progress["handles"] = all_handles
-    progress["emails"] = all_emails
-    progress["done_subs"] = list(done_subs)
-    progress["done_queries"] = list(done_queries)
-    with open(PROGRESS_FILE, "w") as f:
-        json.dump(progress, f, indent=1)
-
-
 def push_to_supabase(emails_dict):
     """Push new emails to Supabase, returns count pushed."""
     from dotenv import load_dotenv
@@ -425,15 +418,13 @@ def main():
     print(f"|  {datetime.now().strftime('%Y-%m-%d %H:%M:%S'):<57}|")
     print("+" + "=" * 60 + "+\n")
 
-    progress = {}
-    if os.path.exists(PROGRESS_FILE):
-        with open(PROGRESS_FILE) as f:
-            progress = json.load(f)
-
-    all_handles = progress.get("handles", {})
-    all_emails = progress.get("emails", {})
-    done_subs = set(progress.get("done_subs", []))
-    done_queries = set(progress.get("done_queries", []))
+    # New handles/emails and finished subs/queries are appended to the
+    # progress journal as they are found; no full rewrites per checkpoint
+    progress = ProgressJournal(PROGRESS_FILE)
+    all_handles = progress.section("handles")
+    all_emails = progress.section("emails")
+    done_subs = progress.members("done_subs")
+    done_queries = progress.members("done_queries")
 
     print(f"  Existing: {len(all_handles)} handles, {len(all_emails)} emails")
     print(f"  Done subs: {len(done_subs)}, Done queries: {len(done_queries)}")
@@ -504,7 +495,6 @@ def main():
         print(f"    {total} items | +{sub_h} handles | +{sub_e} emails | "
               f"totals: {len(all_handles)} handles, {len(all_emails)} emails")
 
-        save_progress(progress, all_handles, all_emails, done_subs, done_queries)
 
         if emails_since_push >= 500:
             new_emails = {k: v for k, v in all_emails.items()
@@ -590,7 +580,6 @@ def main():
         print(f"    {total} items | +{q_h} handles | +{q_e} emails | "
               f"totals: {len(all_handles)} handles, {len(all_emails)} emails")
 
-        save_progress(progress, all_handles, all_emails, done_subs, done_queries)
 
         if emails_since_push >= 500:
             n = push_to_supabase(all_emails)
@@ -598,7 +587,7 @@ def main():
             emails_since_push = 0
 
     # Final push
-    save_progress(progress, all_handles, all_emails, done_subs, done_queries)
+    progress.close()
     n = push_to_supabase(all_emails)
     print(f"\n  FINAL PUSH: {n} emails to Supabase")
 
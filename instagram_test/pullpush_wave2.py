@@ -11,6 +11,8 @@ import urllib.request, urllib.error
 from datetime import datetime
 from urllib.parse import quote_plus
 
+from progress_journal import load_progress
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 SSL_CTX = ssl.create_default_context()
@@ -229,10 +231,7 @@ def main():
     print(f"|  {datetime.now().strftime('%Y-%m-%d %H:%M:%S'):<57}|")
     print("+" + "=" * 60 + "+\n")
 
-    progress = {}
-    if os.path.exists(PROGRESS_FILE):
-        with open(PROGRESS_FILE) as f:
-            progress = json.load(f)
+    progress = load_progress(PROGRESS_FILE)
 
     all_handles = progress.get("handles", {})
     all_emails = progress.get("emails", {})
@@ -11,6 +11,8 @@ import urllib.request, urllib.error
 from datetime import datetime
 from urllib.parse import quote_plus
 
+from progress_journal import load_progress
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 SSL_CTX = ssl.create_default_context()
@@ -196,8 +198,7 @@ def main():
     wave1_emails = set()
     w1_file = os.path.join(BASE_DIR, "pullpush_progress.json")
     if os.path.exists(w1_file):
-        with open(w1_file) as f:
-            w1 = json.load(f)
+        w1 = load_progress(w1_file)
         wave1_emails = set(w1.get("emails", {}).keys())
         print(f"  Wave 1 emails to skip: {len(wave1_emails)}")
 
@@ -2,14 +2,14 @@
 """Push ALL discovered CSV files to Supabase college_contacts table."""
 
 import csv
-import json
 import urllib.request
-import urllib.error
 import ssl
 import os
 import glob
 from dotenv import load_dotenv
 
+from bulk_loader import BulkLoader
+
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
 SUPABASE_URL = os.getenv('SUPABASE_URL')
 SUPABASE_KEY = os.getenv('SUPABASE_KEY')
@@ -43,17 +43,17 @@ def classify_role(email, raw_role=''):
     return 'student'
 
 
-def push_row(email, name, department, role, source):
-    """Push a single row to Supabase."""
+def build_row(email, name, department, role, source):
+    """Validate and normalize one CSV row. Returns the row dict, or None to skip."""
     email = email.lower().strip()
     if not email or email in SKIP_EMAILS:
-        return 'skip'
+        return None
     if '@' not in email:
-        return 'skip'
+        return None
     
     # Must be UCLA-related
     if 'ucla.edu' not in email:
-        return 'skip'
+        return None
 
     mapped_role = classify_role(email, role)
     if mapped_role not in VALID_ROLES:
@@ -61,7 +61,7 @@ def push_row(email, name, department, role, source):
 
     segment = 'grad_student' if '@g.ucla.edu' in email else 'student'
 
-    row = {
+    return {
         "email": email,
         "name": name.strip() if name and name.strip() and name.strip() != 'Contact Information' else None,
         "department": department.strip() if department else None,
@@ -70,36 +70,15 @@ def push_row(email, name, department, role, source):
         "source_url": source,
         "segment": segment,
     }
-    
-    url = f"{SUPABASE_URL}/rest/v1/college_contacts"
-    headers = {
-        "apikey": SUPABASE_KEY,
-        "Authorization": f"Bearer {SUPABASE_KEY}",
-        "Content-Type": "application/json",
-        "Prefer": "return=minimal",
-    }
-    data = json.dumps([row]).encode('utf-8')
-    req = urllib.request.Request(url, data=data, headers=headers, method='POST')
-    try:
-        resp = urllib.request.urlopen(req, context=SSL_CTX)
-        return 'inserted'
-    except urllib.error.HTTPError as e:
-        body = e.read().decode()
-        if 'duplicate' in body.lower() or '23505' in body:
-            return 'dupe'
-        return 'error'
-
-
-def process_csv(filepath):
-    """Process a CSV file and push to Supabase."""
-    inserted = 0
-    dupes = 0
+
+
+def process_csv(filepath, loader):
+    """Stream a CSV file into the bulk loader."""
     skips = 0
-    errors = 0
+    before = dict(loader.stats)
     
     with open(filepath, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
-        fields = reader.fieldnames
         
         for row in reader:
             email = row.get('email', '').strip()
@@ -108,16 +87,16 @@ def process_csv(filepath):
             role = row.get('role', row.get('type', '')).strip()
             source = row.get('source_url', row.get('source', '')).strip()
             
-            result = push_row(email, name, dept, role, source)
-            if result == 'inserted':
-                inserted += 1
-            elif result == 'dupe':
-                dupes += 1
-            elif result == 'skip':
+            record = build_row(email, name, dept, role, source)
+            if record is None:
                 skips += 1
             else:
-                errors += 1
+                loader.add(record)
     
+    stats = loader.flush()
+    inserted = stats['inserted'] - before['inserted']
+    dupes = stats['duplicates'] - before['duplicates']
+    errors = stats['errors'] - before['errors']
     return inserted, dupes, skips, errors
 
 
@@ -136,10 +115,11 @@ def main():
     
     total_inserted = 0
     total_dupes = 0
+    loader = BulkLoader('college_contacts', SUPABASE_URL, SUPABASE_KEY)
     
     for fp in csv_files:
         fname = os.path.basename(fp)
-        inserted, dupes, skips, errors = process_csv(fp)
+        inserted, dupes, skips, errors = process_csv(fp, loader)
         total_inserted += inserted
         total_dupes += dupes
         print(f"  {fname:<40} → +{inserted} new, {dupes} dupes, {skips} skips, {errors} errors")
@@ -147,6 +127,7 @@ def main():
     print(f"\n{'='*60}")
     print(f"  Total new: {total_inserted}")
     print(f"  Total dupes: {total_dupes}")
+    print(f"  Requests: {loader.close()['requests']}")
     
     # Final count
     count_headers = {"apikey": SUPABASE_KEY, "Authorization": f"Bearer {SUPABASE_KEY}", "Prefer": "count=exact"}
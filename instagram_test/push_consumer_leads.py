@@ -9,12 +9,10 @@ Usage:
 """
 
 import csv
-import json
 import os
 import sys
-import urllib.request
-import urllib.error
-import ssl
+
+from bulk_loader import BulkLoader, CHUNK_SIZE
 
 try:
     from dotenv import load_dotenv
@@ -38,50 +36,19 @@ SUPABASE_URL = os.getenv('SUPABASE_URL') or ENV.get('SUPABASE_URL')
 SUPABASE_KEY = os.getenv('SUPABASE_KEY') or ENV.get('SUPABASE_KEY')
 TABLE = 'consumer_leads'
 
-SSL_CTX = ssl.create_default_context()
-SSL_CTX.check_hostname = False
-SSL_CTX.verify_mode = ssl.CERT_NONE
-
-
-def supabase_upsert(rows, batch_size=50):
-    url = f"{SUPABASE_URL}/rest/v1/{TABLE}?on_conflict=email"
-    headers = {
-        "apikey": SUPABASE_KEY,
-        "Authorization": f"Bearer {SUPABASE_KEY}",
-        "Content-Type": "application/json",
-        "Prefer": "resolution=merge-duplicates",
-    }
 
+def supabase_upsert(rows, batch_size=CHUNK_SIZE):
+    """Chunked upsert on email; existing rows are updated. Returns (upserted, duplicates, errors)."""
+    loader = BulkLoader(TABLE, SUPABASE_URL, SUPABASE_KEY, on_conflict='email',
+                        resolution='merge-duplicates', chunk_size=batch_size)  # Update existing rows
     total = len(rows)
-    inserted = 0
-    errors = 0
-
-    for i in range(0, total, batch_size):
-        batch = rows[i:i + batch_size]
-        data = json.dumps(batch).encode('utf-8')
-
-        req = urllib.request.Request(url, data=data, headers=headers, method='POST')
-        try:
-            resp = urllib.request.urlopen(req, context=SSL_CTX)
-            status = resp.getcode()
-            if status in (200, 201):
-                inserted += len(batch)
-            else:
-                body = resp.read().decode()
-                print(f"  Batch {i // batch_size + 1}: status {status} — {body[:200]}")
-                errors += len(batch)
-        except urllib.error.HTTPError as e:
-            body = e.read().decode()
-            print(f"  Batch {i // batch_size + 1}: HTTP {e.code} — {body[:200]}")
-            errors += len(batch)
-        except Exception as e:
-            print(f"  Batch {i // batch_size + 1}: Error — {e}")
-            errors += len(batch)
-
-        if (i // batch_size + 1) % 10 == 0:
-            print(f"  Progress: {i + len(batch)}/{total}")
-
-    return inserted, errors
+    for i, row in enumerate(rows, 1):
+        loader.add(row)
+        if i % (batch_size * 10) == 0:
+            print(f"  Progress: {i}/{total}")
+    stats = loader.close()
+    print(f"  {stats['requests']} requests for {total} rows")
+    return stats['inserted'], stats['duplicates'], stats['errors']
 
 
 def load_csv(csv_path, default_category):
@@ -186,13 +153,13 @@ def main():
                     print(f"    {dev}: {cnt}")
 
         print(f"\n  Pushing to Supabase ({TABLE})...")
-        inserted, errors = supabase_upsert(rows)
+        inserted, dupes, errors = supabase_upsert(rows)
         total_inserted += inserted
         total_errors += errors
-        print(f"  Done: {inserted} inserted, {errors} errors/skipped")
+        print(f"  Done: {inserted} upserted, {dupes} repeated in file, {errors} errors")
 
     print(f"\n{'=' * 50}")
-    print(f"  TOTAL: {total_inserted} inserted, {total_errors} errors/skipped")
+    print(f"  TOTAL: {total_inserted} upserted, {total_errors} errors")
     print(f"{'=' * 50}")
 
 
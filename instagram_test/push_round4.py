@@ -1,9 +1,11 @@
 #!/usr/bin/env python3
 """Push round 4 (chemistry, physics, psych, lifesci, engineering) to Supabase."""
 
-import json, urllib.request, urllib.error, ssl, os
+import urllib.request, ssl, os
 from dotenv import load_dotenv
 
+from bulk_loader import BulkLoader
+
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
 SUPABASE_URL = os.getenv('SUPABASE_URL')
 SUPABASE_KEY = os.getenv('SUPABASE_KEY')
@@ -120,20 +122,10 @@ NEW_EMAILS = [
 
 print(f"Total new emails to push: {len(NEW_EMAILS)}")
 
-url = f"{SUPABASE_URL}/rest/v1/college_contacts"
-headers = {
-    "apikey": SUPABASE_KEY,
-    "Authorization": f"Bearer {SUPABASE_KEY}",
-    "Content-Type": "application/json",
-    "Prefer": "return=minimal",
-}
-
-inserted = 0
-dupes = 0
-errors = 0
+loader = BulkLoader('college_contacts', SUPABASE_URL, SUPABASE_KEY)
 
 for email, name, dept, role in NEW_EMAILS:
-    row = {
+    loader.add({
         "email": email.lower().strip(),
         "name": name,
         "department": dept,
@@ -141,22 +133,11 @@ for email, name, dept, role in NEW_EMAILS:
         "university": "UCLA",
         "source_url": "agent_discovery_round4",
         "segment": "grad_student" if "@g.ucla.edu" in email.lower() else "student",
-    }
-    data = json.dumps([row]).encode('utf-8')
-    req = urllib.request.Request(url, data=data, headers=headers, method='POST')
-    try:
-        resp = urllib.request.urlopen(req, context=SSL_CTX)
-        inserted += 1
-    except urllib.error.HTTPError as e:
-        body = e.read().decode()
-        if 'duplicate' in body.lower() or '23505' in body:
-            dupes += 1
-        else:
-            errors += 1
-            if errors <= 3:
-                print(f"  Error for {email}: {body[:100]}")
+    })
 
-print(f"\nInserted: {inserted}, Dupes: {dupes}, Errors: {errors}")
+stats = loader.close()
+inserted, dupes, errors = stats['inserted'], stats['duplicates'], stats['errors']
+print(f"\nInserted: {inserted}, Dupes: {dupes}, Errors: {errors} ({stats['requests']} requests)")
 
 count_headers = {"apikey": SUPABASE_KEY, "Authorization": f"Bearer {SUPABASE_KEY}", "Prefer": "count=exact"}
 req = urllib.request.Request(f"{SUPABASE_URL}/rest/v1/college_contacts?select=id&university=eq.UCLA", headers=count_headers)
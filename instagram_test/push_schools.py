@@ -2,15 +2,15 @@
 """Push CSV files for any university to Supabase college_contacts table."""
 
 import csv
-import json
 import urllib.request
-import urllib.error
 import ssl
 import os
 import sys
 import glob
 from dotenv import load_dotenv
 
+from bulk_loader import BulkLoader
+
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
 SUPABASE_URL = os.getenv('SUPABASE_URL')
 SUPABASE_KEY = os.getenv('SUPABASE_KEY')
@@ -100,17 +100,18 @@ def classify_role(email, raw_role='', dept=''):
     return 'student'
 
 
-def push_row(email, name, department, role, source, university):
+def build_row(email, name, department, role, source, university):
+    """Validate and normalize one CSV row. Returns the row dict, or None to skip."""
     email = email.lower().strip()
     if not email or '@' not in email:
-        return 'skip'
+        return None
     # Skip generic emails
     for skip in SKIP_GENERIC:
         if email.startswith(skip):
-            return 'skip'
+            return None
     # Skip non-edu emails
     if '.edu' not in email:
-        return 'skip'
+        return None
 
     mapped_role = classify_role(email, role, department)
     if mapped_role not in VALID_ROLES:
@@ -121,7 +122,7 @@ def push_row(email, name, department, role, source, university):
     if clean_name and len(clean_name) > 200:
         clean_name = clean_name[:200]
 
-    row = {
+    return {
         "email": email,
         "name": clean_name,
         "department": department.strip()[:200] if department and department.strip() else None,
@@ -131,38 +132,10 @@ def push_row(email, name, department, role, source, university):
         "segment": "student",
     }
 
-    url = f"{SUPABASE_URL}/rest/v1/college_contacts"
-    headers = {
-        "apikey": SUPABASE_KEY,
-        "Authorization": f"Bearer {SUPABASE_KEY}",
-        "Content-Type": "application/json",
-        "Prefer": "return=minimal",
-    }
-    data = json.dumps([row]).encode('utf-8')
-
-    for attempt in range(3):
-        try:
-            req = urllib.request.Request(url, data=data, headers=headers, method='POST')
-            urllib.request.urlopen(req, context=SSL_CTX)
-            return 'inserted'
-        except urllib.error.HTTPError as e:
-            body = e.read().decode()
-            if 'duplicate' in body.lower() or '23505' in body:
-                return 'dupe'
-            if '23514' in body:
-                row['role'] = 'student'
-                data = json.dumps([row]).encode('utf-8')
-                continue
-            return 'error'
-        except (urllib.error.URLError, OSError):
-            import time
-            time.sleep(2 * (attempt + 1))
-            continue
-    return 'error'
-
-
-def process_csv(filepath, university):
-    inserted = dupes = skips = errors = 0
+
+def process_csv(filepath, university, loader):
+    skips = 0
+    before = dict(loader.stats)
     with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
         reader = csv.DictReader(f)
         for row in reader:
@@ -172,11 +145,15 @@ def process_csv(filepath, university):
             role = (row.get('role', '') or row.get('type', '')).strip()
             source = (row.get('source_url', '') or row.get('source', '')).strip()
 
-            result = push_row(email, name, dept, role, source, university)
-            if result == 'inserted': inserted += 1
-            elif result == 'dupe': dupes += 1
-            elif result == 'skip': skips += 1
-            else: errors += 1
+            record = build_row(email, name, dept, role, source, university)
+            if record is None:
+                skips += 1
+            else:
+                loader.add(record)
+    stats = loader.flush()
+    inserted = stats['inserted'] - before['inserted']
+    dupes = stats['duplicates'] - before['duplicates']
+    errors = stats['errors'] - before['errors']
     return inserted, dupes, skips, errors
 
 
@@ -211,10 +188,11 @@ def main():
 
     print(f"Pushing {university} data ({len(csv_files)} CSV files)\n")
     total_inserted = total_dupes = 0
+    loader = BulkLoader('college_contacts', SUPABASE_URL, SUPABASE_KEY)
 
     for fp in csv_files:
         fname = os.path.basename(fp)
-        inserted, dupes, skips, errors = process_csv(fp, university)
+        inserted, dupes, skips, errors = process_csv(fp, university, loader)
         total_inserted += inserted
         total_dupes += dupes
         print(f"  {fname:<45} → +{inserted} new, {dupes} dupes, {skips} skips, {errors} errors")
@@ -222,6 +200,7 @@ def main():
     print(f"\n{'='*65}")
     print(f"  Total new {university}: {total_inserted}")
     print(f"  Total dupes: {total_dupes}")
+    print(f"  Requests: {loader.close()['requests']}")
 
     # Counts
     uni_filter = f"&university=eq.{urllib.parse.quote(university)}"
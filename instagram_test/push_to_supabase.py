@@ -2,64 +2,30 @@
 """Push UCLA contacts CSV to Supabase college_contacts table with deduplication."""
 
 import csv
-import json
 import os
-import urllib.request
-import urllib.error
-import ssl
 from dotenv import load_dotenv
 
+from bulk_loader import BulkLoader, CHUNK_SIZE
+
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
 
 SUPABASE_URL = os.getenv('SUPABASE_URL')
 SUPABASE_KEY = os.getenv('SUPABASE_KEY')
 TABLE = 'college_contacts'
 
-SSL_CTX = ssl.create_default_context()
-SSL_CTX.check_hostname = False
-SSL_CTX.verify_mode = ssl.CERT_NONE
-
-
-def supabase_upsert(rows, batch_size=50):
-    """Upsert rows to Supabase using the REST API. On conflict (email), skip."""
-    url = f"{SUPABASE_URL}/rest/v1/{TABLE}"
-    headers = {
-        "apikey": SUPABASE_KEY,
-        "Authorization": f"Bearer {SUPABASE_KEY}",
-        "Content-Type": "application/json",
-        "Prefer": "resolution=ignore-duplicates",  # Skip duplicates
-    }
 
+def supabase_upsert(rows, batch_size=CHUNK_SIZE):
+    """Chunked upsert on email; existing rows are skipped. Returns (inserted, duplicates, errors)."""
+    loader = BulkLoader(TABLE, SUPABASE_URL, SUPABASE_KEY, on_conflict='email',
+                        resolution='ignore-duplicates', chunk_size=batch_size)  # Skip duplicates
     total = len(rows)
-    inserted = 0
-    errors = 0
-
-    for i in range(0, total, batch_size):
-        batch = rows[i:i + batch_size]
-        data = json.dumps(batch).encode('utf-8')
-
-        req = urllib.request.Request(url, data=data, headers=headers, method='POST')
-        try:
-            resp = urllib.request.urlopen(req, context=SSL_CTX)
-            status = resp.getcode()
-            if status in (200, 201):
-                inserted += len(batch)
-            else:
-                body = resp.read().decode()
-                print(f"  Batch {i//batch_size + 1}: status {status} — {body[:200]}")
-                errors += len(batch)
-        except urllib.error.HTTPError as e:
-            body = e.read().decode()
-            print(f"  Batch {i//batch_size + 1}: HTTP {e.code} — {body[:200]}")
-            errors += len(batch)
-        except Exception as e:
-            print(f"  Batch {i//batch_size + 1}: Error — {e}")
-            errors += len(batch)
-
-        if (i // batch_size + 1) % 5 == 0:
-            print(f"  Progress: {i + len(batch)}/{total}")
-
-    return inserted, errors
+    for i, row in enumerate(rows, 1):
+        loader.add(row)
+        if i % (batch_size * 5) == 0:
+            print(f"  Progress: {i}/{total}")
+    stats = loader.close()
+    print(f"  {stats['requests']} requests for {total} rows")
+    return stats['inserted'], stats['duplicates'], stats['errors']
 
 
 def main():
@@ -94,8 +60,8 @@ def main():
     print(f"  Student orgs: {sum(1 for r in rows if r['role'] == 'student_org')}")
 
     print(f"\nPushing to Supabase ({TABLE})...")
-    inserted, errors = supabase_upsert(rows)
-    print(f"\nDone! Inserted: {inserted}, Errors/Skipped: {errors}")
+    inserted, dupes, errors = supabase_upsert(rows)
+    print(f"\nDone! Inserted: {inserted}, Duplicates: {dupes}, Errors: {errors}")
 
 
 if __name__ == "__main__":
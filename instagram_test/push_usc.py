@@ -2,14 +2,14 @@
 """Push all USC CSV files to Supabase college_contacts table."""
 
 import csv
-import json
 import urllib.request
-import urllib.error
 import ssl
 import os
 import glob
 from dotenv import load_dotenv
 
+from bulk_loader import BulkLoader
+
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
 SUPABASE_URL = os.getenv('SUPABASE_URL')
 SUPABASE_KEY = os.getenv('SUPABASE_KEY')
@@ -38,19 +38,20 @@ def classify_role(email, raw_role='', dept=''):
     return 'student'
 
 
-def push_row(email, name, department, role, source):
+def build_row(email, name, department, role, source):
+    """Validate and normalize one CSV row. Returns the row dict, or None to skip."""
     email = email.lower().strip()
     if not email or email in SKIP_EMAILS or '@' not in email:
-        return 'skip'
+        return None
     # Must be USC-related
     if 'usc.edu' not in email:
-        return 'skip'
+        return None
 
     mapped_role = classify_role(email, role, department)
     if mapped_role not in VALID_ROLES:
         mapped_role = 'student'
 
-    row = {
+    return {
         "email": email,
         "name": name.strip() if name and name.strip() else None,
         "department": department.strip() if department else None,
@@ -59,38 +60,11 @@ def push_row(email, name, department, role, source):
         "source_url": source if source else None,
         "segment": "student",
     }
-    
-    url = f"{SUPABASE_URL}/rest/v1/college_contacts"
-    headers = {
-        "apikey": SUPABASE_KEY,
-        "Authorization": f"Bearer {SUPABASE_KEY}",
-        "Content-Type": "application/json",
-        "Prefer": "return=minimal",
-    }
-    data = json.dumps([row]).encode('utf-8')
-    req = urllib.request.Request(url, data=data, headers=headers, method='POST')
-    try:
-        resp = urllib.request.urlopen(req, context=SSL_CTX)
-        return 'inserted'
-    except urllib.error.HTTPError as e:
-        body = e.read().decode()
-        if 'duplicate' in body.lower() or '23505' in body:
-            return 'dupe'
-        if '23514' in body:  # Check constraint violation (role)
-            # Try with default role
-            row['role'] = 'student'
-            data = json.dumps([row]).encode('utf-8')
-            req2 = urllib.request.Request(url, data=data, headers=headers, method='POST')
-            try:
-                urllib.request.urlopen(req2, context=SSL_CTX)
-                return 'inserted'
-            except:
-                return 'error'
-        return 'error'
-
-
-def process_csv(filepath):
-    inserted = dupes = skips = errors = 0
+
+
+def process_csv(filepath, loader):
+    skips = 0
+    before = dict(loader.stats)
     with open(filepath, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
         for row in reader:
@@ -100,11 +74,15 @@ def process_csv(filepath):
             role = row.get('role', row.get('type', '')).strip()
             source = row.get('source_url', row.get('source', '')).strip()
             
-            result = push_row(email, name, dept, role, source)
-            if result == 'inserted': inserted += 1
-            elif result == 'dupe': dupes += 1
-            elif result == 'skip': skips += 1
-            else: errors += 1
+            record = build_row(email, name, dept, role, source)
+            if record is None:
+                skips += 1
+            else:
+                loader.add(record)
+    stats = loader.flush()
+    inserted = stats['inserted'] - before['inserted']
+    dupes = stats['duplicates'] - before['duplicates']
+    errors = stats['errors'] - before['errors']
     return inserted, dupes, skips, errors
 
 
@@ -114,10 +92,11 @@ def main():
     
     print(f"Found {len(csv_files)} USC CSV files\n")
     total_inserted = total_dupes = 0
+    loader = BulkLoader('college_contacts', SUPABASE_URL, SUPABASE_KEY)
     
     for fp in csv_files:
         fname = os.path.basename(fp)
-        inserted, dupes, skips, errors = process_csv(fp)
+        inserted, dupes, skips, errors = process_csv(fp, loader)
         total_inserted += inserted
         total_dupes += dupes
         print(f"  {fname:<40} → +{inserted} new, {dupes} dupes, {skips} skips, {errors} errors")
@@ -125,6 +104,7 @@ def main():
     print(f"\n{'='*60}")
     print(f"  Total new: {total_inserted}")
     print(f"  Total dupes: {total_dupes}")
+    print(f"  Requests: {loader.close()['requests']}")
     
     count_headers = {"apikey": SUPABASE_KEY, "Authorization": f"Bearer {SUPABASE_KEY}", "Prefer": "count=exact"}
     
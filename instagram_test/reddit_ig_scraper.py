@@ -22,6 +22,8 @@ import urllib.request, urllib.error
 from datetime import datetime
 from urllib.parse import quote_plus
 
+from progress_journal import load_progress
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 SSL_CTX = ssl.create_default_context()
@@ -543,8 +545,7 @@ def extract_emails_pipeline(handles):
         fp = os.path.join(BASE_DIR, pf)
         if os.path.exists(fp):
             try:
-                with open(fp) as f:
-                    existing_checked.update(json.load(f).keys())
+                existing_checked.update(load_progress(fp).keys())
             except Exception:
                 pass
 
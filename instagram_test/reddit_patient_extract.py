@@ -18,6 +18,8 @@ import os, re, sys, time, json, random, ssl
 import urllib.request, urllib.error
 from datetime import datetime
 
+from progress_journal import ProgressJournal, load_progress
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 SSL_CTX = ssl.create_default_context()
@@ -213,19 +215,6 @@ def scrape_ext_url(url):
     return list(all_emails)
 
 
-def load_progress():
-    try:
-        with open(PROGRESS_FILE) as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {}
-
-
-def save_progress(dp):
-    with open(PROGRESS_FILE, "w") as f:
-        json.dump(dp, f, indent=1, default=str)
-
-
 def main():
     print("+" + "=" * 60 + "+")
     print("|  PATIENT IG EXTRACTOR (small batches, long waits)        |")
@@ -235,16 +224,16 @@ def main():
     with open(HANDLES_FILE) as f:
         handles = json.load(f)
 
-    dp = load_progress()
-    extraction = dp.get("extraction", {})
+    # Each checked profile is appended to the progress journal as it is done
+    dp = ProgressJournal(PROGRESS_FILE)
+    extraction = dp.section("extraction")
 
     existing_checked = set(extraction.keys())
     for pf in ["ig_api_progress.json", "consumer_progress.json", "mass_progress.json"]:
         fp = os.path.join(BASE_DIR, pf)
         if os.path.exists(fp):
             try:
-                with open(fp) as f:
-                    existing_checked.update(json.load(f).keys())
+                existing_checked.update(load_progress(fp).keys())
             except Exception:
                 pass
 
@@ -353,8 +342,6 @@ def main():
 
             time.sleep(random.uniform(*BETWEEN_REQUESTS))
 
-        dp["extraction"] = extraction
-        save_progress(dp)
         print(f"  Batch done: {batch_emails} emails this batch, {total_emails} total")
 
         if rate_limited:
@@ -364,8 +351,7 @@ def main():
             print(f"  Waiting {BETWEEN_BATCHES//60} min before next batch...")
             time.sleep(BETWEEN_BATCHES)
 
-    dp["extraction"] = extraction
-    save_progress(dp)
+    dp.close()
 
     real_emails = set()
     for p in extraction.values():
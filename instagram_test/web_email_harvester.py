@@ -26,6 +26,11 @@ import html as html_lib
 from datetime import datetime
 from urllib.parse import quote_plus, urlparse
 
+from progress_journal import ProgressJournal
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from email_index import EmailIndex
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 SSL_CTX = ssl.create_default_context()
@@ -340,14 +345,12 @@ def main():
     progress_file = os.path.join(BASE_DIR, "web_harvest_progress.json")
     csv_path = os.path.join(BASE_DIR, "web_harvest_leads.csv")
 
-    progress = {}
-    if os.path.exists(progress_file):
-        with open(progress_file) as f:
-            progress = json.load(f)
-
-    done_queries = set(progress.get("_done_queries", []))
-    scraped_sites = set(progress.get("_scraped_sites", []))
-    email_map = progress.get("_email_map", {})
+    # Every new email, scraped site and finished query is appended to the
+    # progress journal as it happens
+    progress = ProgressJournal(progress_file)
+    done_queries = progress.members("_done_queries")
+    scraped_sites = progress.members("_scraped_sites")
+    email_map = progress.section("_email_map")
 
     all_queries = generate_queries()
     new_queries = [q for q in all_queries if q not in done_queries]
@@ -397,23 +400,14 @@ def main():
 
         done_queries.add(query)
 
-        # Save every 20 queries
+        # Report every 20 queries (progress is already journaled)
         if queries_done_this_run % 20 == 0:
-            progress["_done_queries"] = list(done_queries)
-            progress["_scraped_sites"] = list(scraped_sites)
-            progress["_email_map"] = email_map
-            with open(progress_file, 'w') as f:
-                json.dump(progress, f, indent=1, default=str)
             print(f"  ── saved | {len(email_map)} total emails | +{new_emails_this_run} this run ──")
 
         time.sleep(random.uniform(5, 10))
 
-    # Final save
-    progress["_done_queries"] = list(done_queries)
-    progress["_scraped_sites"] = list(scraped_sites)
-    progress["_email_map"] = email_map
-    with open(progress_file, 'w') as f:
-        json.dump(progress, f, indent=1, default=str)
+    # Final save: fold the journal back into web_harvest_progress.json
+    progress.close()
 
     # Build CSV
     rows = []
@@ -447,6 +441,13 @@ def main():
     print(f"  Total unique consumer emails: {len(email_map)}")
     print(f"  CSV: {csv_path}")
 
+    # Record the finds in the global email index; report how many no other source had
+    index = EmailIndex()
+    unseen = sum(1 for _ in index.new_emails(email_map))
+    index.add(email_map, 'discovered', 'web_email_harvester')
+    index.close()
+    print(f"  New to the email index: {unseen}")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Vora Lead Snapshots
+Columnar (Parquet) snapshots of the contact, send and followup tables, with
+a DuckDB query layer, for analysis over the whole history without pulling
+JSON from Supabase and looping in Python.
+
+- `export` streams each table out of the local stores (supabase_mirror.db,
+  suppressions.db, leads.db) in batches into snapshots/<name>.parquet:
+  zstd-compressed, low-cardinality text columns (university, role, variant,
+  status, reason, ...) dictionary-encoded, integer/real columns typed from
+  the data. Files are written to a temp name and swapped in, so readers
+  never see half a snapshot
+- `query` runs SQL over the snapshots (each one is a view named after it);
+  DuckDB reads only the columns and row groups a query touches
+- `report yield|variants` are the two standing questions: contacts/sends/
+  replies/bounces per school and department, and per template variant
+
+pyarrow (export) and duckdb (query) are optional dependencies: the rest of
+the repo runs without them.
+
+Usage:
+    pip install pyarrow duckdb
+
+    python lead_snapshots.py export                  # all snapshots
+    python lead_snapshots.py export --sync           # sync the mirror first
+    python lead_snapshots.py report yield --limit 30
+    python lead_snapshots.py report variants
+    python lead_snapshots.py query "SELECT variant, COUNT(*) FROM sends GROUP BY 1"
+    python lead_snapshots.py status
+
+    from lead_snapshots import open_snapshots
+    con = open_snapshots()
+    con.sql("SELECT university, COUNT(*) FROM contacts GROUP BY 1").fetchall()
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SNAPSHOT_DIR = os.getenv('LEAD_SNAPSHOT_DIR', os.path.join(BASE_DIR, 'snapshots'))
+MIRROR_DB = os.getenv('SUPABASE_MIRROR_DB', os.path.join(BASE_DIR, 'supabase_mirror.db'))
+SUPPRESSION_DB = os.getenv('SUPPRESSION_DB', os.path.join(BASE_DIR, 'suppressions.db'))
+LEAD_DB = os.getenv('LEAD_STORE_DB', os.path.join(BASE_DIR, 'leads.db'))
+
+BATCH_ROWS = 50_000
+DICTIONARY_RATIO = 0.5  # dictionary-encode text columns with fewer distinct values than this share of rows
+MANIFEST = 'manifest.json'
+
+# name -> (store, SELECT)
+SNAPSHOTS = {
+    'contacts': (MIRROR_DB, 'SELECT * FROM "college_contacts"'),
+    'sends': (MIRROR_DB, 'SELECT * FROM "college_outreach_sent"'),
+    'followups': (MIRROR_DB, 'SELECT * FROM "college_outreach_sent" WHERE "followup_1_at" IS NOT NULL'),
+    'b2b_sends': (MIRROR_DB, 'SELECT * FROM "outreach_sent_emails"'),
+    'suppressions': (SUPPRESSION_DB, 'SELECT email, canonical, reason, source, event_at, added_at FROM suppressions'),
+    'lead_store': (LEAD_DB, 'SELECT * FROM contacts'),
+}
+
+REPORTS = {
+    'yield': """
+        WITH sent AS (SELECT DISTINCT lower(email) AS email FROM sends),
+             bad AS (SELECT lower(email) AS email, any_value(reason) AS reason FROM suppressions GROUP BY 1)
+        SELECT c.university, c.department,
+               COUNT(*) AS contacts,
+               COUNT(sent.email) AS sent,
+               COUNT(*) FILTER (WHERE bad.reason = 'reply') AS replied,
+               COUNT(*) FILTER (WHERE bad.reason IN ('unsubscribe', 'group_unsubscribe')) AS unsubscribed,
+               COUNT(*) FILTER (WHERE bad.reason IN ('bounce', 'dropped', 'smtp_invalid', 'invalid')) AS bounced,
+               round(100.0 * COUNT(*) FILTER (WHERE bad.reason = 'reply') / nullif(COUNT(sent.email), 0), 1)
+                   AS reply_pct
+        FROM contacts c
+        LEFT JOIN sent ON sent.email = lower(c.email)
+        LEFT JOIN bad ON bad.email = lower(c.email)
+        GROUP BY 1, 2
+        ORDER BY sent DESC, contacts DESC
+    """,
+    'variants': """
+        WITH bad AS (SELECT lower(email) AS email, any_value(reason) AS reason FROM suppressions GROUP BY 1)
+        SELECT s.variant,
+               COUNT(*) AS sent,
+               COUNT(s.followup_1_at) AS followed_up,
+               COUNT(*) FILTER (WHERE bad.reason = 'reply') AS replied,
+               COUNT(*) FILTER (WHERE s.unsubscribed_at IS NOT NULL
+                                OR bad.reason IN ('unsubscribe', 'group_unsubscribe')) AS unsubscribed,
+               COUNT(*) FILTER (WHERE bad.reason IN ('bounce', 'dropped')) AS bounced,
+               round(100.0 * COUNT(*) FILTER (WHERE bad.reason = 'reply') / COUNT(*), 2) AS reply_pct,
+               round(100.0 * COUNT(*) FILTER (WHERE s.unsubscribed_at IS NOT NULL
+                                              OR bad.reason IN ('unsubscribe', 'group_unsubscribe'))
+                     / COUNT(*), 2) AS unsub_pct
+        FROM sends s
+        LEFT JOIN bad ON bad.email = lower(s.email)
+        GROUP BY 1
+        ORDER BY sent DESC
+    """,
+}
+
+
+def display_path(path):
+    path = os.path.abspath(path)
+    return os.path.relpath(path, BASE_DIR) if path.startswith(BASE_DIR + os.sep) else path
+
+
+def require(module, purpose):
+    try:
+        return __import__(module)
+    except ImportError:
+        print(f"ERROR: {module} is needed to {purpose} — pip install {module}")
+        sys.exit(1)
+
+
+# ─── Export ──────────────────────────────────────────────────────────────────
+
+def column_plan(conn, select, total):
+    """Arrow type per column, from SQLite's storage classes and distinct counts."""
+    import pyarrow as pa
+
+    names = [d[0] for d in conn.execute(f'SELECT * FROM ({select}) LIMIT 0').description]
+    plan = []
+    for name in names:
+        col = '"' + name.replace('"', '""') + '"'
+        kinds = {kind for (kind,) in conn.execute(f'SELECT DISTINCT typeof({col}) FROM ({select})')} - {'null'}
+        if kinds == {'integer'}:
+            plan.append((name, pa.int64()))
+        elif kinds and kinds <= {'integer', 'real'}:
+            plan.append((name, pa.float64()))
+        else:
+            distinct = conn.execute(f'SELECT COUNT(DISTINCT {col}) FROM ({select})').fetchone()[0]
+            dictionary = total > 0 and distinct < total * DICTIONARY_RATIO
+            plan.append((name, pa.dictionary(pa.int32(), pa.string()) if dictionary else pa.string()))
+    return plan
+
+
+def to_array(values, arrow_type):
+    import pyarrow as pa
+
+    if pa.types.is_dictionary(arrow_type):
+        return pa.array([None if v is None else str(v) for v in values], type=pa.string()).dictionary_encode()
+    if pa.types.is_string(arrow_type):
+        return pa.array([None if v is None else str(v) for v in values], type=pa.string())
+    return pa.array(values, type=arrow_type)
+
+
+def export_snapshot(name, db_path, select, out_dir=None):
+    """Stream one table into <out_dir>/<name>.parquet. Returns a manifest entry, or None if the source is missing."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if not os.path.exists(db_path):
+        return None
+    conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+    try:
+        total = conn.execute(f'SELECT COUNT(*) FROM ({select})').fetchone()[0]
+    except sqlite3.OperationalError:
+        conn.close()
+        return None  # table not synced / created yet
+    plan = column_plan(conn, select, total)
+    schema = pa.schema([(n, t) for n, t in plan])
+
+    out_dir = out_dir or SNAPSHOT_DIR
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, f'{name}.parquet')
+    tmp = path + '.tmp'
+    writer = pq.ParquetWriter(tmp, schema, compression='zstd', use_dictionary=True)
+    cursor = conn.execute(select)
+    rows = 0
+    while True:
+        batch = cursor.fetchmany(BATCH_ROWS)
+        if not batch:
+            break
+        columns = list(zip(*batch))
+        arrays = [to_array(columns[i], t) for i, (_, t) in enumerate(plan)]
+        writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+        rows += len(batch)
+    writer.close()
+    conn.close()
+    os.replace(tmp, path)
+    return {
+        'rows': rows,
+        'bytes': os.path.getsize(path),
+        'source': display_path(db_path),
+        'dictionary_columns': [n for n, t in plan if pa.types.is_dictionary(t)],
+        'exported_at': time.time(),
+    }
+
+
+def export_snapshots(names=None, out_dir=None):
+    out_dir = out_dir or SNAPSHOT_DIR
+    manifest_path = os.path.join(out_dir, MANIFEST)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    for name in names or SNAPSHOTS:
+        db_path, select = SNAPSHOTS[name]
+        t0 = time.time()
+        entry = export_snapshot(name, db_path, select, out_dir)
+        if entry is None:
+            print(f"  {name:<14} skipped (no {display_path(db_path)} table yet)")
+            continue
+        manifest[name] = entry
+        print(f"  {name:<14} {entry['rows']:>9,} rows  {entry['bytes'] / 1024:>9,.0f} KB  "
+              f"({time.time() - t0:.1f}s)")
+    with open(manifest_path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(manifest_path + '.tmp', manifest_path)
+    return manifest
+
+
+# ─── Query ───────────────────────────────────────────────────────────────────
+
+def open_snapshots(out_dir=None):
+    """DuckDB connection with one view per snapshot file."""
+    duckdb = require('duckdb', 'query snapshots')
+    out_dir = out_dir or SNAPSHOT_DIR
+    con = duckdb.connect()
+    for name in SNAPSHOTS:
+        path = os.path.join(out_dir, f'{name}.parquet')
+        if os.path.exists(path):
+            con.execute(f"CREATE VIEW {name} AS SELECT * FROM read_parquet('{path.replace(chr(39), chr(39) * 2)}')")
+    return con
+
+
+def print_result(result, limit=None):
+    names = [d[0] for d in result.description]
+    rows = result.fetchall()
+    shown = rows[:limit] if limit else rows
+    cells = [[('' if v is None else str(v)) for v in row] for row in shown]
+    widths = [min(40, max([len(n)] + [len(r[i]) for r in cells])) for i, n in enumerate(names)]
+    print('  ' + '  '.join(n[:w].ljust(w) for n, w in zip(names, widths)))
+    print('  ' + '  '.join('─' * w for w in widths))
+    for row in cells:
+        print('  ' + '  '.join(v[:w].ljust(w) for v, w in zip(row, widths)))
+    print(f"\n  {len(rows):,} rows" + (f" (showing {len(shown)})" if len(shown) < len(rows) else ''))
+
+
+def show_status(out_dir=None):
+    out_dir = out_dir or SNAPSHOT_DIR
+    manifest_path = os.path.join(out_dir, MANIFEST)
+    if not os.path.exists(manifest_path):
+        print(f"  No snapshots in {out_dir} — run: python lead_snapshots.py export")
+        return
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    print(f"  Snapshots: {out_dir}\n")
+    for name, entry in manifest.items():
+        age = time.time() - entry['exported_at']
+        print(f"  {name:<14} {entry['rows']:>9,} rows  {entry['bytes'] / 1024:>9,.0f} KB  "
+              f"exported {int(age // 60)}m ago  from {entry['source']}")
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description='Columnar snapshots of the lead tables + SQL over them')
+    parser.add_argument('--dir', type=str, help=f'Snapshot directory (default: {SNAPSHOT_DIR})')
+    sub = parser.add_subparsers(dest='command')
+    p_export = sub.add_parser('export', help='Write Parquet snapshots')
+    p_export.add_argument('names', nargs='*', help=f"Snapshots (default: {', '.join(SNAPSHOTS)})")
+    p_export.add_argument('--sync', action='store_true', help='Incrementally sync the Supabase mirror first')
+    p_query = sub.add_parser('query', help='Run SQL over the snapshots')
+    p_query.add_argument('sql')
+    p_query.add_argument('--limit', type=int, default=50)
+    p_report = sub.add_parser('report', help='Standing reports')
+    p_report.add_argument('report', choices=sorted(REPORTS))
+    p_report.add_argument('--limit', type=int, default=50)
+    sub.add_parser('status', help='Show exported snapshots')
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        require('pyarrow', 'write snapshots')
+        unknown = [n for n in args.names if n not in SNAPSHOTS]
+        if unknown:
+            print(f"Unknown snapshot(s): {', '.join(unknown)}. Available: {', '.join(SNAPSHOTS)}")
+            sys.exit(1)
+        if args.sync:
+            try:
+                from dotenv import load_dotenv
+                load_dotenv()
+            except ImportError:
+                pass
+            import supabase_mirror
+            supabase_mirror.sync(['college_contacts', 'college_outreach_sent', 'outreach_sent_emails'])
+        export_snapshots(args.names, args.dir)
+    elif args.command in ('query', 'report'):
+        con = open_snapshots(args.dir)
+        sql = args.sql if args.command == 'query' else REPORTS[args.report]
+        t0 = time.time()
+        result = con.execute(sql)
+        elapsed = time.time() - t0
+        print_result(result, args.limit)
+        print(f"  {elapsed * 1000:.0f} ms")
+    elif args.command == 'status':
+        show_status(args.dir)
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,495 @@
+#!/usr/bin/env python3
+"""
+Vora Lead Store
+One indexed SQLite store for every university scrape output, so questions
+like "grad students at SEC schools without a name" are one query instead of
+loading dozens of CSV/JSON files.
+
+- every scrape output (or scraper run) is a source; its rows are kept in
+  source_rows with the column variants normalized (lab/program/school ->
+  department, type -> role, source -> source_url, ...)
+- contacts holds one merged row per email, indexed on university,
+  department, role and canonical key (email_canon); each field comes from
+  the most recently imported source that has it, and queries return one
+  row per canonical key (jdoe@ucla.edu and jdoe@g.ucla.edu are one person)
+- `import` hashes each file and skips the ones whose sha256 is unchanged;
+  a changed file replaces that source's rows and re-merges only the
+  emails it touched
+- scrapers call write_contacts() after saving their CSV, which loads the
+  rows and stamps the file so the next import skips it
+
+Usage:
+    # Import every *_emails.csv (plus anderson_phd_batch.json and instagram_test/ucla_master.csv)
+    python lead_store.py import
+
+    # Grad students at SEC schools with no name
+    python lead_store.py query --conference SEC --role student --no-name
+
+    # Per-university / per-role counts
+    python lead_store.py stats
+
+    # From a scraper, after writing OUTPUT_CSV
+    from lead_store import write_contacts
+    write_contacts(all_results, OUTPUT_CSV)
+"""
+
+import argparse
+import csv
+import glob
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+
+from email_canon import canonical_email
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LEAD_DB = os.getenv('LEAD_STORE_DB', os.path.join(BASE_DIR, 'leads.db'))
+
+DEFAULT_SOURCES = ['*_emails.csv', 'anderson_phd_batch.json', 'instagram_test/ucla_master.csv']
+MERGE_CHUNK = 500
+
+# Map file prefix to (university name, email domain)
+SCHOOL_MAP = {
+    'ucla_': ('UCLA', 'ucla.edu'),
+    'usc_': ('USC', 'usc.edu'),
+    'stanford_': ('Stanford', 'stanford.edu'),
+    'berkeley_': ('UC Berkeley', 'berkeley.edu'),
+    'michigan_': ('University of Michigan', 'umich.edu'),
+    'uf_': ('University of Florida', 'ufl.edu'),
+    'texas_': ('UT Austin', 'utexas.edu'),
+    'osu_': ('Ohio State', 'osu.edu'),
+    'uga_': ('University of Georgia', 'uga.edu'),
+    'unc_': ('UNC Chapel Hill', 'unc.edu'),
+    'duke_': ('Duke', 'duke.edu'),
+    'notredame_': ('Notre Dame', 'nd.edu'),
+    'oregon_': ('University of Oregon', 'uoregon.edu'),
+    'lsu_': ('LSU', 'lsu.edu'),
+    'bama_': ('University of Alabama', 'ua.edu'),
+    'penn_state_': ('Penn State', 'psu.edu'),
+    'fsu_': ('Florida State', 'fsu.edu'),
+    'auburn_': ('Auburn', 'auburn.edu'),
+    'clemson_': ('Clemson', 'clemson.edu'),
+    'wisconsin_': ('Wisconsin', 'wisc.edu'),
+    'iowa_': ('University of Iowa', 'uiowa.edu'),
+    'msu_': ('Michigan State', 'msu.edu'),
+    'tamu_': ('Texas A&M', 'tamu.edu'),
+    'tennessee_': ('University of Tennessee', 'utk.edu'),
+    'oklahoma_': ('University of Oklahoma', 'ou.edu'),
+    'gatech_': ('Georgia Tech', 'gatech.edu'),
+    'vt_': ('Virginia Tech', 'vt.edu'),
+    'mit_': ('MIT', 'mit.edu'),
+    'purdue_': ('Purdue', 'purdue.edu'),
+    'northwestern_': ('Northwestern', 'northwestern.edu'),
+    'asu_': ('Arizona State', 'asu.edu'),
+    'uw_': ('University of Washington', 'uw.edu'),
+    'colorado_': ('University of Colorado', 'colorado.edu'),
+    'cornell_': ('Cornell', 'cornell.edu'),
+    'columbia_': ('Columbia', 'columbia.edu'),
+    'harvard_': ('Harvard', 'harvard.edu'),
+    'jhu_': ('Johns Hopkins', 'jhu.edu'),
+    'cmu_': ('Carnegie Mellon', 'cmu.edu'),
+    'yale_': ('Yale', 'yale.edu'),
+    'minnesota_': ('University of Minnesota', 'umn.edu'),
+    'illinois_': ('University of Illinois', 'illinois.edu'),
+    'indiana_': ('Indiana University', 'indiana.edu'),
+    'vanderbilt_': ('Vanderbilt', 'vanderbilt.edu'),
+    'olemiss_': ('Ole Miss', 'olemiss.edu'),
+    'arkansas_': ('University of Arkansas', 'uark.edu'),
+    'kentucky_': ('University of Kentucky', 'uky.edu'),
+    'sc_': ('University of South Carolina', 'sc.edu'),
+    'miami_': ('University of Miami', 'miami.edu'),
+}
+
+CONFERENCES = {
+    'SEC': ['Auburn', 'University of Alabama', 'University of Arkansas', 'University of Florida',
+            'University of Georgia', 'University of Kentucky', 'LSU', 'Ole Miss', 'University of Oklahoma',
+            'University of South Carolina', 'University of Tennessee', 'Texas A&M', 'UT Austin', 'Vanderbilt'],
+    'Big Ten': ['Indiana University', 'University of Iowa', 'University of Michigan',
+                'Michigan State', 'University of Minnesota', 'Northwestern', 'Ohio State',
+                'University of Oregon', 'Penn State', 'Purdue', 'UCLA', 'USC',
+                'University of Washington', 'Wisconsin', 'University of Illinois'],
+    'ACC': ['UC Berkeley', 'Clemson', 'Duke', 'Florida State', 'Georgia Tech', 'University of Miami',
+            'UNC Chapel Hill', 'Notre Dame', 'Stanford', 'Virginia Tech'],
+}
+
+# Output column variants, in order of preference
+DEPARTMENT_COLUMNS = ['department', 'lab_department', 'school', 'program', 'lab_or_affiliation',
+                      'lab', 'organization']
+ROLE_COLUMNS = ['role', 'type']
+SOURCE_URL_COLUMNS = ['source_url', 'source']
+
+CONTACT_FIELDS = ['name', 'university', 'department', 'role', 'title', 'source_url']
+
+
+def detect_university(path, email=''):
+    """University for a file (by name prefix) or, failing that, an email (by domain)."""
+    fname = os.path.basename(path).lower()
+    for prefix, (uni, _) in SCHOOL_MAP.items():
+        if fname.startswith(prefix):
+            return uni
+    domain = email.rsplit('@', 1)[-1]
+    for uni, school_domain in SCHOOL_MAP.values():
+        if domain == school_domain or domain.endswith('.' + school_domain):
+            return uni
+    return None
+
+
+def classify_role(raw_role='', department='', title=''):
+    raw = f"{raw_role} {department} {title}".lower()
+    if any(kw in raw for kw in ['faculty', 'professor', 'principal investigator']):
+        return 'faculty'
+    if any(kw in raw for kw in ['coach', 'coaching']):
+        return 'coach'
+    if any(kw in raw for kw in ['staff', 'admin', 'manager', 'coordinator', 'senior scientist', 'director']):
+        return 'staff'
+    if any(kw in raw for kw in ['student org', 'assu', 'asuc', 'usg', 'gsg', 'student government']):
+        return 'student_org'
+    return 'student'
+
+
+def first_value(row, columns):
+    for col in columns:
+        value = (row.get(col) or '').strip()
+        if value:
+            return value
+    return None
+
+
+def normalize(row, source, university=None):
+    """One scrape row -> source_rows record, or None if it has no usable email."""
+    email = (row.get('email') or '').strip().lower()
+    if '@' not in email:
+        return None
+    department = first_value(row, DEPARTMENT_COLUMNS)
+    raw_role = first_value(row, ROLE_COLUMNS)
+    title = first_value(row, ['title'])
+    name = first_value(row, ['name'])
+    return {
+        'email': email,
+        'name': name[:200] if name else None,
+        'university': university or detect_university(source, email),
+        'department': department[:200] if department else None,
+        'role': classify_role(raw_role or '', department or '', title or ''),
+        'raw_role': raw_role,
+        'title': title,
+        'source_url': (first_value(row, SOURCE_URL_COLUMNS) or '')[:500] or None,
+    }
+
+
+def read_source(path):
+    """Rows of a scrape output: CSV, a JSON list, or {"contacts": [...]}."""
+    if path.endswith('.json'):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = data.get('contacts', [])
+        return [r for r in data if isinstance(r, dict)]
+    with open(path, encoding='utf-8', errors='replace', newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def source_key(path):
+    """Sources are named relative to the repo so scrapers' absolute OUTPUT paths match imports."""
+    path = os.path.abspath(path)
+    rel = os.path.relpath(path, BASE_DIR)
+    return path if rel.startswith('..') else rel
+
+
+# ─── Store ───────────────────────────────────────────────────────────────────
+
+class LeadStore:
+    def __init__(self, path=None):
+        self.path = path or LEAD_DB
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS sources (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                source TEXT NOT NULL UNIQUE,
+                sha256 TEXT,
+                rows INTEGER NOT NULL,
+                imported_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS source_rows (
+                source TEXT NOT NULL,
+                email TEXT NOT NULL,
+                name TEXT,
+                university TEXT,
+                department TEXT,
+                role TEXT,
+                raw_role TEXT,
+                title TEXT,
+                source_url TEXT,
+                PRIMARY KEY (source, email)
+            );
+            CREATE INDEX IF NOT EXISTS idx_source_rows_email ON source_rows (email);
+            CREATE TABLE IF NOT EXISTS contacts (
+                email TEXT PRIMARY KEY,
+                name TEXT,
+                university TEXT,
+                department TEXT,
+                role TEXT,
+                title TEXT,
+                source_url TEXT,
+                n_sources INTEGER NOT NULL,
+                canonical TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_contacts_university ON contacts (university, role);
+            CREATE INDEX IF NOT EXISTS idx_contacts_department ON contacts (department);
+            CREATE INDEX IF NOT EXISTS idx_contacts_role ON contacts (role);
+        """)
+        columns = [row[1] for row in self.conn.execute('PRAGMA table_info(contacts)')]
+        if 'canonical' not in columns:
+            self.conn.execute('ALTER TABLE contacts ADD COLUMN canonical TEXT')
+            self.conn.executemany('UPDATE contacts SET canonical = ? WHERE email = ?',
+                                  [(canonical_email(e), e) for (e,) in
+                                   self.conn.execute('SELECT email FROM contacts').fetchall()])
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_contacts_canonical ON contacts (canonical)')
+        self.conn.commit()
+
+    # ─── Writing ─────────────────────────────────────────────────────────────
+
+    def replace_source(self, source, rows, university=None, sha256=None):
+        """
+        Make `rows` the full contents of `source` (a file or scraper name).
+        Returns (rows stored, emails re-merged).
+        """
+        records = {}
+        for row in rows:
+            record = normalize(row, source, university)
+            if record and record['email'] not in records:
+                records[record['email']] = record
+
+        old = {e for (e,) in self.conn.execute('SELECT email FROM source_rows WHERE source = ?', (source,))}
+        self.conn.execute('DELETE FROM source_rows WHERE source = ?', (source,))
+        self.conn.executemany(
+            'INSERT INTO source_rows (source, email, name, university, department, role, raw_role, title, '
+            'source_url) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            [(source, r['email'], r['name'], r['university'], r['department'], r['role'], r['raw_role'],
+              r['title'], r['source_url']) for r in records.values()],
+        )
+        # Re-importing moves the source to the end, so its values win the merge
+        self.conn.execute('DELETE FROM sources WHERE source = ?', (source,))
+        self.conn.execute('INSERT INTO sources (source, sha256, rows, imported_at) VALUES (?, ?, ?, ?)',
+                          (source, sha256, len(records), time.time()))
+        touched = old | records.keys()
+        self._merge(touched)
+        self.conn.commit()
+        return len(records), len(touched)
+
+    def _merge(self, emails):
+        """Rebuild the contacts rows of `emails` from their source rows, newest source first."""
+        emails = sorted(emails)
+        cols = ', '.join(f'r.{c}' for c in CONTACT_FIELDS)
+        for start in range(0, len(emails), MERGE_CHUNK):
+            chunk = emails[start:start + MERGE_CHUNK]
+            marks = ', '.join('?' for _ in chunk)
+            merged = {}
+            for email, *values in self.conn.execute(
+                    f'SELECT r.email, {cols} FROM source_rows r JOIN sources s ON s.source = r.source '
+                    f'WHERE r.email IN ({marks}) ORDER BY s.seq DESC', chunk):
+                contact = merged.setdefault(email, dict(dict.fromkeys(CONTACT_FIELDS), n_sources=0))
+                contact['n_sources'] += 1
+                for field, value in zip(CONTACT_FIELDS, values):
+                    if contact[field] is None and value:
+                        contact[field] = value
+            self.conn.execute(f'DELETE FROM contacts WHERE email IN ({marks})', chunk)
+            self.conn.executemany(
+                f'INSERT INTO contacts (email, {", ".join(CONTACT_FIELDS)}, n_sources, canonical) '
+                f'VALUES (?, {", ".join("?" for _ in CONTACT_FIELDS)}, ?, ?)',
+                [(email, *(c[f] for f in CONTACT_FIELDS), c['n_sources'], canonical_email(email))
+                 for email, c in merged.items()],
+            )
+
+    def import_file(self, path, force=False, university=None):
+        """Import one scrape output if its hash changed. Returns (rows, merged) or None if skipped."""
+        source = source_key(path)
+        digest = file_sha256(path)
+        row = self.conn.execute('SELECT sha256 FROM sources WHERE source = ?', (source,)).fetchone()
+        if row and row[0] == digest and not force:
+            return None
+        return self.replace_source(source, read_source(path), university, digest)
+
+    def drop_source(self, source):
+        old = {e for (e,) in self.conn.execute('SELECT email FROM source_rows WHERE source = ?', (source,))}
+        self.conn.execute('DELETE FROM source_rows WHERE source = ?', (source,))
+        self.conn.execute('DELETE FROM sources WHERE source = ?', (source,))
+        self._merge(old)
+        self.conn.commit()
+        return len(old)
+
+    # ─── Queries ─────────────────────────────────────────────────────────────
+
+    def query(self, universities=None, role=None, department=None, no_name=False, limit=None):
+        """Matching contacts, one per canonical key (named rows first)."""
+        where, params = [], []
+        if universities:
+            where.append(f"university IN ({', '.join('?' for _ in universities)})")
+            params += list(universities)
+        if role:
+            where.append('role = ?')
+            params.append(role)
+        if department:
+            where.append('department LIKE ?')
+            params.append(f'%{department}%')
+        if no_name:
+            # Unnamed only if no alias of the address has a name either
+            where.append('name IS NULL AND NOT EXISTS (SELECT 1 FROM contacts n '
+                         'WHERE n.canonical = contacts.canonical AND n.name IS NOT NULL)')
+        sql = 'SELECT email, name, university, department, role, title, source_url, canonical FROM contacts'
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += ' ORDER BY university, department, name IS NULL, email'
+        cursor = self.conn.execute(sql, params)
+        names = [d[0] for d in cursor.description]
+        rows, seen = [], set()
+        for values in cursor:
+            row = dict(zip(names, values))
+            key = row.pop('canonical')
+            if key in seen:
+                continue
+            seen.add(key)
+            rows.append(row)
+            if limit and len(rows) >= limit:
+                break
+        return rows
+
+    def counts(self):
+        """Totals plus (university, role, contacts) rows."""
+        return {
+            'contacts': self.conn.execute('SELECT COUNT(*) FROM contacts').fetchone()[0],
+            'no_name': self.conn.execute('SELECT COUNT(*) FROM contacts WHERE name IS NULL').fetchone()[0],
+            'people': self.conn.execute('SELECT COUNT(DISTINCT canonical) FROM contacts').fetchone()[0],
+            'sources': self.conn.execute('SELECT COUNT(*) FROM sources').fetchone()[0],
+            'by_university': self.conn.execute(
+                'SELECT COALESCE(university, "?"), role, COUNT(*) FROM contacts '
+                'GROUP BY university, role ORDER BY university, role').fetchall(),
+        }
+
+    def close(self):
+        self.conn.close()
+
+
+def write_contacts(rows, source, university=None, path=None):
+    """
+    For scrapers: store a run's full result under `source` (normally the
+    OUTPUT_CSV just written; its hash is stamped so `import` skips it).
+    """
+    store = LeadStore(path)
+    try:
+        digest = file_sha256(source) if os.path.isfile(source) else None
+        stored, _ = store.replace_source(source_key(source), rows, university, digest)
+    finally:
+        store.close()
+    return stored
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+def find_sources(patterns):
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern if os.path.isabs(pattern) else os.path.join(BASE_DIR, pattern)))
+        if not matches and os.path.exists(pattern):
+            matches = [pattern]
+        paths += [p for p in matches if p not in paths]
+    return paths
+
+
+def cmd_import(store, args):
+    paths = find_sources(args.paths or DEFAULT_SOURCES)
+    print(f"  Importing into {store.path} ({len(paths)} files)\n")
+    imported = skipped = 0
+    for path in paths:
+        result = store.import_file(path, force=args.force)
+        if result is None:
+            skipped += 1
+            continue
+        imported += 1
+        rows, merged = result
+        print(f"  {source_key(path):<45} {rows:>6,} rows  ({merged:,} contacts re-merged)")
+    print(f"\n  {imported} imported, {skipped} unchanged")
+
+
+def cmd_query(store, args):
+    universities = list(args.university or [])
+    for conf in args.conference or []:
+        if conf not in CONFERENCES:
+            print(f"Unknown conference: {conf}. Known: {', '.join(CONFERENCES)}")
+            sys.exit(1)
+        universities += CONFERENCES[conf]
+    rows = store.query(universities, args.role, args.department, args.no_name, args.limit)
+    if args.csv:
+        with open(args.csv, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=['email', 'name', 'university', 'department', 'role',
+                                                   'title', 'source_url'])
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"  {len(rows):,} contacts written to {args.csv}")
+        return
+    for r in rows:
+        print(f"  {r['email']:<40} {(r['name'] or '-')[:25]:<25} {(r['university'] or '?')[:22]:<22} "
+              f"{r['role']:<8} {(r['department'] or '')[:40]}")
+    print(f"\n  {len(rows):,} contacts")
+
+
+def cmd_stats(store):
+    c = store.counts()
+    print(f"  {c['contacts']:,} contacts from {c['sources']} sources ({c['no_name']:,} without a name)")
+    print(f"  {c['people']:,} distinct canonical addresses\n")
+    current = None
+    for university, role, count in c['by_university']:
+        if university != current:
+            print(f"  {university}")
+            current = university
+        print(f"      {role:<12} {count:>7,}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Indexed local store of university scrape outputs')
+    parser.add_argument('--db', type=str, help=f'Store path (default: {LEAD_DB})')
+    sub = parser.add_subparsers(dest='command')
+    p_import = sub.add_parser('import', help='Import changed scrape outputs')
+    p_import.add_argument('paths', nargs='*', help='Files or globs (default: *_emails.csv and friends)')
+    p_import.add_argument('--force', action='store_true', help='Re-import even if unchanged')
+    p_query = sub.add_parser('query', help='Query merged contacts')
+    p_query.add_argument('--university', action='append', help='University name (repeatable)')
+    p_query.add_argument('--conference', action='append', help=f"One of: {', '.join(CONFERENCES)}")
+    p_query.add_argument('--role', type=str, help='student, faculty, staff, coach, student_org')
+    p_query.add_argument('--department', type=str, help='Department substring')
+    p_query.add_argument('--no-name', action='store_true', help='Only contacts without a name')
+    p_query.add_argument('--limit', type=int)
+    p_query.add_argument('--csv', type=str, help='Write results to a CSV instead of printing')
+    sub.add_parser('stats', help='Counts by university and role')
+    args = parser.parse_args()
+
+    if args.command not in ('import', 'query', 'stats'):
+        parser.print_help()
+        sys.exit(1)
+
+    store = LeadStore(args.db)
+    try:
+        if args.command == 'import':
+            cmd_import(store, args)
+        elif args.command == 'query':
+            cmd_query(store, args)
+        else:
+            cmd_stats(store)
+    finally:
+        store.close()
+
+
+if __name__ == '__main__':
+    main()
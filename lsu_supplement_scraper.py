@@ -5,13 +5,15 @@ Many LSU departments restructured their websites and use /faculty/, /directory/,
 """
 
 import requests
-from bs4 import BeautifulSoup
 import re
 import csv
 import json
 import time
 from urllib.parse import urljoin
 
+from lead_store import write_contacts
+from page_cache import PAGES
+
 
 def log(msg):
     print(msg, flush=True)
@@ -82,10 +84,13 @@ def is_admin_email(email):
 
 
 def get_soup(url, session):
+    cached = PAGES.lookup(url)
+    if cached:
+        return cached
     try:
         resp = session.get(url, headers=HEADERS, timeout=20, allow_redirects=True)
         if resp.status_code == 200:
-            return BeautifulSoup(resp.text, 'html.parser'), resp.url
+            return PAGES.store(url, resp)
         else:
             return None, None
     except Exception as e:
@@ -133,6 +138,7 @@ def try_get_name_for_email(soup, email):
     return ""
 
 
+@PAGES.memoize
 def extract_from_person_cards(soup, url, department):
     results = []
     seen_emails = set()
@@ -280,6 +286,10 @@ def scrape_department(config, session):
         if final_url:
             all_pages_scraped.add(final_url)
 
+        if not PAGES.first_visit(soup, department):
+            log(f"    -> Same content as an earlier page, skipped")
+            continue
+
         successful_url = final_url or url
         log(f"    -> Loaded ({successful_url})")
 
@@ -332,6 +342,9 @@ def scrape_department(config, session):
                 page_soup, page_final = get_soup(page_url, session)
                 if page_soup is None:
                     continue
+                if not PAGES.first_visit(page_soup, department):
+                    log(f"    -> Same content as an earlier page, skipped")
+                    continue
                 pg_text = page_soup.get_text(separator=' ', strip=True)
                 pg_emails = extract_lsu_emails(pg_text)
                 pg_mailto = extract_mailto_emails(page_soup)
@@ -599,6 +612,7 @@ def main():
     log(f"{'=' * 70}")
     log(f"New unique emails added: {new_count}")
     log(f"Total unique emails now: {len(existing_results)}")
+    log(f"Page cache: {PAGES.summary()}")
 
     # Save merged CSV
     with open(OUTPUT_CSV, 'w', newline='') as f:
@@ -612,6 +626,8 @@ def main():
     with open(OUTPUT_JSON, 'w') as f:
         json.dump(existing_results, f, indent=2)
     log(f"Saved to {OUTPUT_JSON}")
+    n = write_contacts(existing_results, OUTPUT_CSV)
+    log(f"Stored {n} contacts in the lead store")
 
     # Summary by department
     log(f"\n{'=' * 70}")
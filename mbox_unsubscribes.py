@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Vora Mbox Unsubscribes
+Streams the Gmail "Unsubscribe" label exports (unsubscribed/**/*.mbox) into
+the suppression store, so every sender that checks SuppressionIndex skips
+people who asked to be removed by replying.
+
+- streaming: the mbox is read line by line and only each message's header
+  block is kept, so a multi-GB Takeout export costs a few KB of memory
+- watermark: suppressions.db remembers, per mbox, the byte offset of the
+  last message parsed; a re-run seeks there and parses only mail appended
+  since. A file that shrank or whose first bytes changed (a fresh Takeout
+  export in the same place) is rescanned from the start
+- sender: the From address of each message; for our own messages in the
+  thread (e.g. "you've been removed" replies) the To/Cc recipients instead
+- inserts go through suppressions.add_suppressions, so re-parsing a message
+  is harmless
+
+Usage:
+    python mbox_unsubscribes.py                       # all unsubscribed/**/*.mbox
+    python mbox_unsubscribes.py path/to/Replies.mbox --reason reply
+    python mbox_unsubscribes.py --full                # ignore watermarks
+    python mbox_unsubscribes.py --dry-run             # print senders, store nothing
+"""
+
+import argparse
+import glob
+import hashlib
+import os
+import sys
+import time
+from email.parser import BytesHeaderParser
+from email.policy import compat32
+from email.utils import getaddresses, parsedate_to_datetime
+
+from suppressions import BASE_DIR, add_suppressions, connect
+
+DEFAULT_MBOXES = os.path.join(BASE_DIR, 'unsubscribed', '**', '*.mbox')
+OWN_DOMAINS = {d.strip().lower() for d in os.getenv('VORA_OWN_DOMAINS', 'askvora.com').split(',') if d.strip()}
+HEAD_BYTES = 4096  # fingerprint of the file start, to notice a replaced export
+BATCH = 500
+
+
+def connect_watermarks(path=None):
+    conn = connect(path)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS mbox_watermarks (
+            path TEXT PRIMARY KEY,
+            offset INTEGER NOT NULL,
+            head_sha TEXT NOT NULL,
+            messages INTEGER NOT NULL,
+            updated_at REAL NOT NULL
+        )
+    """)
+    conn.commit()
+    return conn
+
+
+def display_path(path):
+    """Repo-relative path for files under the repo, absolute otherwise."""
+    path = os.path.abspath(path)
+    return os.path.relpath(path, BASE_DIR) if path.startswith(BASE_DIR + os.sep) else path
+
+
+def head_sha(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read(HEAD_BYTES)).hexdigest()
+
+
+# ─── Streaming Parser ────────────────────────────────────────────────────────
+
+def iter_message_headers(path, offset=0):
+    """
+    Yield (start_offset, header_bytes) for each message at or after `offset`.
+    Bodies are skipped without being stored; `offset` must be a message start.
+    """
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        start = None
+        headers = []
+        in_headers = False
+        previous_blank = True
+        position = offset
+        for line in f:
+            if line.startswith(b'From ') and previous_blank:
+                if start is not None:
+                    yield start, b''.join(headers)
+                start, headers, in_headers = position, [], True
+            elif in_headers:
+                if line in (b'\n', b'\r\n'):
+                    in_headers = False
+                else:
+                    headers.append(line)
+            previous_blank = line in (b'\n', b'\r\n')
+            position += len(line)
+        if start is not None:
+            yield start, b''.join(headers)
+
+
+def message_senders(header_bytes):
+    """(addresses to suppress, event timestamp or None) for one message's headers."""
+    msg = BytesHeaderParser(policy=compat32).parsebytes(header_bytes)
+    senders = [addr.lower() for _, addr in getaddresses(msg.get_all('From', [])) if '@' in addr]
+    if senders and all(s.rpartition('@')[2] in OWN_DOMAINS for s in senders):
+        # Our own message in the thread: the person is on the other end
+        recipients = getaddresses(msg.get_all('To', []) + msg.get_all('Cc', []))
+        senders = [addr.lower() for _, addr in recipients if '@' in addr]
+    senders = [s for s in senders if s.rpartition('@')[2] not in OWN_DOMAINS]
+    event_at = None
+    if msg.get('Date'):
+        try:
+            event_at = parsedate_to_datetime(msg['Date']).timestamp()
+        except (TypeError, ValueError, IndexError):
+            pass
+    return senders, event_at
+
+
+# ─── Indexing ────────────────────────────────────────────────────────────────
+
+def index_mbox(conn, path, reason='unsubscribe', full=False, dry_run=False):
+    """
+    Parse one mbox from its watermark and suppress its senders.
+    Returns (messages parsed, addresses seen, newly suppressed).
+    """
+    key = display_path(path)
+    size = os.path.getsize(path)
+    head = head_sha(path)
+    row = conn.execute('SELECT offset, head_sha, messages FROM mbox_watermarks WHERE path = ?', (key,)).fetchone()
+    offset, total_messages = 0, 0
+    if row and not full and row[1] == head and row[0] <= size:
+        offset, total_messages = row[0], row[2]
+
+    parsed = seen = added = 0
+    rows = []
+    last_start = offset
+    for start, header_bytes in iter_message_headers(path, offset):
+        last_start = start
+        senders, event_at = message_senders(header_bytes)
+        if not (offset and start == offset):  # the watermark message was counted last run
+            parsed += 1
+            seen += len(senders)
+        rows.extend((email, reason, event_at) for email in senders)
+        if dry_run:
+            for email in senders:
+                print(f"    {email}")
+        elif len(rows) >= BATCH:
+            added += add_suppressions(conn, rows, f"mbox:{key}")
+            rows = []
+    if rows and not dry_run:
+        added += add_suppressions(conn, rows, f"mbox:{key}")
+
+    if not dry_run:
+        # Watermark = start of the last message: if it was still being
+        # appended, the next run re-reads it whole
+        conn.execute(
+            'INSERT OR REPLACE INTO mbox_watermarks (path, offset, head_sha, messages, updated_at) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (key, last_start, head, total_messages + parsed, time.time()),
+        )
+        conn.commit()
+    return parsed, seen, added
+
+
+def find_mboxes(paths):
+    if paths:
+        return paths
+    return sorted(glob.glob(DEFAULT_MBOXES, recursive=True))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Suppress senders found in unsubscribe/reply mbox exports')
+    parser.add_argument('paths', nargs='*', help='mbox files (default: unsubscribed/**/*.mbox)')
+    parser.add_argument('--db', type=str, help='Suppression store path')
+    parser.add_argument('--reason', default='unsubscribe', help='Suppression reason to record (default: unsubscribe)')
+    parser.add_argument('--full', action='store_true', help='Ignore watermarks and rescan every file')
+    parser.add_argument('--dry-run', action='store_true', help='Print senders without storing anything')
+    args = parser.parse_args()
+
+    mboxes = find_mboxes(args.paths)
+    if not mboxes:
+        print("  No mbox files found")
+        sys.exit(1)
+
+    conn = connect_watermarks(args.db)
+    total_added = 0
+    for path in mboxes:
+        if not os.path.exists(path):
+            print(f"  Not found: {path}")
+            continue
+        t0 = time.time()
+        parsed, seen, added = index_mbox(conn, path, args.reason, args.full, args.dry_run)
+        total_added += added
+        print(f"  {display_path(path)}: {parsed} new messages, "
+              f"{seen} addresses, {added} newly suppressed ({time.time() - t0:.2f}s)")
+    print(f"\n  {total_added} new suppressed addresses")
+
+
+if __name__ == '__main__':
+    main()
@@ -15,11 +15,11 @@ import cloudscraper
 import requests
 from bs4 import BeautifulSoup
 import re
-import csv
-import json
 import time
 from urllib.parse import urljoin
 
+from contact_records import CONTACT_FIELDS, ContactList, write_csv, write_json
+
 
 def log(msg):
     print(msg, flush=True)
@@ -641,7 +641,7 @@ def main():
         browser={'browser': 'chrome', 'platform': 'darwin', 'desktop': True}
     )
     session = requests.Session()
-    all_results = []
+    all_results = ContactList()
     global_seen_emails = set()
 
     def add_results(results):
@@ -716,17 +716,12 @@ def main():
 
     # Save CSV
     output_csv = 'michigan_dept_emails.csv'
-    with open(output_csv, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=['email', 'name', 'department', 'source_url'])
-        writer.writeheader()
-        for r in all_results:
-            writer.writerow(r)
+    write_csv(all_results, output_csv, CONTACT_FIELDS)
     log(f"\nSaved to {output_csv}")
 
     # Save JSON
     output_json = 'michigan_dept_emails.json'
-    with open(output_json, 'w') as f:
-        json.dump(all_results, f, indent=2)
+    write_json(all_results, output_json)
     log(f"Saved to {output_json}")
 
     # Print summary by department
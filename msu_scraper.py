@@ -12,12 +12,13 @@ Scrapes @msu.edu (and @ath.msu.edu) emails from:
 import requests
 from bs4 import BeautifulSoup
 import re
-import csv
-import json
 import time
 from urllib.parse import urljoin
 from playwright.sync_api import sync_playwright
 
+from contact_records import CONTACT_FIELDS, ContactList, write_csv, write_json
+from lead_store import write_contacts
+
 
 def log(msg):
     print(msg, flush=True)
@@ -828,7 +829,7 @@ def scrape_engineering_central(pw_page):
 # ============================================================
 
 def main():
-    all_results = []
+    all_results = ContactList()
     global_seen = set()
 
     def add_results(results):
@@ -961,16 +962,13 @@ def main():
     log(f"{'=' * 70}")
     log(f"Total unique MSU emails: {len(all_results)}")
 
-    with open(OUTPUT_CSV, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=["email", "name", "department", "source_url"])
-        writer.writeheader()
-        for r in sorted(all_results, key=lambda x: (x["department"], x["email"])):
-            writer.writerow(r)
+    write_csv(sorted(all_results, key=lambda x: (x["department"], x["email"])), OUTPUT_CSV, CONTACT_FIELDS)
     log(f"\nSaved to {OUTPUT_CSV}")
 
-    with open(OUTPUT_JSON, "w") as f:
-        json.dump(all_results, f, indent=2)
+    write_json(all_results, OUTPUT_JSON)
     log(f"Saved to {OUTPUT_JSON}")
+    n = write_contacts(all_results, OUTPUT_CSV)
+    log(f"Stored {n} contacts in the lead store")
 
     log(f"\n{'=' * 70}")
     log("SUMMARY BY DEPARTMENT:")
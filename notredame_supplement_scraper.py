@@ -17,6 +17,8 @@ import json
 import time
 from urllib.parse import urljoin
 
+from lead_store import write_contacts
+
 
 def log(msg):
     print(msg, flush=True)
@@ -524,6 +526,8 @@ def main():
     with open(OUTPUT_JSON, 'w') as f:
         json.dump(all_results, f, indent=2)
     log(f"Saved to {OUTPUT_JSON}")
+    n = write_contacts(all_results, OUTPUT_CSV)
+    log(f"Stored {n} contacts in the lead store")
 
     # Summary of new results by department
     if new_results:
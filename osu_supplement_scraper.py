@@ -7,13 +7,15 @@ Merges results into the main osu_dept_emails.csv.
 """
 
 import requests
-from bs4 import BeautifulSoup
 import re
 import csv
 import json
 import time
 from urllib.parse import urljoin
 
+from lead_store import write_contacts
+from page_cache import PAGES
+
 
 def log(msg):
     print(msg, flush=True)
@@ -88,10 +90,13 @@ def is_admin_email(email):
 
 def get_soup(url, session):
     """Fetch a page and return BeautifulSoup."""
+    cached = PAGES.lookup(url)
+    if cached:
+        return cached
     try:
         resp = session.get(url, headers=HEADERS, timeout=20, allow_redirects=True)
         if resp.status_code == 200:
-            return BeautifulSoup(resp.text, 'html.parser'), resp.url
+            return PAGES.store(url, resp)
         else:
             log(f"    HTTP {resp.status_code}")
             return None, None
@@ -141,6 +146,7 @@ def try_get_name_for_email(soup, email):
     return ""
 
 
+@PAGES.memoize
 def extract_from_person_cards(soup, url, department):
     """Extract people from card/grid-based layouts."""
     results = []
@@ -218,6 +224,10 @@ def scrape_paginated_directory(base_url, department, session, max_pages=30):
         soup, final_url = get_soup(url, session)
         if soup is None:
             break
+        if not PAGES.first_visit(soup, department):
+            # Past the last page some directories serve the last page again
+            log(f"    -> Same content as an earlier page, stopping")
+            break
 
         page_text = soup.get_text(separator=' ', strip=True)
 
@@ -480,6 +490,7 @@ def main():
 
     all_results = existing + new_results
     log(f"Total combined: {len(all_results)}")
+    log(f"Page cache: {PAGES.summary()}")
 
     # Save CSV
     with open(OUTPUT_CSV, 'w', newline='') as f:
@@ -493,6 +504,8 @@ def main():
     with open(OUTPUT_JSON, 'w') as f:
         json.dump(all_results, f, indent=2)
     log(f"Saved to {OUTPUT_JSON}")
+    n = write_contacts(all_results, OUTPUT_CSV)
+    log(f"Stored {n} contacts in the lead store")
 
     # Summary of new additions
     log(f"\n{'=' * 70}")
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Vora Page Cache
+Per-run fetch cache for the directory scrapers, so the same page reached
+through a trailing-slash variant, a .html twin, a redirect or a pagination
+link is parsed and scanned once.
+
+- URLs are normalized (lowercased host, no fragment, no trailing slash) and
+  both the requested and the final URL after redirects are remembered, so a
+  URL seen before is answered without another request
+- every 200 body is hashed (sha256); a body already parsed in this run
+  reuses its BeautifulSoup tree and reports the URL it was first seen at, so
+  relative links and source_url stay the same for every copy
+- memoize() caches a page-scanning function's result per (body, arguments):
+  extract_from_person_cards runs once per distinct page, later copies get
+  fresh copies of the cached rows
+- first_visit() tells a department loop that it already scanned this body,
+  so duplicates are skipped instead of re-running every strategy on them
+- parsed trees are held in a small LRU; hashes, URLs and cached results are
+  small and kept for the whole run
+
+Soups are shared between callers, so scrapers must not modify them
+(decompose/extract) after get_soup returns.
+
+Usage:
+    from page_cache import PAGES
+
+    cached = PAGES.lookup(url)
+    if cached:
+        return cached
+    resp = session.get(url, headers=HEADERS, timeout=20, allow_redirects=True)
+    if resp.status_code == 200:
+        return PAGES.store(url, resp)          # (soup, final_url)
+
+    @PAGES.memoize
+    def extract_from_person_cards(soup, url, department): ...
+
+    if not PAGES.first_visit(soup, department):
+        continue
+"""
+
+import functools
+import hashlib
+from collections import OrderedDict
+from urllib.parse import urlsplit, urlunsplit
+
+from bs4 import BeautifulSoup
+
+MAX_SOUPS = 64
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def normalize_url(url):
+    """Comparable form of a URL: lowercase scheme/host, no default port, fragment or trailing slash."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((scheme, host, path, parts.query, ''))
+
+
+def body_hash(content):
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return hashlib.sha256(content).hexdigest()
+
+
+class PageCache:
+    def __init__(self, max_soups=MAX_SOUPS, parser='html.parser'):
+        self.max_soups = max_soups
+        self.parser = parser
+        self._url_hash = {}          # normalized URL -> body hash
+        self._first_url = {}         # body hash -> final URL it was first served at
+        self._soups = OrderedDict()  # body hash -> soup (LRU)
+        self._soup_hash = {}         # id(soup) -> body hash, for held soups only
+        self._results = {}           # (body hash, function, args) -> cached rows
+        self._visited = set()        # (body hash, scope)
+        self.stats = dict.fromkeys(('fetched', 'url_hits', 'same_body', 'parsed', 'memo_hits', 'skipped'), 0)
+
+    # ─── Fetch Layer ─────────────────────────────────────────────────────────
+
+    def lookup(self, url):
+        """(soup, final_url) for a URL already fetched in this run, else None."""
+        digest = self._url_hash.get(normalize_url(url))
+        if digest is None or digest not in self._soups:
+            return None
+        self._soups.move_to_end(digest)
+        self.stats['url_hits'] += 1
+        return self._soups[digest], self._first_url[digest]
+
+    def store(self, url, resp):
+        """
+        Record a successful response; return (soup, final_url).
+        A body already seen comes back as the earlier soup and URL.
+        """
+        self.stats['fetched'] += 1
+        digest = body_hash(resp.content)
+        final_url = resp.url or url
+        for u in (url, final_url):
+            self._url_hash[normalize_url(u)] = digest
+        if digest in self._soups:
+            self.stats['same_body'] += 1
+            self._soups.move_to_end(digest)
+            return self._soups[digest], self._first_url[digest]
+        if digest in self._first_url:
+            # Seen before but evicted: parse again, keep the first URL
+            self.stats['same_body'] += 1
+        self._first_url.setdefault(digest, final_url)
+        soup = BeautifulSoup(resp.text, self.parser)
+        self.stats['parsed'] += 1
+        self._hold(digest, soup)
+        return soup, self._first_url[digest]
+
+    def _hold(self, digest, soup):
+        self._soups[digest] = soup
+        self._soup_hash[id(soup)] = digest
+        while len(self._soups) > self.max_soups:
+            _, old = self._soups.popitem(last=False)
+            self._soup_hash.pop(id(old), None)
+
+    def hash_of(self, soup):
+        """Body hash of a soup returned by store(), None for soups built elsewhere."""
+        return self._soup_hash.get(id(soup))
+
+    # ─── Result Cache ────────────────────────────────────────────────────────
+
+    def memoize(self, fn):
+        """
+        Cache fn(soup, *args) per page body and arguments. Results are lists
+        of row dicts; each call gets its own copies.
+        """
+        name = f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(soup, *args, **kwargs):
+            digest = self.hash_of(soup)
+            if digest is None:
+                return fn(soup, *args, **kwargs)
+            key = (digest, name, args, tuple(sorted(kwargs.items())))
+            rows = self._results.get(key)
+            if rows is None:
+                rows = self._results[key] = fn(soup, *args, **kwargs)
+            else:
+                self.stats['memo_hits'] += 1
+            return [dict(r) for r in rows]
+
+        return wrapper
+
+    def first_visit(self, soup, scope):
+        """False if this page body was already scanned for `scope` (e.g. a department) in this run."""
+        digest = self.hash_of(soup)
+        if digest is None:
+            return True
+        key = (digest, scope)
+        if key in self._visited:
+            self.stats['skipped'] += 1
+            return False
+        self._visited.add(key)
+        return True
+
+    def summary(self):
+        s = self.stats
+        return (f"{s['fetched']} pages fetched, {s['parsed']} parsed, "
+                f"{s['same_body']} duplicate bodies, {s['url_hits']} URL cache hits, "
+                f"{s['memo_hits']} cached scans, {s['skipped']} duplicate pages skipped")
+
+
+PAGES = PageCache()
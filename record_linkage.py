@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Vora Record Linkage
+Merges contact records from several scrape passes/sources into one golden
+record per person, instead of exact-email dedup plus hand-written cleanup.
+
+- blocking: each record gets a few cheap keys (canonical email, last name +
+  first initial, department + last name, email local-part suffix, and
+  name-shaped email keys like jdoe/janedoe), and only records sharing a key
+  are compared, so cost grows with block sizes, not with N²
+- two different addresses only link as a prefix artifact of one another, or
+  when the same name explains both (jane.doe@ / jane_doe@); look-alike
+  addresses without that evidence are treated as different people
+- scoring: weighted string similarity of names, email local parts and
+  departments (Dice coefficient over character bigrams, precomputed per
+  record so a comparison is a few set intersections), plus name-vs-email for records that only have one
+  of the two; pairs at or above the threshold are linked (union-find)
+- a link is refused when both sides already carry clearly different names,
+  so one ambiguous jdoe@ can't chain Jane Doe and John Doe together
+- golden record: fields from the highest-priority record that has them
+  (input order = priority), prefix-artifact emails such as
+  investigatorujadhav@usc.edu lose to ujadhav@usc.edu, and every golden
+  record lists the sources and addresses it was built from
+
+Usage:
+    from record_linkage import link
+    golden = link(manual_rows + scraped_rows)        # earlier rows win
+
+    python record_linkage.py a.csv b.json --out merged.csv
+    python record_linkage.py a.csv b.csv --threshold 0.9 --explain
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import unicodedata
+from collections import defaultdict
+
+from email_canon import canonical_email
+from lead_store import read_source
+
+MATCH_THRESHOLD = 0.88   # pair score needed to link two records
+NAME_CONFLICT = 0.8      # names less similar than this never end up in one cluster
+MAX_BLOCK = 50           # larger blocks (very common names, page junk) are skipped
+SUFFIX_KEY_LEN = 6       # local-part suffix used to block prefix artifacts
+MIN_ARTIFACT_PREFIX = 4  # 'postdoc' + 'ujadhav' is an artifact, 'j' + 'doe' is not
+MIN_STEM = 4             # shorter email/name stems are too common to block on
+
+WEIGHTS = {'name': 0.5, 'email': 0.35, 'department': 0.15}
+
+NAME_NOISE = {'dr', 'prof', 'professor', 'mr', 'mrs', 'ms', 'phd', 'md', 'jr', 'sr', 'ii', 'iii', 'iv'}
+DEPARTMENT_NOISE = {'dept', 'department', 'of', 'the', 'and', 'school', 'program', 'lab', 'graduate',
+                    'grad', 'students', 'student'}
+
+
+# ─── Normalization ───────────────────────────────────────────────────────────
+
+def ascii_fold(text):
+    text = unicodedata.normalize('NFKD', text or '')
+    return ''.join(ch for ch in text if not unicodedata.combining(ch)).lower()
+
+
+def name_tokens(name):
+    """['jane', 'doe'] for 'Dr. Jane Doe', 'Doe, Jane' or 'JANE DOE PhD'."""
+    name = ascii_fold(name)
+    if name.count(',') == 1:
+        last, first = name.split(',')
+        name = f"{first} {last}"
+    name = re.sub(r'\([^)]*\)', ' ', name)  # nicknames: "Junyu (Joanna) Lu"
+    return [t for t in re.findall(r'[a-z]+', name) if t not in NAME_NOISE]
+
+
+def department_key(department):
+    tokens = re.findall(r'[a-z]+', ascii_fold(department))
+    return ' '.join(t for t in tokens if t not in DEPARTMENT_NOISE)
+
+
+def split_email(email):
+    local, _, domain = canonical_email(email).partition('@')
+    return local, domain
+
+
+def email_stem(local):
+    """Local part reduced to letters: 'jane.doe27' -> 'janedoe'."""
+    return re.sub(r'[^a-z]', '', local)
+
+
+def name_stems(tokens):
+    """Local parts a person with these name tokens commonly gets."""
+    if len(tokens) < 2:
+        return set(tokens)
+    first, last = tokens[0], tokens[-1]
+    return {first + last, first[0] + last, last + first[0], last + first}
+
+
+def is_artifact(local, other_local):
+    """True if `local` is `other_local` with a scraped label glued on the front."""
+    return (local != other_local and local.endswith(other_local)
+            and len(local) - len(other_local) >= MIN_ARTIFACT_PREFIX
+            and local[:len(local) - len(other_local)].isalpha())
+
+
+def bigrams(text):
+    return frozenset(text[i:i + 2] for i in range(len(text) - 1)) or frozenset([text])
+
+
+def dice(a, b):
+    """Dice coefficient of two bigram sets."""
+    if not a or not b:
+        return 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+def similarity(a, b):
+    if a == b:
+        return 1.0
+    return dice(bigrams(a), bigrams(b))
+
+
+# ─── Records ─────────────────────────────────────────────────────────────────
+
+class Record:
+    """Normalized view of one input row, built once and reused by every comparison."""
+
+    __slots__ = ('index', 'row', 'canonical', 'local', 'domain', 'stem', 'tokens', 'name', 'department',
+                 'name_grams', 'local_grams', 'department_grams')
+
+    def __init__(self, index, row):
+        self.index = index
+        self.row = row
+        self.canonical = canonical_email(row.get('email', ''))
+        self.local, _, self.domain = self.canonical.partition('@')
+        self.stem = email_stem(self.local)
+        self.tokens = name_tokens(row.get('name', ''))
+        self.name = ' '.join(self.tokens)
+        self.department = department_key(row.get('department', ''))
+        self.name_grams = bigrams(self.name) if self.name else frozenset()
+        self.local_grams = bigrams(self.local) if self.local else frozenset()
+        self.department_grams = bigrams(self.department) if self.department else frozenset()
+
+    def blocking_keys(self):
+        keys = []
+        if self.canonical:
+            keys.append('e:' + self.canonical)
+            if len(self.local) >= SUFFIX_KEY_LEN:
+                keys.append(f'l:{self.domain}:{self.local[-SUFFIX_KEY_LEN:]}')
+            if len(self.stem) >= MIN_STEM:
+                keys.append('x:' + self.stem)
+        if self.tokens:
+            first, last = self.tokens[0], self.tokens[-1]
+            keys.append(f'n:{last}:{first[0]}')
+            if self.department:
+                keys.append(f'd:{self.department}:{last}')
+            keys.extend('x:' + stem for stem in name_stems(self.tokens) if len(stem) >= MIN_STEM)
+        return keys
+
+
+def name_explains(record):
+    """True if the record's own name accounts for its email local part."""
+    return bool(record.tokens) and (record.stem in name_stems(record.tokens) or record.stem == record.tokens[0])
+
+
+def email_score(a, b):
+    """Score for two different addresses, or None if they can't be one person's."""
+    if a.domain != b.domain:
+        return None
+    if is_artifact(a.local, b.local) or is_artifact(b.local, a.local):
+        return 0.95
+    # Look-alike addresses (lchen698/lchen699) are usually different people;
+    # only the same name explaining both (jane.doe/jane_doe) links them
+    if a.name == b.name and name_explains(a) and name_explains(b):
+        return 0.9
+    return None
+
+
+def cross_score(named, emailed):
+    """How well one record's name explains the other's email local part."""
+    stems = name_stems(named.tokens)
+    if emailed.stem in stems or emailed.stem == named.tokens[0]:
+        # initials-based forms (jdoe) fit more people than full ones (janedoe)
+        return 1.0 if len(emailed.stem) > len(named.tokens[-1]) + 1 else 0.9
+    return max(similarity(emailed.stem, stem) for stem in stems) * 0.9
+
+
+def score(a, b):
+    """Pair score in [0, 1]; 0 when the records share nothing comparable."""
+    if a.canonical and a.canonical == b.canonical:
+        return 1.0
+    parts = []
+    if a.name and b.name:
+        parts.append((WEIGHTS['name'], 1.0 if a.name == b.name else dice(a.name_grams, b.name_grams)))
+    if a.canonical and b.canonical:
+        email = email_score(a, b)
+        if email is None:
+            return 0.0
+        parts.append((WEIGHTS['email'], email))
+    elif a.tokens and b.stem:
+        parts.append((WEIGHTS['email'], cross_score(a, b)))
+    elif b.tokens and a.stem:
+        parts.append((WEIGHTS['email'], cross_score(b, a)))
+    if not parts:
+        return 0.0
+    if a.department and b.department:
+        parts.append((WEIGHTS['department'], dice(a.department_grams, b.department_grams)))
+    return sum(w * s for w, s in parts) / sum(w for w, _ in parts)
+
+
+# ─── Linking ─────────────────────────────────────────────────────────────────
+
+class Clusters:
+    """Union-find over record indexes; each root remembers its cluster's name."""
+
+    def __init__(self, records):
+        self.parent = list(range(len(records)))
+        self.name = [r.name_grams for r in records]
+
+    def find(self, i):
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i, j):
+        ri, rj = self.find(i), self.find(j)
+        if ri == rj:
+            return False
+        if self.name[ri] and self.name[rj] and dice(self.name[ri], self.name[rj]) < NAME_CONFLICT:
+            return False
+        if rj < ri:
+            ri, rj = rj, ri  # the earlier (higher-priority) record stays the root
+        self.parent[rj] = ri
+        self.name[ri] = self.name[ri] or self.name[rj]
+        return True
+
+
+def find_links(records, threshold=MATCH_THRESHOLD, stats=None):
+    """Cluster records; returns (Clusters, [(i, j, score), ...] for every link made)."""
+    blocks = defaultdict(list)
+    for record in records:
+        for key in set(record.blocking_keys()):
+            blocks[key].append(record.index)
+
+    clusters = Clusters(records)
+    links = []
+    compared = skipped = 0
+    # Exact canonical matches first: they never need scoring
+    for key, members in blocks.items():
+        if key.startswith('e:'):
+            for j in members[1:]:
+                if clusters.union(members[0], j):
+                    links.append((members[0], j, 1.0))
+    for key, members in blocks.items():
+        if key.startswith('e:') or len(members) < 2:
+            continue
+        if len(members) > MAX_BLOCK:
+            skipped += 1
+            continue
+        for pos, i in enumerate(members):
+            for j in members[pos + 1:]:
+                if clusters.find(i) == clusters.find(j):
+                    continue
+                compared += 1
+                s = score(records[i], records[j])
+                if s >= threshold and clusters.union(i, j):
+                    links.append((i, j, round(s, 3)))
+    if stats is not None:
+        stats.update(records=len(records), blocks=len(blocks), compared=compared,
+                     skipped_blocks=skipped, links=len(links))
+    return clusters, links
+
+
+def golden_record(members):
+    """One merged row from a cluster's records (sorted by priority)."""
+    golden = {}
+    for record in members:
+        for field, value in record.row.items():
+            if field not in golden or (value not in (None, '') and golden[field] in (None, '')):
+                golden[field] = value
+
+    emails = []
+    for record in members:
+        email = (record.row.get('email') or '').strip().lower()
+        if email and email not in emails:
+            emails.append(email)
+    locals_by_domain = defaultdict(set)
+    for record in members:
+        if record.canonical:
+            locals_by_domain[record.domain].add(record.local)
+    clean = [e for e in emails
+             if not any(is_artifact(split_email(e)[0], other)
+                        for other in locals_by_domain[split_email(e)[1]])]
+    if emails:
+        golden['email'] = (clean or emails)[0]
+
+    golden['linked_emails'] = emails
+    golden['linked_sources'] = sorted({str(r.row.get('source') or r.row.get('source_url') or '')
+                                       for r in members} - {''})
+    golden['linked_records'] = len(members)
+    return golden
+
+
+def link(rows, threshold=MATCH_THRESHOLD, stats=None):
+    """
+    Golden records for `rows` (dicts with any of email/name/department/...).
+    Earlier rows take priority for every field. Each golden record carries
+    linked_emails, linked_sources and linked_records for provenance.
+    """
+    records = [Record(i, row) for i, row in enumerate(rows)]
+    clusters, _ = find_links(records, threshold, stats)
+    grouped = defaultdict(list)
+    for record in records:
+        grouped[clusters.find(record.index)].append(record)
+    return [golden_record(members) for _, members in sorted(grouped.items())]
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+def load_rows(paths):
+    rows = []
+    for path in paths:
+        for row in read_source(path):
+            row.setdefault('source', os.path.basename(path))
+            rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge contact files into golden records")
+    parser.add_argument("paths", nargs='+', help="CSV/JSON contact files, highest priority first")
+    parser.add_argument("--out", help="Write golden records here (.csv or .json)")
+    parser.add_argument("--threshold", type=float, default=MATCH_THRESHOLD)
+    parser.add_argument("--explain", action="store_true", help="Print every non-exact link with its score")
+    args = parser.parse_args()
+
+    for path in args.paths:
+        if not os.path.exists(path):
+            print(f"  Not found: {path}")
+            sys.exit(1)
+
+    rows = load_rows(args.paths)
+    stats = {}
+    if args.explain:
+        records = [Record(i, row) for i, row in enumerate(rows)]
+        _, links = find_links(records, args.threshold)
+        for i, j, s in links:
+            a, b = records[i].row, records[j].row
+            if records[i].canonical and records[i].canonical == records[j].canonical:
+                continue
+            print(f"  {s:.3f}  {a.get('name') or '-'} <{a.get('email') or '-'}>  ~  "
+                  f"{b.get('name') or '-'} <{b.get('email') or '-'}>")
+    golden = link(rows, args.threshold, stats)
+
+    print(f"\n{'=' * 60}")
+    print(f"  RECORD LINKAGE")
+    print(f"{'=' * 60}")
+    print(f"  Input records:     {stats['records']:,} from {len(args.paths)} files")
+    print(f"  Blocks:            {stats['blocks']:,} ({stats['skipped_blocks']} too large, skipped)")
+    print(f"  Pairs compared:    {stats['compared']:,}")
+    print(f"  Golden records:    {len(golden):,}")
+    print(f"  Merged away:       {stats['records'] - len(golden):,}")
+    print(f"  With >1 source:    {sum(1 for g in golden if len(g['linked_sources']) > 1):,}")
+
+    if args.out:
+        if args.out.endswith('.json'):
+            with open(args.out, 'w') as f:
+                json.dump(golden, f, indent=2)
+        else:
+            fields = []
+            for g in golden:
+                fields.extend(k for k in g if k not in fields)
+            with open(args.out, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=fields)
+                writer.writeheader()
+                for g in golden:
+                    writer.writerow({**g, 'linked_emails': ';'.join(g['linked_emails']),
+                                     'linked_sources': ';'.join(g['linked_sources'])})
+        print(f"  Saved to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Vora Render Archive
+Renders outreach emails in parallel worker processes and writes them to a
+compressed zip archive keyed by recipient, without touching SendGrid.
+
+Used by the --render-only mode of outreach.py, gym_outreach.py and
+college_outreach.py. Each archive member is `<recipient>.json` holding
+{"to", "subject", "html", "meta"}.
+
+Usage:
+    # Inspect an archive
+    python render_archive.py results/irvine_ca_rendered.zip
+    python render_archive.py results/irvine_ca_rendered.zip --show jane@clinic.com
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+
+def _render_item(job):
+    """Worker entry point: run the render function for one (key, payload) job."""
+    render_fn, key, payload = job
+    try:
+        subject, html, meta = render_fn(payload)
+        return key, subject, html, meta, None
+    except Exception as e:
+        return key, None, None, None, str(e)
+
+
+def render_to_archive(render_fn, items, archive_path, workers=None):
+    """
+    Render every item in worker processes and write the results to a zip archive.
+
+    render_fn: module-level function taking a payload and returning
+               (subject, html, meta_dict). Must be picklable.
+    items: list of (recipient, payload) tuples
+    archive_path: output .zip path (overwritten)
+    workers: worker process count (default: CPU count)
+
+    Returns a stats dict.
+    """
+    workers = workers or os.cpu_count() or 1
+    out_dir = os.path.dirname(archive_path)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+
+    jobs = [(render_fn, key, payload) for key, payload in items]
+    chunksize = max(1, len(jobs) // (workers * 8))
+
+    written = set()
+    duplicates = 0
+    errors = []
+    html_sizes = []
+    raw_bytes = 0
+
+    start = time.time()
+    with zipfile.ZipFile(archive_path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for key, subject, html, meta, error in pool.map(_render_item, jobs, chunksize=chunksize):
+                if error:
+                    errors.append((key, error))
+                    continue
+                member = key.strip().lower()
+                if member in written:
+                    duplicates += 1
+                    continue
+                written.add(member)
+                record = json.dumps({
+                    'to': key,
+                    'subject': subject,
+                    'html': html,
+                    'meta': meta or {},
+                }, ensure_ascii=False).encode('utf-8')
+                raw_bytes += len(record)
+                html_sizes.append(len(html.encode('utf-8')))
+                zf.writestr(f"{member}.json", record)
+    elapsed = time.time() - start
+
+    return {
+        'archive_path': archive_path,
+        'rendered': len(written),
+        'duplicates': duplicates,
+        'errors': errors,
+        'workers': workers,
+        'elapsed': elapsed,
+        'raw_bytes': raw_bytes,
+        'archive_bytes': os.path.getsize(archive_path),
+        'html_min': min(html_sizes) if html_sizes else 0,
+        'html_max': max(html_sizes) if html_sizes else 0,
+        'html_avg': (sum(html_sizes) / len(html_sizes)) if html_sizes else 0,
+    }
+
+
+def _fmt_bytes(n):
+    """Human-readable byte count."""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if n < 1024 or unit == 'GB':
+            return f"{n:.1f} {unit}" if unit != 'B' else f"{int(n)} B"
+        n /= 1024
+
+
+def print_render_stats(stats):
+    """Print the size and timing summary for a render_to_archive run."""
+    elapsed = stats['elapsed']
+    rate = stats['rendered'] / elapsed if elapsed > 0 else 0
+    ratio = stats['raw_bytes'] / stats['archive_bytes'] if stats['archive_bytes'] else 0
+
+    print(f"\n{'=' * 60}")
+    print(f"  RENDER COMPLETE")
+    print(f"{'=' * 60}")
+    print(f"  Archive:      {stats['archive_path']}")
+    print(f"  Rendered:     {stats['rendered']}")
+    print(f"  Duplicates:   {stats['duplicates']}")
+    print(f"  Errors:       {len(stats['errors'])}")
+    print(f"  Workers:      {stats['workers']}")
+    print(f"  Time:         {elapsed:.2f}s ({rate:.0f} emails/sec)")
+    print(f"  HTML size:    min {_fmt_bytes(stats['html_min'])}, "
+          f"avg {_fmt_bytes(stats['html_avg'])}, max {_fmt_bytes(stats['html_max'])}")
+    print(f"  Raw total:    {_fmt_bytes(stats['raw_bytes'])}")
+    print(f"  Archive size: {_fmt_bytes(stats['archive_bytes'])} ({ratio:.1f}x compression)")
+    for key, error in stats['errors'][:10]:
+        print(f"    ✗ {key}: {error}")
+    print(f"{'=' * 60}")
+
+
+def load_rendered(archive_path, recipient):
+    """Return the rendered record for a recipient, or None if not in the archive."""
+    member = f"{recipient.strip().lower()}.json"
+    with zipfile.ZipFile(archive_path) as zf:
+        try:
+            return json.loads(zf.read(member))
+        except KeyError:
+            return None
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect a rendered-email archive')
+    parser.add_argument('archive', help='Path to a *_rendered.zip archive')
+    parser.add_argument('--show', type=str, help='Print subject and HTML for one recipient')
+    parser.add_argument('--limit', type=int, default=20, help='Number of entries to list (default: 20)')
+    args = parser.parse_args()
+
+    if args.show:
+        record = load_rendered(args.archive, args.show)
+        if not record:
+            print(f"  {args.show} not found in {args.archive}")
+            sys.exit(1)
+        print(f"To:      {record['to']}")
+        print(f"Subject: {record['subject']}")
+        for k, v in record.get('meta', {}).items():
+            print(f"{k + ':':<9}{v}")
+        print()
+        print(record['html'])
+        return
+
+    with zipfile.ZipFile(args.archive) as zf:
+        infos = zf.infolist()
+        raw = sum(i.file_size for i in infos)
+        packed = sum(i.compress_size for i in infos)
+        print(f"  {len(infos)} rendered emails, {_fmt_bytes(raw)} raw, {_fmt_bytes(packed)} compressed")
+        for info in infos[:args.limit]:
+            record = json.loads(zf.read(info))
+            print(f"    {record['to']:<40} {record['subject']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -9,9 +9,11 @@ import os
 import sys
 import time
 from dotenv import load_dotenv
-from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import Mail, Email
 
+from sendgrid_retry import send_with_retry
+from suppressions import SuppressionIndex
+
 # Load environment variables from .env
 load_dotenv()
 
@@ -44,8 +46,7 @@ def send_email(to_email, business_name, subject=None, html_content=None):
     )
 
     try:
-        sg = SendGridAPIClient(SENDGRID_API_KEY)
-        response = sg.send(message)
+        response = send_with_retry(SENDGRID_API_KEY, message)
         return response.status_code, None
     except Exception as e:
         return None, str(e)
@@ -70,6 +71,7 @@ def send_from_csv(csv_path, subject=None, html_content=None, delay=1.0):
     total = len(rows)
     sent = 0
     failed = 0
+    suppressed = SuppressionIndex()
 
     print(f"Found {total} recipient(s)\n")
 
@@ -81,6 +83,10 @@ def send_from_csv(csv_path, subject=None, html_content=None, delay=1.0):
             print(f"  [{i+1}/{total}] SKIP - no email for {business_name}")
             continue
 
+        if email in suppressed:
+            print(f"  [{i+1}/{total}] SKIP - {email} is suppressed")
+            continue
+
         print(f"  [{i+1}/{total}] Sending to {email}...", end=' ', flush=True)
 
         status_code, error = send_email(email, business_name, subject, html_content)
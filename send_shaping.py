@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Vora Send Shaping
+Per-recipient-domain scheduling for bulk sends.
+
+College send lists are ordered by audience, so thousands of @ucla.edu or
+@umich.edu addresses would otherwise go out back-to-back and get deferred by
+the receiving MX. This module:
+
+- interleaves recipients so each domain is spread evenly across the run
+- enforces a per-domain ceiling (sends/minute) while other domains keep going
+- reports per-domain throughput at the end of a run
+
+Usage:
+    from send_shaping import interleave_by_domain, DomainScheduler
+
+    send_list = interleave_by_domain(send_list)
+    scheduler = DomainScheduler(send_list, max_per_minute=120)
+    for contact in scheduler:
+        ...send...
+    scheduler.print_report()
+"""
+
+import heapq
+import time
+from collections import defaultdict, deque
+
+DEFAULT_MAX_PER_MINUTE = 120
+
+
+def receiving_domain(email):
+    """
+    Domain that receives mail for an address. University alias subdomains
+    (g.ucla.edu, umail.iu.edu, buckeyemail.osu.edu) share the parent's MX, so
+    .edu addresses are collapsed to their last two labels.
+    """
+    domain = email.rsplit('@', 1)[-1].strip().lower()
+    if domain.endswith('.edu'):
+        domain = '.'.join(domain.split('.')[-2:])
+    return domain
+
+
+def interleave_by_domain(items, email_key='email'):
+    """
+    Reorder items so each domain's recipients are spread evenly over the list.
+    Each item gets a position (k + 0.5) / n within its domain; sorting on that
+    position spaces a domain with n items every ~len/n slots. Order within a
+    domain is preserved.
+    """
+    by_domain = defaultdict(list)
+    for item in items:
+        by_domain[receiving_domain(item[email_key])].append(item)
+
+    keyed = []
+    for domain_idx, (domain, group) in enumerate(by_domain.items()):
+        n = len(group)
+        for k, item in enumerate(group):
+            keyed.append(((k + 0.5) / n, domain_idx, k, item))
+    keyed.sort(key=lambda x: x[:3])
+    return [x[3] for x in keyed]
+
+
+class DomainScheduler:
+    """
+    Iterates over items, yielding each one only when its receiving domain is
+    under its ceiling. When one domain is throttled the next ready domain is
+    served instead; the scheduler only sleeps when every remaining domain is
+    waiting on its ceiling.
+    """
+
+    def __init__(self, items, max_per_minute=DEFAULT_MAX_PER_MINUTE,
+                 email_key='email', dry_run=False):
+        self.interval = 60.0 / max_per_minute if max_per_minute else 0.0
+        self.email_key = email_key
+        self.dry_run = dry_run
+        self.queues = defaultdict(deque)
+        for item in items:
+            self.queues[receiving_domain(item[email_key])].append(item)
+        self.total = sum(len(q) for q in self.queues.values())
+        self.sent_at = defaultdict(list)
+        self.throttle_waits = 0
+        self.throttle_seconds = 0.0
+
+    def __len__(self):
+        return self.total
+
+    def __iter__(self):
+        # heap of (ready_at, -remaining, seq, domain): earliest-ready first,
+        # ties broken toward the domain with the most left to send
+        heap = []
+        seq = 0
+        for domain, queue in self.queues.items():
+            heap.append((0.0, -len(queue), seq, domain))
+            seq += 1
+        heapq.heapify(heap)
+
+        while heap:
+            ready_at, _, _, domain = heapq.heappop(heap)
+            now = time.time()
+            if ready_at > now and not self.dry_run:
+                wait = ready_at - now
+                self.throttle_waits += 1
+                self.throttle_seconds += wait
+                time.sleep(wait)
+                now = time.time()
+
+            queue = self.queues[domain]
+            item = queue.popleft()
+            self.sent_at[domain].append(now)
+            yield item
+
+            if queue:
+                heapq.heappush(heap, (now + self.interval, -len(queue), seq, domain))
+                seq += 1
+
+    def domain_stats(self):
+        """Per-domain (count, span_seconds, per_minute) sorted by count."""
+        stats = []
+        for domain, times in self.sent_at.items():
+            span = times[-1] - times[0] if len(times) > 1 else 0.0
+            per_minute = (len(times) - 1) / span * 60 if span > 0 else 0.0
+            stats.append((domain, len(times), span, per_minute))
+        stats.sort(key=lambda s: -s[1])
+        return stats
+
+    def print_report(self, top=15):
+        """Print per-domain throughput for the run."""
+        stats = self.domain_stats()
+        ceiling = 60.0 / self.interval if self.interval else 0
+        print(f"\n  By receiving domain ({len(stats)} domains, ceiling {ceiling:.0f}/min):")
+        for domain, count, span, per_minute in stats[:top]:
+            print(f"    {domain:<28} {count:>6} sent  {per_minute:>6.1f}/min over {int(span // 60)}m{int(span % 60)}s")
+        if len(stats) > top:
+            rest = sum(s[1] for s in stats[top:])
+            print(f"    ... {len(stats) - top} more domains, {rest} sends")
+        if self.throttle_waits:
+            print(f"  Throttled {self.throttle_waits} times, {self.throttle_seconds:.1f}s total waiting on domain ceilings")
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Vora SendGrid Mock Server
+Local stand-in for SendGrid's POST /v3/mail/send so sender throughput can be
+measured without sending real mail.
+
+- 202 + X-Message-Id on success, like SendGrid
+- 400 with a SendGrid-style error body when the payload is missing
+  personalizations / from / subject / content
+- configurable latency, 429 injection (with Retry-After and X-RateLimit-*
+  headers) and 5xx injection
+- every accepted payload is recorded (JSONL file and in-memory counters)
+
+Point the senders at it with SENDGRID_API_HOST (read by sendgrid_retry):
+
+Usage:
+    python sendgrid_mock.py --port 8025 --latency-ms 80 --rate-429 0.02 --record mock_sends.jsonl
+    SENDGRID_API_HOST=http://127.0.0.1:8025 python college_outreach.py --live --limit 500
+
+    # Counters
+    curl http://127.0.0.1:8025/stats
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MockState:
+    """Injection settings plus everything the server has seen."""
+
+    def __init__(self, latency_ms=50, jitter_ms=20, rate_429=0.0, rate_5xx=0.0,
+                 retry_after=1, record_path=None, seed=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_429 = rate_429
+        self.rate_5xx = rate_5xx
+        self.retry_after = retry_after
+        self.record_path = record_path
+        self.rng = random.Random(seed)
+        self.status_counts = Counter()
+        self.payloads = []
+        self.first_request_at = None
+        self.last_request_at = None
+        self.lock = threading.Lock()
+
+    def record(self, status, payload=None):
+        with self.lock:
+            now = time.time()
+            self.first_request_at = self.first_request_at or now
+            self.last_request_at = now
+            self.status_counts[status] += 1
+            if payload is not None:
+                self.payloads.append(payload)
+                if self.record_path:
+                    with open(self.record_path, 'a') as f:
+                        f.write(json.dumps({'received_at': now, 'payload': payload}) + '\n')
+
+    def roll(self):
+        """Pick the injected outcome for one request: 429, 5xx or None."""
+        with self.lock:
+            r = self.rng.random()
+            if r < self.rate_429:
+                return 429
+            if r < self.rate_429 + self.rate_5xx:
+                return self.rng.choice((500, 502, 503))
+            return None
+
+    def stats(self):
+        with self.lock:
+            span = (self.last_request_at or 0) - (self.first_request_at or 0)
+            accepted = self.status_counts.get(202, 0)
+            return {
+                'requests': sum(self.status_counts.values()),
+                'accepted': accepted,
+                'status_counts': {str(k): v for k, v in sorted(self.status_counts.items())},
+                'recipients': sum(
+                    len(p.get('to', [])) for pz in self.payloads
+                    for p in pz.get('personalizations', [])
+                ),
+                'span_seconds': span,
+                'accepted_per_sec': accepted / span if span > 0 else 0.0,
+            }
+
+
+def validate_payload(payload):
+    """Return a list of SendGrid-style error dicts for a /v3/mail/send body."""
+    errors = []
+    personalizations = payload.get('personalizations')
+    if not personalizations:
+        errors.append({'field': 'personalizations', 'message': 'The personalizations field is required.'})
+    else:
+        for i, p in enumerate(personalizations):
+            if not p.get('to'):
+                errors.append({'field': f'personalizations.{i}.to',
+                               'message': 'The to array is required for all personalization objects.'})
+    if not (payload.get('from') or {}).get('email'):
+        errors.append({'field': 'from.email', 'message': 'The from email is required.'})
+    has_subject = payload.get('subject') or all(p.get('subject') for p in personalizations or [{}])
+    if not has_subject:
+        errors.append({'field': 'subject', 'message': 'The subject is required.'})
+    if not payload.get('content') and not payload.get('template_id'):
+        errors.append({'field': 'content', 'message': 'Unless a valid template_id is provided, the content parameter is required.'})
+    return errors
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    server_version = 'VoraSendGridMock/1.0'
+    protocol_version = 'HTTP/1.1'
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def log_message(self, fmt, *args):
+        pass  # quiet: benchmarks would drown in access logs
+
+    def _reply(self, status, body=None, headers=None):
+        data = json.dumps(body).encode() if body is not None else b''
+        self.send_response(status)
+        for k, v in (headers or {}).items():
+            self.send_header(k, str(v))
+        if data:
+            self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        if data:
+            self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/stats':
+            self._reply(200, self.state.stats())
+        else:
+            self._reply(200, {'ok': True})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+
+        if self.path.rstrip('/') != '/v3/mail/send':
+            self.state.record(404)
+            self._reply(404, {'errors': [{'message': 'not found'}]})
+            return
+
+        if not (self.headers.get('Authorization') or '').startswith('Bearer '):
+            self.state.record(401)
+            self._reply(401, {'errors': [{'message': 'Permission denied, wrong credentials', 'field': None}]})
+            return
+
+        st = self.state
+        delay = max(0.0, st.latency_ms + st.rng.uniform(-st.jitter_ms, st.jitter_ms)) / 1000
+        time.sleep(delay)
+
+        injected = st.roll()
+        if injected == 429:
+            st.record(429)
+            self._reply(429, {'errors': [{'message': 'too many requests', 'field': None}]}, {
+                'Retry-After': st.retry_after,
+                'X-RateLimit-Limit': 600,
+                'X-RateLimit-Remaining': 0,
+                'X-RateLimit-Reset': int(time.time()) + st.retry_after,
+            })
+            return
+        if injected:
+            st.record(injected)
+            self._reply(injected, {'errors': [{'message': 'injected server error', 'field': None}]})
+            return
+
+        try:
+            payload = json.loads(raw or b'{}')
+        except ValueError:
+            st.record(400)
+            self._reply(400, {'errors': [{'message': 'Bad Request', 'field': None}]})
+            return
+
+        errors = validate_payload(payload)
+        if errors:
+            st.record(400)
+            self._reply(400, {'errors': errors})
+            return
+
+        st.record(202, payload)
+        self._reply(202, headers={'X-Message-Id': uuid.uuid4().hex[:22]})
+
+
+def start_mock_server(host='127.0.0.1', port=0, **state_kwargs):
+    """Start the mock in a daemon thread. Returns (server, base_url)."""
+    server = ThreadingHTTPServer((host, port), MockHandler)
+    server.daemon_threads = True
+    server.state = MockState(**state_kwargs)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description='Local SendGrid /v3/mail/send mock')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8025)
+    parser.add_argument('--latency-ms', type=float, default=50, help='Mean response latency (default: 50)')
+    parser.add_argument('--jitter-ms', type=float, default=20, help='Uniform latency jitter (default: 20)')
+    parser.add_argument('--rate-429', type=float, default=0.0, help='Fraction of requests answered 429')
+    parser.add_argument('--rate-5xx', type=float, default=0.0, help='Fraction of requests answered 500/502/503')
+    parser.add_argument('--retry-after', type=int, default=1, help='Retry-After seconds on injected 429s')
+    parser.add_argument('--record', type=str, help='Append every accepted payload to this JSONL file')
+    parser.add_argument('--seed', type=int, help='Random seed for reproducible injection')
+    args = parser.parse_args()
+
+    server, url = start_mock_server(
+        args.host, args.port,
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        rate_429=args.rate_429, rate_5xx=args.rate_5xx,
+        retry_after=args.retry_after, record_path=args.record, seed=args.seed,
+    )
+    print(f"  SendGrid mock listening on {url}")
+    print(f"  export SENDGRID_API_HOST={url}")
+    try:
+        while True:
+            time.sleep(10)
+            s = server.state.stats()
+            if s['requests']:
+                print(f"  requests={s['requests']} accepted={s['accepted']} "
+                      f"statuses={s['status_counts']} rate={s['accepted_per_sec']:.1f}/sec")
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(json.dumps(server.state.stats(), indent=2))
+
+
+if __name__ == '__main__':
+    main()
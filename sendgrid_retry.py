@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Vora SendGrid Retry Policy
+Shared retry/backoff and circuit breaker for every SendGrid sender.
+
+- 429 and 5xx responses (and connection errors) are retried.
+- Waits honour Retry-After / X-RateLimit-Reset when SendGrid sends them,
+  otherwise use jittered exponential backoff.
+- A process-wide circuit breaker opens after a run of consecutive retryable
+  failures and pauses every sender until the cooldown ends, so a SendGrid
+  outage slows the send loop down instead of burning the send list.
+
+Usage:
+    from sendgrid_retry import send_with_retry
+
+    try:
+        response = send_with_retry(SENDGRID_API_KEY, message)
+        return response.status_code, None
+    except Exception as e:
+        return None, str(e)
+"""
+
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+MAX_ATTEMPTS = 5
+BASE_DELAY = 1.0       # seconds, first backoff step
+MAX_DELAY = 60.0       # cap on any single wait
+BREAKER_THRESHOLD = 8  # consecutive retryable failures before the breaker opens
+BREAKER_COOLDOWN = 60  # seconds the pipeline pauses once open
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is refused because the breaker is open and pausing is disabled."""
+
+
+def error_status(exc):
+    """Return the HTTP status code carried by a SendGrid/urllib error, or None."""
+    for attr in ('status_code', 'code', 'status'):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def error_headers(exc):
+    """Return the response headers carried by an error as a plain dict (lowercase keys)."""
+    headers = getattr(exc, 'headers', None)
+    if not headers:
+        return {}
+    try:
+        return {k.lower(): v for k, v in headers.items()}
+    except AttributeError:
+        return {}
+
+
+def is_retryable(exc):
+    """429s, 5xx and connection-level failures are retryable; other 4xx are not."""
+    status = error_status(exc)
+    if status is None:
+        # No status: network error, timeout, reset connection
+        return True
+    return status == 429 or status >= 500
+
+
+def server_requested_delay(headers, now=None):
+    """Seconds to wait according to Retry-After or X-RateLimit-Reset, or None."""
+    now = now if now is not None else time.time()
+
+    retry_after = headers.get('retry-after')
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - now)
+            except (TypeError, ValueError):
+                pass
+
+    reset = headers.get('x-ratelimit-reset')
+    if reset:
+        try:
+            return max(0.0, float(reset) - now)
+        except ValueError:
+            pass
+
+    return None
+
+
+def backoff_delay(attempt, base=BASE_DELAY, cap=MAX_DELAY):
+    """Full-jitter exponential backoff for the given 0-based attempt."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """
+    Counts consecutive retryable failures across all senders in the process.
+    Once `threshold` is hit the breaker opens for `cooldown` seconds; calls made
+    while it is open block until it half-opens. One success closes it again.
+    """
+
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_until = 0.0
+        self.trips = 0
+        self._lock = threading.Lock()
+
+    def wait_if_open(self, block=True):
+        """Pause the caller while the breaker is open."""
+        with self._lock:
+            remaining = self.opened_until - time.time()
+        if remaining <= 0:
+            return
+        if not block:
+            raise CircuitOpenError(f"SendGrid circuit open for another {remaining:.0f}s")
+        print(f"  ⏸ SendGrid circuit open — pausing sends for {remaining:.0f}s")
+        time.sleep(remaining)
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.threshold and time.time() >= self.opened_until:
+                self.opened_until = time.time() + self.cooldown
+                self.trips += 1
+                self.failures = 0
+
+
+BREAKER = CircuitBreaker()
+
+
+def call_with_retry(fn, max_attempts=MAX_ATTEMPTS, breaker=BREAKER, sleep=time.sleep):
+    """
+    Call fn() with the shared retry policy. Returns fn()'s result or re-raises
+    the last exception once retries are exhausted or the error is not retryable.
+    """
+    for attempt in range(max_attempts):
+        if breaker:
+            breaker.wait_if_open()
+        try:
+            result = fn()
+        except Exception as e:
+            if not is_retryable(e):
+                raise
+            if breaker:
+                breaker.record_failure()
+            if attempt == max_attempts - 1:
+                raise
+            delay = server_requested_delay(error_headers(e))
+            if delay is None:
+                delay = backoff_delay(attempt)
+            sleep(min(delay, MAX_DELAY) + random.uniform(0, 0.25))
+            continue
+        if breaker:
+            breaker.record_success()
+        return result
+
+
+_clients = {}
+
+
+def get_client(api_key):
+    """
+    Reuse one SendGridAPIClient per API key instead of building one per send.
+    SENDGRID_API_HOST redirects every sender (e.g. to sendgrid_mock.py).
+    """
+    host = os.getenv('SENDGRID_API_HOST', 'https://api.sendgrid.com')
+    client = _clients.get((api_key, host))
+    if client is None:
+        from sendgrid import SendGridAPIClient
+        client = SendGridAPIClient(api_key, host=host)
+        _clients[(api_key, host)] = client
+    return client
+
+
+def send_with_retry(api_key, message, max_attempts=MAX_ATTEMPTS):
+    """Send a sendgrid Mail with the shared retry policy. Returns the response."""
+    client = get_client(api_key)
+    return call_with_retry(lambda: client.send(message), max_attempts=max_attempts)
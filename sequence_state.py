@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Vora Sequence State
+Bulk state transitions for outreach records (follow-up steps, emailed marks).
+
+- ids are updated `chunk_size` at a time with one `id=in.(...)` UPDATE per
+  chunk, instead of one UPDATE per recipient
+- rows that carry their own timestamps are grouped so each distinct value
+  set is one update
+- connection/5xx errors are retried with the shared retry policy; a chunk
+  the database rejects is split in half until the bad ids are isolated
+- every call returns the ids it could not update, so the caller can retry
+  them (or pass them back in with `--ids-file`)
+
+Usage:
+    from sequence_state import mark_step
+
+    failed = mark_step(supabase, ids, step=1)            # followup_1_at = now
+    failed = mark_step(supabase, failed, step=1)          # retry the failures
+
+    # Mark ids from a file (one per line), e.g. ids a previous run failed on
+    python sequence_state.py mark --step 1 --ids-file failed_ids.txt
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime, timezone
+
+from sendgrid_retry import call_with_retry
+from write_behind import is_data_error
+
+CHUNK_SIZE = 500  # ids per UPDATE; keeps the in.(...) filter well under URL limits
+SEQUENCE_TABLE = 'college_outreach_sent'
+
+
+class MarkFailed(Exception):
+    """Raised by bulk writers whose failed ids should go back on the queue."""
+
+    def __init__(self, table, ids):
+        super().__init__(f"{len(ids)} {table} ids not updated")
+        self.ids = ids
+
+
+def step_column(step):
+    """Timestamp column for follow-up step n (followup_1_at, followup_2_at, ...)."""
+    return f"followup_{step}_at"
+
+
+def now_iso():
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+
+
+# ─── Bulk updates ────────────────────────────────────────────────────────────
+
+def _update_chunk(supabase, table, ids, values):
+    """Update one chunk, bisecting around rejected ids. Returns failed ids."""
+    def attempt():
+        try:
+            supabase.table(table).update(values).in_('id', ids).execute()
+        except Exception as e:
+            if is_data_error(e):
+                return e  # rejected by the database: retrying will not help
+            raise
+        return None
+
+    try:
+        rejected = call_with_retry(attempt, breaker=None)
+    except Exception as e:
+        print(f"  ⚠ {table}: update of {len(ids)} ids failed ({str(e)[:150]})")
+        return list(ids)
+    if rejected is None:
+        return []
+    if len(ids) == 1:
+        print(f"  ⚠ {table}: id {ids[0]} rejected ({str(rejected)[:150]})")
+        return list(ids)
+    mid = len(ids) // 2
+    return (_update_chunk(supabase, table, ids[:mid], values)
+            + _update_chunk(supabase, table, ids[mid:], values))
+
+
+def mark_state(supabase, table, ids, values, chunk_size=CHUNK_SIZE):
+    """
+    Set `values` (column -> value) on every record in `ids`.
+    Returns the ids that could not be updated.
+    """
+    ids = list(dict.fromkeys(i for i in ids if i is not None))
+    failed = []
+    for start in range(0, len(ids), chunk_size):
+        failed += _update_chunk(supabase, table, ids[start:start + chunk_size], values)
+    return failed
+
+
+def mark_rows(supabase, table, rows, chunk_size=CHUNK_SIZE):
+    """
+    Apply per-row values, e.g. [{'id': 7, 'followup_1_at': '...'}]. Rows with
+    the same values share chunked updates. Returns the ids not updated.
+    """
+    groups = {}
+    for row in rows:
+        values = tuple(sorted((k, v) for k, v in row.items() if k != 'id'))
+        groups.setdefault(values, []).append(row['id'])
+    failed = []
+    for values, ids in groups.items():
+        failed += mark_state(supabase, table, ids, dict(values), chunk_size)
+    return failed
+
+
+def mark_step(supabase, ids, step=1, sent_at=None, table=SEQUENCE_TABLE, chunk_size=CHUNK_SIZE):
+    """Record follow-up `step` as sent for `ids`. Returns the ids not updated."""
+    return mark_state(supabase, table, ids, {step_column(step): sent_at or now_iso()}, chunk_size)
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk follow-up state updates')
+    sub = parser.add_subparsers(dest='command')
+    p_mark = sub.add_parser('mark', help='Mark ids as having received a follow-up step')
+    p_mark.add_argument('--step', type=int, default=1, help='Follow-up step (default: 1)')
+    p_mark.add_argument('--ids-file', type=str, required=True, help='File with one record id per line')
+    p_mark.add_argument('--sent-at', type=str, help='ISO timestamp (default: now)')
+    p_mark.add_argument('--table', type=str, default=SEQUENCE_TABLE)
+    args = parser.parse_args()
+
+    if args.command != 'mark':
+        parser.print_help()
+        sys.exit(1)
+
+    from dotenv import load_dotenv
+    from supabase import create_client
+    load_dotenv()
+    if not os.getenv('SUPABASE_URL') or not os.getenv('SUPABASE_KEY'):
+        print("ERROR: SUPABASE_URL and SUPABASE_KEY must be set in .env")
+        sys.exit(1)
+    supabase = create_client(os.getenv('SUPABASE_URL'), os.getenv('SUPABASE_KEY'))
+
+    with open(args.ids_file) as f:
+        ids = [int(line) if line.strip().isdigit() else line.strip() for line in f if line.strip()]
+
+    print(f"  Marking {len(ids)} ids: {step_column(args.step)} in {args.table}")
+    failed = mark_step(supabase, ids, args.step, args.sent_at, args.table)
+    print(f"  Updated: {len(ids) - len(failed)}")
+    if failed:
+        out = args.ids_file + '.failed'
+        with open(out, 'w') as f:
+            f.write('\n'.join(str(i) for i in failed) + '\n')
+        print(f"  Failed: {len(failed)} — ids written to {out}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -9,11 +9,11 @@ Scrapes @stanford.edu emails from:
 import requests
 from bs4 import BeautifulSoup
 import re
-import csv
-import json
 import time
 from urllib.parse import urljoin
 
+from contact_records import CONTACT_FIELDS, ContactList, write_csv, write_json
+
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
     'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
@@ -545,7 +545,7 @@ def scrape_profiles_alpha(session, seen_emails):
 
 
 def main():
-    all_results = []
+    all_results = ContactList()
     seen_emails = set()
     session = requests.Session()
 
@@ -591,17 +591,12 @@ def main():
 
     # Save to CSV
     output_csv = 'stanford_eng_emails.csv'
-    with open(output_csv, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=['email', 'name', 'department', 'source_url'])
-        writer.writeheader()
-        for r in sorted(all_results, key=lambda x: (x['department'], x['email'])):
-            writer.writerow(r)
+    write_csv(sorted(all_results, key=lambda x: (x['department'], x['email'])), output_csv, CONTACT_FIELDS)
     print(f"\nSaved to {output_csv}")
 
     # Save as JSON
     output_json = 'stanford_eng_emails.json'
-    with open(output_json, 'w') as f:
-        json.dump(all_results, f, indent=2)
+    write_json(all_results, output_json)
     print(f"Also saved to {output_json}")
 
     # Summary by department
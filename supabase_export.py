@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Vora Supabase Export
+Parallel full-table pulls over PostgREST.
+
+For each table the exact row count (`Prefer: count=exact`) and the id span
+are read first; the span is cut into disjoint id ranges that are fetched
+concurrently, each range keyset-paged on id, over a pool of keep-alive
+connections. Several tables share one worker pool and one progress bar
+with rows and bytes/sec.
+
+Tables whose ids are not integers cannot be split and are read as a single
+range.
+
+Usage:
+    from supabase_export import export_tables
+
+    tables = export_tables([
+        {'table': 'college_contacts', 'columns': 'id,email,role',
+         'filters': {'role': 'in.(student,student_org,coach)'}},
+        {'table': 'college_outreach_sent', 'columns': 'id,email'},
+    ])
+    contacts = tables['college_contacts']
+
+    # Dump tables to JSONL
+    python supabase_export.py college_contacts college_outreach_sent --out exports/
+"""
+
+import argparse
+import http.client
+import json
+import os
+import queue
+import ssl
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse, urlencode
+
+from sendgrid_retry import call_with_retry
+
+WORKERS = 8
+RANGES_PER_TABLE = 8
+PAGE_SIZE = 1000
+
+SSL_CTX = ssl.create_default_context()
+SSL_CTX.check_hostname = False
+SSL_CTX.verify_mode = ssl.CERT_NONE
+
+
+class PostgrestError(Exception):
+    def __init__(self, status, body):
+        super().__init__(f"HTTP {status}: {body[:200]}")
+        self.status = status
+
+
+def content_range_total(headers):
+    """Total row count from a Content-Range header ('0-9/42' or '*/42'), or 0."""
+    total = headers.get('content-range', '').rsplit('/', 1)[-1]
+    return int(total) if total.isdigit() else 0
+
+
+class ConnectionPool:
+    """Keep-alive connections to the Supabase host, shared by worker threads."""
+
+    def __init__(self, supabase_url, size):
+        parsed = urlparse(supabase_url)
+        self.https = parsed.scheme == 'https'
+        self.netloc = parsed.netloc
+        self.base_path = parsed.path.rstrip('/')
+        self.idle = queue.LifoQueue()
+        self.size = size
+
+    def _connect(self):
+        if self.https:
+            return http.client.HTTPSConnection(self.netloc, timeout=60, context=SSL_CTX)
+        return http.client.HTTPConnection(self.netloc, timeout=60)
+
+    def get(self, path, headers):
+        """GET a PostgREST path. Returns (body_bytes, response_headers)."""
+        try:
+            conn = self.idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            conn.request('GET', self.base_path + path, headers=headers)
+            resp = conn.getresponse()
+            body = resp.read()
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            raise
+        if self.idle.qsize() < self.size:
+            self.idle.put(conn)
+        else:
+            conn.close()
+        if resp.status >= 300:
+            raise PostgrestError(resp.status, body.decode('utf-8', errors='replace'))
+        return body, {k.lower(): v for k, v in resp.getheaders()}
+
+    def close(self):
+        while not self.idle.empty():
+            self.idle.get_nowait().close()
+
+
+class Progress:
+    """One progress line for all tables: rows, MB and MB/s."""
+
+    def __init__(self, total_rows, enabled=True):
+        self.total = total_rows
+        self.rows = 0
+        self.bytes = 0
+        self.start = time.time()
+        self.drawn_at = 0.0
+        self.enabled = enabled
+        self.lock = threading.Lock()
+
+    def add(self, rows, nbytes):
+        with self.lock:
+            self.rows += rows
+            self.bytes += nbytes
+            now = time.time()
+            if self.enabled and (now - self.drawn_at >= 0.2 or self.rows >= self.total):
+                self.drawn_at = now
+                self._draw(now)
+
+    def _draw(self, now):
+        frac = min(1.0, self.rows / self.total) if self.total else 1.0
+        bar = '#' * int(frac * 30)
+        elapsed = max(now - self.start, 1e-6)
+        print(f"\r  [{bar:<30}] {frac:>4.0%} {self.rows:,}/{self.total:,} rows  "
+              f"{self.bytes / 1e6:.1f} MB  {self.bytes / 1e6 / elapsed:.2f} MB/s", end='', flush=True)
+
+    def finish(self):
+        if self.enabled:
+            self._draw(time.time())
+            print()
+        return time.time() - self.start
+
+
+class Exporter:
+    def __init__(self, supabase_url=None, supabase_key=None, workers=WORKERS,
+                 ranges_per_table=RANGES_PER_TABLE, page_size=PAGE_SIZE):
+        self.supabase_url = supabase_url or os.getenv('SUPABASE_URL')
+        self.supabase_key = supabase_key or os.getenv('SUPABASE_KEY')
+        self.workers = workers
+        self.ranges_per_table = ranges_per_table
+        self.page_size = page_size
+        self.pool = ConnectionPool(self.supabase_url, workers)
+        self.headers = {
+            'apikey': self.supabase_key,
+            'Authorization': f"Bearer {self.supabase_key}",
+            'Accept': 'application/json',
+        }
+
+    def _get(self, table, params, extra_headers=None):
+        path = f"/rest/v1/{table}?{urlencode(params, safe='(),.*')}"
+        headers = dict(self.headers, **(extra_headers or {}))
+        return call_with_retry(lambda: self.pool.get(path, headers), breaker=None)
+
+    def fetch_json(self, table, params):
+        """One PostgREST GET with the shared retry policy. Returns the parsed rows."""
+        body, _ = self._get(table, params)
+        return json.loads(body)
+
+    def count(self, table, filters=()):
+        """Exact row count for a list of (column, 'op.value') filters; no rows are sent."""
+        _, headers = self._get(table, [('select', 'id'), ('limit', '0')] + list(filters),
+                               {'Prefer': 'count=exact'})
+        return content_range_total(headers)
+
+    def counts(self, table, buckets):
+        """Exact counts for several filter lists at once: {name: filters} -> {name: count}."""
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {name: executor.submit(self.count, table, filters) for name, filters in buckets.items()}
+            return {name: future.result() for name, future in futures.items()}
+
+    def count_by(self, table, column, filters=()):
+        """
+        Server-side GROUP BY count ({value: count}) using PostgREST aggregates.
+        Raises PostgrestError if the project has aggregates disabled.
+        """
+        rows = self.fetch_json(table, [('select', f'{column},count()')] + list(filters))
+        return {row[column]: row['count'] for row in rows}
+
+    def close(self):
+        self.pool.close()
+
+    def _filter_params(self, spec):
+        return list((spec.get('filters') or {}).items())
+
+    def plan(self, spec):
+        """Exact count and id ranges for one table spec."""
+        table = spec['table']
+        filters = self._filter_params(spec)
+        total = self.count(table, filters)
+        if total == 0:
+            return total, []
+
+        lo_body, _ = self._get(table, [('select', 'id'), ('order', 'id.asc'), ('limit', '1')] + filters)
+        hi_body, _ = self._get(table, [('select', 'id'), ('order', 'id.desc'), ('limit', '1')] + filters)
+        lo, hi = json.loads(lo_body)[0]['id'], json.loads(hi_body)[0]['id']
+        if not (isinstance(lo, int) and isinstance(hi, int)):
+            return total, [(None, None)]
+
+        parts = max(1, min(self.ranges_per_table, total // self.page_size + 1))
+        step = (hi - lo + 1 + parts - 1) // parts
+        return total, [(start, min(start + step, hi + 1)) for start in range(lo, hi + 1, step)]
+
+    def fetch_range(self, spec, lo, hi, progress):
+        """Keyset-page one id range [lo, hi). Returns its rows."""
+        table = spec['table']
+        columns = spec.get('columns', '*')
+        if columns != '*' and 'id' not in columns.split(','):
+            columns = 'id,' + columns
+        rows = []
+        last = None
+        while True:
+            params = [('select', columns), ('order', 'id.asc'), ('limit', str(self.page_size))]
+            params += self._filter_params(spec)
+            if last is not None:
+                params.append(('id', f'gt.{last}'))
+            elif lo is not None:
+                params.append(('id', f'gte.{lo}'))
+            if hi is not None:
+                params.append(('id', f'lt.{hi}'))
+            body, _ = self._get(table, params)
+            page = json.loads(body)
+            progress.add(len(page), len(body))
+            rows.extend(page)
+            if len(page) < self.page_size:
+                return rows
+            last = page[-1]['id']
+
+    def export(self, specs, show_progress=True):
+        """Fetch every spec's rows concurrently. Returns {table: rows}."""
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            plans = list(executor.map(self.plan, specs))
+            total = sum(count for count, _ in plans)
+            if show_progress:
+                for spec, (count, ranges) in zip(specs, plans):
+                    print(f"  {spec['table']:<28} {count:>8,} rows in {len(ranges)} ranges")
+            progress = Progress(total, enabled=show_progress)
+
+            futures = []
+            for spec, (_, ranges) in zip(specs, plans):
+                for lo, hi in ranges:
+                    futures.append((spec['table'], executor.submit(self.fetch_range, spec, lo, hi, progress)))
+
+            results = {spec['table']: [] for spec in specs}
+            for table, future in futures:
+                results[table].extend(future.result())
+
+        for spec, (count, _) in zip(specs, plans):
+            got = len(results[spec['table']])
+            if got != count:
+                # Rows written during the export, or a max-rows cap below page_size
+                print(f"\n  ⚠ {spec['table']}: counted {count:,} rows but fetched {got:,}")
+
+        elapsed = progress.finish()
+        self.close()
+        if show_progress:
+            print(f"  Exported {progress.rows:,} rows ({progress.bytes / 1e6:.1f} MB) in {elapsed:.1f}s")
+        return results
+
+
+def export_tables(specs, show_progress=True, **kwargs):
+    """Parallel export of several tables. Each spec: {'table', 'columns', 'filters'}."""
+    return Exporter(**kwargs).export(specs, show_progress=show_progress)
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description='Parallel Supabase table export to JSONL')
+    parser.add_argument('tables', nargs='+')
+    parser.add_argument('--columns', type=str, default='*', help='Columns to select (default: *)')
+    parser.add_argument('--out', type=str, default='exports', help='Output directory (default: exports/)')
+    parser.add_argument('--workers', type=int, default=WORKERS)
+    parser.add_argument('--page-size', type=int, default=PAGE_SIZE)
+    args = parser.parse_args()
+
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass
+    if not os.getenv('SUPABASE_URL') or not os.getenv('SUPABASE_KEY'):
+        print("ERROR: SUPABASE_URL and SUPABASE_KEY must be set in .env")
+        sys.exit(1)
+
+    specs = [{'table': t, 'columns': args.columns} for t in args.tables]
+    results = export_tables(specs, workers=args.workers, page_size=args.page_size)
+
+    os.makedirs(args.out, exist_ok=True)
+    for table, rows in results.items():
+        path = os.path.join(args.out, f"{table}.jsonl")
+        with open(path, 'w') as f:
+            for row in rows:
+                f.write(json.dumps(row) + '\n')
+        print(f"  {path}: {len(rows):,} rows")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Vora Supabase Mirror
+Local SQLite copy of the outreach tables, kept current incrementally.
+
+- the first sync of a table is a full parallel export (supabase_export)
+- later syncs pull only rows whose created_at / updated_at (and, for
+  college_outreach_sent, followup_1_at / unsubscribed_at) is past the
+  watermark stored for that table, and upsert them by id
+- senders read from the mirror with --from-mirror: they run a quick
+  incremental sync of the tables they need, then query SQLite
+
+Deletes in Supabase are not seen by incremental syncs; run `sync --full`
+after bulk deletes.
+
+Usage:
+    # Sync every mirrored table (full load the first time, deltas after)
+    python supabase_mirror.py sync
+
+    # Force a full reload of one table
+    python supabase_mirror.py sync college_contacts --full
+
+    # Row counts, watermarks and age of each table
+    python supabase_mirror.py status
+
+    # Read from the mirror in the senders
+    python college_outreach.py --dry-run --from-mirror
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+
+from supabase_export import Exporter, export_tables
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MIRROR_DB = os.getenv('SUPABASE_MIRROR_DB', os.path.join(BASE_DIR, 'supabase_mirror.db'))
+
+MIRROR_TABLES = [
+    'college_contacts',
+    'college_outreach_sent',
+    'outreach_sent_emails',
+    'consumer_leads',
+    'investor_leads',
+]
+
+# Timestamp columns that mark a row as new or changed, used when present
+WATERMARK_COLUMNS = ['created_at', 'updated_at', 'followup_1_at', 'unsubscribed_at', 'emailed_at']
+INDEXED_COLUMNS = ['email', 'verified_email', 'university', 'role', 'status']
+DELTA_PAGE = 1000
+
+
+class MirrorMissing(Exception):
+    """Raised when a table is read from the mirror before its first sync."""
+
+
+def quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def connect(path=None):
+    conn = sqlite3.connect(path or MIRROR_DB)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS mirror_meta (
+            table_name TEXT PRIMARY KEY,
+            columns TEXT NOT NULL,
+            json_columns TEXT NOT NULL,
+            watermarks TEXT NOT NULL,
+            full_synced_at REAL,
+            synced_at REAL
+        )
+    """)
+    conn.commit()
+    return conn
+
+
+def get_meta(conn, table):
+    row = conn.execute(
+        'SELECT columns, json_columns, watermarks, full_synced_at, synced_at '
+        'FROM mirror_meta WHERE table_name = ?', (table,),
+    ).fetchone()
+    if not row:
+        return None
+    return {
+        'columns': json.loads(row[0]),
+        'json_columns': set(json.loads(row[1])),
+        'watermarks': json.loads(row[2]),
+        'full_synced_at': row[3],
+        'synced_at': row[4],
+    }
+
+
+def save_meta(conn, table, meta):
+    conn.execute(
+        'INSERT OR REPLACE INTO mirror_meta '
+        '(table_name, columns, json_columns, watermarks, full_synced_at, synced_at) '
+        'VALUES (?, ?, ?, ?, ?, ?)',
+        (table, json.dumps(meta['columns']), json.dumps(sorted(meta['json_columns'])),
+         json.dumps(meta['watermarks']), meta['full_synced_at'], meta['synced_at']),
+    )
+
+
+# ─── Writing ─────────────────────────────────────────────────────────────────
+
+def ensure_columns(conn, table, meta, rows):
+    """Add any columns seen in rows that the local table does not have yet."""
+    for row in rows:
+        for col, val in row.items():
+            if col not in meta['columns']:
+                conn.execute(f'ALTER TABLE {quote(table)} ADD COLUMN {quote(col)}')
+                meta['columns'].append(col)
+            if isinstance(val, (list, dict)):
+                meta['json_columns'].add(col)
+
+
+def upsert_rows(conn, table, meta, rows):
+    if not rows:
+        return
+    ensure_columns(conn, table, meta, rows)
+    cols = meta['columns']
+    sql = (f'INSERT OR REPLACE INTO {quote(table)} ({", ".join(quote(c) for c in cols)}) '
+           f'VALUES ({", ".join("?" for _ in cols)})')
+    conn.executemany(sql, (
+        tuple(json.dumps(r.get(c)) if c in meta['json_columns'] and r.get(c) is not None else r.get(c)
+              for c in cols)
+        for r in rows
+    ))
+
+
+def advance_watermarks(meta, rows):
+    for col in meta['watermarks']:
+        values = [r[col] for r in rows if r.get(col)]
+        if values:
+            current = meta['watermarks'][col]
+            meta['watermarks'][col] = max(values + ([current] if current else []))
+
+
+def load_full(conn, table, rows):
+    """Replace the local copy of a table with a full export."""
+    conn.execute(f'DROP TABLE IF EXISTS {quote(table)}')
+    columns = ['id']
+    for row in rows:
+        for col in row:
+            if col not in columns:
+                columns.append(col)
+    defs = ', '.join(['"id" PRIMARY KEY'] + [quote(c) for c in columns[1:]])
+    conn.execute(f'CREATE TABLE {quote(table)} ({defs})')
+    for col in INDEXED_COLUMNS:
+        if col in columns:
+            conn.execute(f'CREATE INDEX {quote(f"idx_{table}_{col}")} ON {quote(table)} ({quote(col)})')
+
+    now = time.time()
+    meta = {
+        'columns': columns,
+        'json_columns': set(),
+        'watermarks': {col: None for col in WATERMARK_COLUMNS if col in columns},
+        'full_synced_at': now,
+        'synced_at': now,
+    }
+    upsert_rows(conn, table, meta, rows)
+    advance_watermarks(meta, rows)
+    save_meta(conn, table, meta)
+    conn.commit()
+    return meta
+
+
+def sync_delta(conn, exporter, table, meta):
+    """Pull rows changed since the stored watermarks. Returns rows applied."""
+    applied = 0
+    new_marks = dict(meta['watermarks'])
+    for col, mark in meta['watermarks'].items():
+        offset = 0
+        while True:
+            params = [('select', '*'), ('order', f'{col}.asc,id.asc'),
+                      ('limit', str(DELTA_PAGE)), ('offset', str(offset))]
+            params.append((col, f'gt.{mark}') if mark else (col, 'not.is.null'))
+            rows = exporter.fetch_json(table, params)
+            upsert_rows(conn, table, meta, rows)
+            applied += len(rows)
+            values = [r[col] for r in rows if r.get(col)]
+            if values:
+                new_marks[col] = max(values + ([new_marks[col]] if new_marks[col] else []))
+            if len(rows) < DELTA_PAGE:
+                break
+            offset += DELTA_PAGE
+    meta['watermarks'] = new_marks
+    meta['synced_at'] = time.time()
+    save_meta(conn, table, meta)
+    conn.commit()
+    return applied
+
+
+def sync(tables=None, full=False, path=None, quiet=False):
+    """
+    Bring the mirror up to date. Tables never synced (or all of them with
+    full=True) are exported in parallel; the rest get delta pulls.
+    Returns {table: (mode, rows)}.
+    """
+    tables = tables or MIRROR_TABLES
+    conn = connect(path)
+    results = {}
+
+    needs_full = [t for t in tables if full or get_meta(conn, t) is None]
+    if needs_full:
+        if not quiet:
+            print(f"  Full load: {', '.join(needs_full)}")
+        exported = export_tables([{'table': t, 'columns': '*'} for t in needs_full], show_progress=not quiet)
+        for table in needs_full:
+            load_full(conn, table, exported[table])
+            results[table] = ('full', len(exported[table]))
+
+    exporter = Exporter()
+    for table in tables:
+        if table in results:
+            continue
+        meta = get_meta(conn, table)
+        if not meta['watermarks']:
+            # No timestamp columns to follow: only a full reload refreshes it
+            results[table] = ('no watermark', 0)
+            continue
+        results[table] = ('delta', sync_delta(conn, exporter, table, meta))
+
+    if not quiet:
+        for table, (mode, count) in results.items():
+            print(f"  {table:<26} {mode:<12} {count:>8,} rows")
+    conn.close()
+    return results
+
+
+# ─── Reading ─────────────────────────────────────────────────────────────────
+
+def read_rows(table, columns='*', where='', params=(), path=None):
+    """Rows from the mirror as dicts (JSON columns decoded)."""
+    conn = connect(path)
+    meta = get_meta(conn, table)
+    if meta is None:
+        conn.close()
+        raise MirrorMissing(f"{table} is not in the mirror yet — run: python supabase_mirror.py sync")
+    select = '*' if columns == '*' else ', '.join(quote(c.strip()) for c in columns.split(','))
+    cursor = conn.execute(f'SELECT {select} FROM {quote(table)} {where}', params)
+    names = [d[0] for d in cursor.description]
+    rows = []
+    for values in cursor:
+        row = dict(zip(names, values))
+        for col in meta['json_columns'] & row.keys():
+            if row[col] is not None:
+                row[col] = json.loads(row[col])
+        rows.append(row)
+    conn.close()
+    return rows
+
+
+def read_column_set(table, column, path=None):
+    """Lowercased set of one column's non-empty values."""
+    return {r[column].lower() for r in read_rows(table, column, path=path) if r.get(column)}
+
+
+def count_rows(table, where='', params=(), path=None):
+    """COUNT(*) over the mirror copy of a table."""
+    conn = connect(path)
+    if get_meta(conn, table) is None:
+        conn.close()
+        raise MirrorMissing(f"{table} is not in the mirror yet — run: python supabase_mirror.py sync")
+    count = conn.execute(f'SELECT COUNT(*) FROM {quote(table)} {where}', params).fetchone()[0]
+    conn.close()
+    return count
+
+
+def count_by(table, column, where='', params=(), path=None):
+    """{value: count} for one column of the mirror copy of a table (GROUP BY)."""
+    conn = connect(path)
+    if get_meta(conn, table) is None:
+        conn.close()
+        raise MirrorMissing(f"{table} is not in the mirror yet — run: python supabase_mirror.py sync")
+    counts = dict(conn.execute(
+        f'SELECT {quote(column)}, COUNT(*) FROM {quote(table)} {where} GROUP BY {quote(column)}', params))
+    conn.close()
+    return counts
+
+
+def synced_rows(table, columns='*', where='', params=()):
+    """Incrementally sync one table, then read it from the mirror."""
+    sync([table], quiet=True)
+    return read_rows(table, columns, where, params)
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+def show_status(path=None):
+    conn = connect(path)
+    print(f"  Mirror: {path or MIRROR_DB}\n")
+    for table in MIRROR_TABLES:
+        meta = get_meta(conn, table)
+        if meta is None:
+            print(f"  {table:<26} not synced")
+            continue
+        count = conn.execute(f'SELECT COUNT(*) FROM {quote(table)}').fetchone()[0]
+        age = time.time() - meta['synced_at']
+        marks = ', '.join(f"{c}>{v}" for c, v in meta['watermarks'].items() if v) or 'none'
+        print(f"  {table:<26} {count:>8,} rows  synced {int(age // 60)}m ago  watermarks: {marks}")
+    conn.close()
+
+
+def main():
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass
+
+    parser = argparse.ArgumentParser(description='Local SQLite mirror of the Supabase outreach tables')
+    parser.add_argument('--db', type=str, help=f'Mirror path (default: {MIRROR_DB})')
+    sub = parser.add_subparsers(dest='command')
+    p_sync = sub.add_parser('sync', help='Sync tables (full first time, deltas after)')
+    p_sync.add_argument('tables', nargs='*', help=f"Tables (default: all {len(MIRROR_TABLES)})")
+    p_sync.add_argument('--full', action='store_true', help='Reload from scratch')
+    sub.add_parser('status', help='Show mirrored tables')
+    args = parser.parse_args()
+
+    if args.command == 'sync':
+        unknown = [t for t in args.tables if t not in MIRROR_TABLES]
+        if unknown:
+            print(f"Unknown table(s): {', '.join(unknown)}. Mirrored: {', '.join(MIRROR_TABLES)}")
+            sys.exit(1)
+        if not os.getenv('SUPABASE_URL') or not os.getenv('SUPABASE_KEY'):
+            print("ERROR: SUPABASE_URL and SUPABASE_KEY must be set in .env")
+            sys.exit(1)
+        sync(args.tables, full=args.full, path=args.db)
+    elif args.command == 'status':
+        show_status(args.db)
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,703 @@
+#!/usr/bin/env python3
+"""
+Vora Supabase Mock Server
+Local PostgREST stand-in over SQLite, so the Supabase-heavy paths (push
+loaders, dedup checks, paging, send logging, stats) can be regression-tested
+and benchmarked without the live project.
+
+Implements the subset of /rest/v1 the repo uses, which is also what
+supabase-py sends:
+- GET / HEAD: select=cols (plus `col,count()` grouped counts), filters
+  eq/neq/gt/gte/lt/lte/like/ilike/is/in and not.<op>, order, limit/offset
+  or a Range header, Prefer: count=exact (Content-Range), a max-rows cap,
+  and single-object responses (Accept: application/vnd.pgrst.object+json)
+- POST: insert one row or a list, `columns=`, `on_conflict=`,
+  Prefer: resolution=ignore-duplicates|merge-duplicates, return=minimal|
+  representation, count=exact; 409 / 23505 on duplicate keys
+- PATCH / DELETE with filters (an unfiltered one is refused, like Supabase)
+
+Tables are created on first insert (id autoincrement, created_at default,
+column types taken from the first value seen); `on_conflict` columns get a
+unique index. --load-mirror copies the tables of supabase_mirror.db in.
+
+Latency is injectable per request and per row, with a seeded RNG, and 5xx
+errors can be injected, so data-layer changes can be measured
+deterministically offline.
+
+Usage:
+    python supabase_mock.py --port 54321 --latency-ms 40 --max-rows 1000 --load-mirror supabase_mirror.db
+    SUPABASE_URL=http://127.0.0.1:54321 SUPABASE_KEY=test python college_outreach.py --dry-run
+
+    # In-process, e.g. from a benchmark
+    from supabase_mock import start_supabase_mock
+    server, url = start_supabase_mock(latency_ms=30, seed=1)
+
+    # Counters
+    curl http://127.0.0.1:54321/stats
+"""
+
+import argparse
+import json
+import random
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qsl
+
+FILTER_OPS = {'eq': '=', 'neq': '!=', 'gt': '>', 'gte': '>=', 'lt': '<', 'lte': '<='}
+RESERVED_PARAMS = {'select', 'order', 'limit', 'offset', 'columns', 'on_conflict'}
+OBJECT_MEDIA_TYPE = 'application/vnd.pgrst.object+json'
+
+
+class ApiError(Exception):
+    """A PostgREST-style error response."""
+
+    def __init__(self, status, code, message, details=None):
+        super().__init__(message)
+        self.status = status
+        self.body = {'code': code, 'message': message, 'details': details, 'hint': None}
+
+
+def quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def value_kind(value):
+    if isinstance(value, bool):
+        return 'bool'
+    if isinstance(value, int):
+        return 'int'
+    if isinstance(value, float):
+        return 'real'
+    if isinstance(value, (list, dict)):
+        return 'json'
+    return 'text'
+
+
+SQL_TYPES = {'bool': 'BOOLEAN', 'int': 'INTEGER', 'real': 'REAL', 'json': 'TEXT', 'text': 'TEXT'}
+
+
+def split_top_level(text, sep=','):
+    """Split on `sep` outside parentheses and double quotes."""
+    parts, depth, quoted, current = [], 0, False, ''
+    i = 0
+    while i < len(text):
+        ch = text[i]
+        if ch == '\\' and quoted and i + 1 < len(text):
+            current += text[i:i + 2]
+            i += 2
+            continue
+        if ch == '"':
+            quoted = not quoted
+        elif not quoted and ch == '(':
+            depth += 1
+        elif not quoted and ch == ')':
+            depth -= 1
+        if ch == sep and depth == 0 and not quoted:
+            parts.append(current)
+            current = ''
+        else:
+            current += ch
+        i += 1
+    parts.append(current)
+    return parts
+
+
+def parse_in_list(text):
+    """Items of an in.(a,"b,c") list."""
+    if not (text.startswith('(') and text.endswith(')')):
+        raise ApiError(400, 'PGRST100', f'"failed to parse filter (in.{text})"')
+    if text == '()':
+        return []
+    items = []
+    for raw in split_top_level(text[1:-1]):
+        raw = raw.strip()
+        if len(raw) >= 2 and raw.startswith('"') and raw.endswith('"'):
+            raw = re.sub(r'\\(.)', r'\1', raw[1:-1])
+        items.append(raw)
+    return items
+
+
+# ─── Store ───────────────────────────────────────────────────────────────────
+
+class MockStore:
+    """SQLite tables plus the column kinds needed to decode them as JSON."""
+
+    def __init__(self, db_path=':memory:'):
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS mock_columns (
+                table_name TEXT NOT NULL,
+                column_name TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                PRIMARY KEY (table_name, column_name)
+            )
+        """)
+        self.conn.commit()
+        self.columns = {}
+        for table, column, kind in self.conn.execute('SELECT table_name, column_name, kind FROM mock_columns'):
+            self.columns.setdefault(table, {})[column] = kind
+
+    def has_table(self, table):
+        return table in self.columns
+
+    def require_table(self, table):
+        if table not in self.columns:
+            raise ApiError(404, '42P01', f'relation "public.{table}" does not exist')
+        return self.columns[table]
+
+    def _add_column_meta(self, table, column, kind):
+        self.columns.setdefault(table, {})[column] = kind
+        self.conn.execute('INSERT OR REPLACE INTO mock_columns VALUES (?, ?, ?)', (table, column, kind))
+
+    def create_table(self, table, kinds=None):
+        """Create a table with id / created_at plus `kinds` ({column: kind})."""
+        self.conn.execute(
+            f"CREATE TABLE {quote(table)} ("
+            f"id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            f"created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now')))"
+        )
+        self._add_column_meta(table, 'id', 'int')
+        self._add_column_meta(table, 'created_at', 'text')
+        for column, kind in (kinds or {}).items():
+            self.add_column(table, column, kind)
+
+    def add_column(self, table, column, kind):
+        if column in self.columns.get(table, {}):
+            return
+        self.conn.execute(f'ALTER TABLE {quote(table)} ADD COLUMN {quote(column)} {SQL_TYPES[kind]}')
+        self._add_column_meta(table, column, kind)
+
+    def ensure_unique(self, table, columns):
+        name = quote(f"uq_{table}_{'_'.join(columns)}")
+        try:
+            self.conn.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS {name} ON {quote(table)} '
+                              f'({", ".join(quote(c) for c in columns)})')
+        except sqlite3.IntegrityError as e:
+            raise ApiError(400, '42P10', f'no unique constraint matching on_conflict ({e})')
+
+    def encode(self, table, column, value):
+        kind = self.columns[table].get(column)
+        if value is None:
+            return None
+        if kind == 'json' or isinstance(value, (list, dict)):
+            return json.dumps(value)
+        if kind == 'bool' and isinstance(value, bool):
+            return int(value)
+        return value
+
+    def decode_row(self, table, names, values):
+        kinds = self.columns[table]
+        row = {}
+        for name, value in zip(names, values):
+            kind = kinds.get(name)
+            if value is not None and kind == 'json':
+                value = json.loads(value)
+            elif value is not None and kind == 'bool':
+                value = bool(value)
+            row[name] = value
+        return row
+
+    def filter_value(self, table, column, text):
+        if self.columns[table].get(column) == 'bool' and text in ('true', 'false'):
+            return 1 if text == 'true' else 0
+        return text
+
+    def load_mirror(self, mirror_path):
+        """Copy every table of a supabase_mirror.db into the store."""
+        src = sqlite3.connect(mirror_path)
+        loaded = {}
+        for table, columns_json, json_columns_json in src.execute(
+                'SELECT table_name, columns, json_columns FROM mirror_meta'):
+            columns = json.loads(columns_json)
+            json_columns = set(json.loads(json_columns_json))
+            kinds = {}
+            for column in columns:
+                if column in ('id', 'created_at'):
+                    continue
+                if column in json_columns:
+                    kinds[column] = 'json'
+                    continue
+                sample = src.execute(f'SELECT typeof({quote(column)}) FROM {quote(table)} '
+                                     f'WHERE {quote(column)} IS NOT NULL LIMIT 1').fetchone()
+                kinds[column] = {'integer': 'int', 'real': 'real'}.get(sample[0] if sample else '', 'text')
+            if self.has_table(table):
+                self.conn.execute(f'DROP TABLE {quote(table)}')
+                self.conn.execute('DELETE FROM mock_columns WHERE table_name = ?', (table,))
+                self.columns.pop(table)
+            self.create_table(table, kinds)
+            names = ', '.join(quote(c) for c in columns)
+            rows = src.execute(f'SELECT {names} FROM {quote(table)}').fetchall()
+            self.conn.executemany(f'INSERT INTO {quote(table)} ({names}) VALUES ({", ".join("?" for _ in columns)})', rows)
+            loaded[table] = len(rows)
+        self.conn.commit()
+        src.close()
+        return loaded
+
+
+# ─── Query translation ───────────────────────────────────────────────────────
+
+class Query:
+    """One request's table, filters and modifiers, translated to SQL."""
+
+    def __init__(self, store, table, params):
+        self.store = store
+        self.table = table
+        self.params = {}
+        self.filters = []
+        for key, value in params:
+            if key in RESERVED_PARAMS:
+                self.params[key] = value
+            elif key in ('or', 'and'):
+                raise ApiError(400, 'PGRST100', f'"{key}" filters are not supported by the mock')
+            else:
+                self.filters.append((key, value))
+
+    def where(self):
+        kinds = self.store.columns[self.table]
+        clauses, args = [], []
+        for column, expr in self.filters:
+            if column not in kinds:
+                raise ApiError(400, '42703', f'column {self.table}.{column} does not exist')
+            negate = expr.startswith('not.')
+            if negate:
+                expr = expr[4:]
+            op, _, value = expr.partition('.')
+            col = quote(column)
+            if op in FILTER_OPS:
+                clause = f'{col} {FILTER_OPS[op]} ?'
+                args.append(self.store.filter_value(self.table, column, value))
+            elif op in ('like', 'ilike'):
+                pattern = value.replace('*', '%')
+                if op == 'like':
+                    clause = f'{col} GLOB ?'
+                    args.append(pattern.replace('%', '*').replace('_', '?'))
+                else:
+                    clause = f'{col} LIKE ?'
+                    args.append(pattern)
+            elif op == 'is':
+                if value not in ('null', 'true', 'false', 'unknown'):
+                    raise ApiError(400, 'PGRST100', f'"failed to parse filter (is.{value})"')
+                clause = {'null': f'{col} IS NULL', 'unknown': f'{col} IS NULL',
+                          'true': f'{col} = 1', 'false': f'{col} = 0'}[value]
+            elif op == 'in':
+                items = [self.store.filter_value(self.table, column, i) for i in parse_in_list(value)]
+                clause = f'{col} IN ({", ".join("?" for _ in items)})' if items else '0'
+                args.extend(items)
+            else:
+                raise ApiError(400, 'PGRST100', f'"failed to parse filter ({op}.{value})"')
+            clauses.append(f'NOT ({clause})' if negate else clause)
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', args
+
+    def order_by(self):
+        spec = self.params.get('order')
+        if not spec:
+            return ''
+        terms = []
+        for item in spec.split(','):
+            parts = item.strip().split('.')
+            column = parts[0]
+            if column not in self.store.columns[self.table]:
+                raise ApiError(400, '42703', f'column {self.table}.{column} does not exist')
+            term = quote(column) + (' DESC' if 'desc' in parts[1:] else ' ASC')
+            if 'nullsfirst' in parts[1:]:
+                term += ' NULLS FIRST'
+            elif 'nullslast' in parts[1:]:
+                term += ' NULLS LAST'
+            terms.append(term)
+        return ' ORDER BY ' + ', '.join(terms)
+
+    def select_list(self):
+        """(SQL select list, output names, group-by columns or None)."""
+        spec = self.params.get('select', '*') or '*'
+        kinds = self.store.columns[self.table]
+        items = [i.strip() for i in split_top_level(spec) if i.strip()]
+        aggregate = 'count()' in items
+        names = []
+        for item in items:
+            if item == 'count()':
+                continue
+            if item == '*':
+                names.extend(kinds)
+                continue
+            if '(' in item:
+                raise ApiError(400, 'PGRST100', f'embedded resource "{item}" is not supported by the mock')
+            column = item.split('::')[0].split(':')[-1]
+            if column not in kinds:
+                raise ApiError(400, '42703', f'column {self.table}.{column} does not exist')
+            names.append(column)
+        select = [quote(n) for n in names]
+        if aggregate:
+            return ', '.join(select + ['COUNT(*)']), names + ['count'], names
+        return ', '.join(select), names, None
+
+
+# ─── State ───────────────────────────────────────────────────────────────────
+
+class MockState:
+    """Store, injection settings and counters shared by the handler threads."""
+
+    def __init__(self, db_path=':memory:', latency_ms=0, jitter_ms=0, row_latency_us=0,
+                 rate_5xx=0.0, max_rows=1000, seed=None, reject=None):
+        self.store = MockStore(db_path)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.row_latency_us = row_latency_us
+        self.rate_5xx = rate_5xx
+        self.max_rows = max_rows
+        self.reject = reject  # optional fn(table, row) -> error message, to simulate rejected rows
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.status_counts = Counter()
+        self.method_counts = Counter()
+        self.rows_read = 0
+        self.rows_written = 0
+        self.started_at = time.time()
+
+    def delay(self, rows=0):
+        with self.lock:
+            jitter = self.rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        seconds = max(0.0, self.latency_ms + jitter) / 1000 + rows * self.row_latency_us / 1e6
+        if seconds:
+            time.sleep(seconds)
+
+    def roll_5xx(self):
+        with self.lock:
+            if self.rate_5xx and self.rng.random() < self.rate_5xx:
+                return self.rng.choice((500, 502, 503))
+        return None
+
+    def record(self, method, status, read=0, written=0):
+        with self.lock:
+            self.method_counts[method] += 1
+            self.status_counts[status] += 1
+            self.rows_read += read
+            self.rows_written += written
+
+    def stats(self):
+        with self.lock:
+            return {
+                'requests': sum(self.method_counts.values()),
+                'methods': dict(self.method_counts),
+                'status_counts': {str(k): v for k, v in sorted(self.status_counts.items())},
+                'rows_read': self.rows_read,
+                'rows_written': self.rows_written,
+                'uptime_seconds': time.time() - self.started_at,
+            }
+
+    # ─── Operations (called with self.lock held) ─────────────────────────────
+
+    def select(self, table, params, headers):
+        store = self.store
+        store.require_table(table)
+        query = Query(store, table, params)
+        select, names, group = query.select_list()
+        where, args = query.where()
+
+        offset = int(query.params.get('offset') or 0)
+        limit = query.params.get('limit')
+        limit = int(limit) if limit not in (None, '') else None
+        range_header = headers.get('Range')
+        if range_header and limit is None and re.match(r'^\d+-\d*$', range_header):
+            start, _, end = range_header.partition('-')
+            offset = int(start)
+            limit = int(end) - offset + 1 if end else None
+        if self.max_rows and (limit is None or limit > self.max_rows):
+            limit = self.max_rows
+
+        sql = f'SELECT {select} FROM {quote(table)}{where}'
+        if group:
+            sql += ' GROUP BY ' + ', '.join(quote(c) for c in group)
+        sql += query.order_by()
+        if limit is not None:
+            sql += f' LIMIT {limit}'
+            if offset:
+                sql += f' OFFSET {offset}'
+        elif offset:
+            sql += f' LIMIT -1 OFFSET {offset}'
+        rows = [store.decode_row(table, names, values) for values in store.conn.execute(sql, args)]
+
+        total = None
+        if 'count=exact' in headers.get('Prefer', ''):
+            total = store.conn.execute(f'SELECT COUNT(*) FROM {quote(table)}{where}', args).fetchone()[0]
+        return rows, offset, total
+
+    def insert(self, table, params, headers, body):
+        store = self.store
+        rows = body if isinstance(body, list) else [body]
+        if not all(isinstance(r, dict) for r in rows):
+            raise ApiError(400, 'PGRST102', 'All object keys must match')
+        query = Query(store, table, params)
+        if query.params.get('columns'):
+            columns = [c.strip() for c in query.params['columns'].split(',')]
+        else:
+            columns = list(rows[0].keys()) if rows else []
+            if any(set(r) != set(columns) for r in rows):
+                raise ApiError(400, 'PGRST102', 'All object keys must match')
+        if not rows:
+            return []
+
+        if not store.has_table(table):
+            store.create_table(table)
+        for column in columns:
+            if column not in store.columns[table]:
+                sample = next((r[column] for r in rows if r.get(column) is not None), '')
+                store.add_column(table, column, value_kind(sample))
+
+        if self.reject:
+            for row in rows:
+                message = self.reject(table, row)
+                if message:
+                    raise ApiError(400, '22P02', message)
+
+        prefer = headers.get('Prefer', '')
+        conflict_cols = [c.strip() for c in (query.params.get('on_conflict') or 'id').split(',')]
+        sql = (f'INSERT INTO {quote(table)} ({", ".join(quote(c) for c in columns)}) '
+               f'VALUES ({", ".join("?" for _ in columns)})')
+        if 'resolution=ignore-duplicates' in prefer or 'resolution=merge-duplicates' in prefer:
+            if conflict_cols != ['id']:
+                store.ensure_unique(table, conflict_cols)
+            sql += f' ON CONFLICT ({", ".join(quote(c) for c in conflict_cols)}) DO '
+            if 'resolution=merge-duplicates' in prefer:
+                updates = [c for c in columns if c not in conflict_cols]
+                sql += ('UPDATE SET ' + ', '.join(f'{quote(c)} = excluded.{quote(c)}' for c in updates)
+                        if updates else 'NOTHING')
+            else:
+                sql += 'NOTHING'
+        elif query.params.get('on_conflict'):
+            store.ensure_unique(table, conflict_cols)
+        sql += ' RETURNING *'
+
+        written = []
+        try:
+            for row in rows:
+                values = [store.encode(table, c, row.get(c)) for c in columns]
+                cursor = store.conn.execute(sql, values)
+                names = [d[0] for d in cursor.description]
+                written.extend(store.decode_row(table, names, v) for v in cursor.fetchall())
+        except sqlite3.IntegrityError as e:
+            store.conn.rollback()
+            raise ApiError(409, '23505', 'duplicate key value violates unique constraint', str(e))
+        store.conn.commit()
+        return written
+
+    def update(self, table, params, body):
+        store = self.store
+        store.require_table(table)
+        query = Query(store, table, params)
+        if not query.filters:
+            raise ApiError(400, '21000', 'UPDATE requires a WHERE clause')
+        if not isinstance(body, dict) or not body:
+            raise ApiError(400, 'PGRST102', 'Empty or invalid json')
+        for column, value in body.items():
+            if column not in store.columns[table]:
+                store.add_column(table, column, value_kind(value if value is not None else ''))
+        where, args = query.where()
+        sets = ', '.join(f'{quote(c)} = ?' for c in body)
+        values = [store.encode(table, c, v) for c, v in body.items()]
+        cursor = store.conn.execute(f'UPDATE {quote(table)} SET {sets}{where} RETURNING *', values + args)
+        names = [d[0] for d in cursor.description]
+        rows = [store.decode_row(table, names, v) for v in cursor.fetchall()]
+        store.conn.commit()
+        return rows
+
+    def delete(self, table, params):
+        store = self.store
+        store.require_table(table)
+        query = Query(store, table, params)
+        if not query.filters:
+            raise ApiError(400, '21000', 'DELETE requires a WHERE clause')
+        where, args = query.where()
+        cursor = store.conn.execute(f'DELETE FROM {quote(table)}{where} RETURNING *', args)
+        names = [d[0] for d in cursor.description]
+        rows = [store.decode_row(table, names, v) for v in cursor.fetchall()]
+        store.conn.commit()
+        return rows
+
+
+# ─── HTTP ────────────────────────────────────────────────────────────────────
+
+class MockHandler(BaseHTTPRequestHandler):
+    server_version = 'VoraSupabaseMock/1.0'
+    protocol_version = 'HTTP/1.1'
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def log_message(self, fmt, *args):
+        pass  # quiet: benchmarks would drown in access logs
+
+    def _reply(self, status, body=None, headers=None, head=False):
+        data = json.dumps(body, default=str).encode() if body is not None else b''
+        self.send_response(status)
+        for k, v in (headers or {}).items():
+            self.send_header(k, str(v))
+        if body is not None:
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(0 if head else len(data)))
+        self.end_headers()
+        if data and not head:
+            self.wfile.write(data)
+
+    def _route(self):
+        """(table, params) for /rest/v1/<table>; None if the path is not a table."""
+        parsed = urlparse(self.path)
+        match = re.match(r'^/rest/v1/([A-Za-z0-9_]+)/?$', parsed.path)
+        if not match:
+            return None, None
+        return match.group(1), parse_qsl(parsed.query, keep_blank_values=True)
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        try:
+            return json.loads(raw or b'null')
+        except ValueError:
+            raise ApiError(400, 'PGRST102', 'Empty or invalid json')
+
+    def _handle(self, method):
+        body = self._read_body() if method in ('POST', 'PATCH') else None
+        if method == 'GET' and self.path.rstrip('/') == '/stats':
+            self._reply(200, self.state.stats())
+            return
+        table, params = self._route()
+        if table is None:
+            self.state.record(method, 404)
+            self._reply(404, {'message': 'not found'})
+            return
+        if not (self.headers.get('apikey') or self.headers.get('Authorization')):
+            self.state.record(method, 401)
+            self._reply(401, {'message': 'No API key found in request'})
+            return
+
+        st = self.state
+        injected = st.roll_5xx()
+        if injected:
+            st.delay()
+            st.record(method, injected)
+            self._reply(injected, {'message': 'injected server error'})
+            return
+
+        prefer = self.headers.get('Prefer', '')
+        headers = {'Prefer': prefer, 'Range': self.headers.get('Range')}
+        try:
+            with st.lock:
+                if method in ('GET', 'HEAD'):
+                    rows, offset, total = st.select(table, params, headers)
+                elif method == 'POST':
+                    rows = st.insert(table, params, headers, body)
+                elif method == 'PATCH':
+                    rows = st.update(table, params, body)
+                else:
+                    rows = st.delete(table, params)
+        except ApiError as e:
+            st.delay()
+            st.record(method, e.status)
+            self._reply(e.status, e.body)
+            return
+
+        st.delay(len(rows))
+        reply_headers = {}
+        if method in ('GET', 'HEAD'):
+            st.record(method, 200, read=len(rows))
+            span = f'{offset}-{offset + len(rows) - 1}' if rows else '*'
+            reply_headers['Content-Range'] = f"{span}/{total if total is not None else '*'}"
+            if OBJECT_MEDIA_TYPE in (self.headers.get('Accept') or ''):
+                if len(rows) != 1:
+                    self._reply(406, {'code': 'PGRST116', 'message': 'JSON object requested, multiple (or no) rows returned',
+                                      'details': f'The result contains {len(rows)} rows', 'hint': None})
+                    return
+                self._reply(200, rows[0], reply_headers, head=method == 'HEAD')
+                return
+            self._reply(200, rows, reply_headers, head=method == 'HEAD')
+            return
+
+        status = 201 if method == 'POST' else 200
+        st.record(method, status, written=len(rows))
+        if 'count=exact' in prefer:
+            reply_headers['Content-Range'] = f'*/{len(rows)}'
+        if 'return=representation' in prefer:
+            self._reply(status, rows, reply_headers)
+        else:
+            self._reply(204 if method != 'POST' else 201, None, reply_headers)
+
+    def _safe(self, method):
+        try:
+            self._handle(method)
+        except ApiError as e:
+            self.state.record(method, e.status)
+            self._reply(e.status, e.body)
+
+    def do_GET(self):
+        self._safe('GET')
+
+    def do_HEAD(self):
+        self._safe('HEAD')
+
+    def do_POST(self):
+        self._safe('POST')
+
+    def do_PATCH(self):
+        self._safe('PATCH')
+
+    def do_DELETE(self):
+        self._safe('DELETE')
+
+
+def start_supabase_mock(host='127.0.0.1', port=0, load_mirror=None, **state_kwargs):
+    """Start the mock in a daemon thread. Returns (server, base_url)."""
+    server = ThreadingHTTPServer((host, port), MockHandler)
+    server.daemon_threads = True
+    server.state = MockState(**state_kwargs)
+    if load_mirror:
+        server.state.store.load_mirror(load_mirror)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description='Local PostgREST (Supabase) mock over SQLite')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=54321)
+    parser.add_argument('--db', type=str, default=':memory:', help='SQLite file to keep tables in (default: memory)')
+    parser.add_argument('--load-mirror', type=str, help='Copy the tables of a supabase_mirror.db in at startup')
+    parser.add_argument('--latency-ms', type=float, default=0, help='Per-request latency (default: 0)')
+    parser.add_argument('--jitter-ms', type=float, default=0, help='Uniform latency jitter (default: 0)')
+    parser.add_argument('--row-latency-us', type=float, default=0, help='Extra latency per row returned/written')
+    parser.add_argument('--rate-5xx', type=float, default=0.0, help='Fraction of requests answered 500/502/503')
+    parser.add_argument('--max-rows', type=int, default=1000, help='Response row cap, like Supabase max-rows (0 = none)')
+    parser.add_argument('--seed', type=int, help='Random seed for reproducible latency and injection')
+    args = parser.parse_args()
+
+    server, url = start_supabase_mock(
+        args.host, args.port, load_mirror=args.load_mirror,
+        db_path=args.db, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        row_latency_us=args.row_latency_us, rate_5xx=args.rate_5xx,
+        max_rows=args.max_rows, seed=args.seed,
+    )
+    print(f"  Supabase mock listening on {url}")
+    for table in sorted(server.state.store.columns):
+        count = server.state.store.conn.execute(f'SELECT COUNT(*) FROM {quote(table)}').fetchone()[0]
+        print(f"    {table:<28} {count:>8,} rows")
+    print(f"  export SUPABASE_URL={url} SUPABASE_KEY=mock")
+    try:
+        while True:
+            time.sleep(10)
+            s = server.state.stats()
+            if s['requests']:
+                print(f"  requests={s['requests']} methods={s['methods']} "
+                      f"read={s['rows_read']} written={s['rows_written']}")
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(json.dumps(server.state.stats(), indent=2))
+
+
+if __name__ == '__main__':
+    main()
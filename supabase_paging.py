@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Vora Supabase Paging
+Keyset pagination for large supabase-py table pulls.
+
+`.range(offset, offset + 999)` makes Postgres walk past every earlier row on
+each page, so big pulls slow down as they go, and rows inserted or deleted
+mid-scan shift the offsets (skipped or repeated rows). iter_rows() instead
+asks for `id > last_id ORDER BY id LIMIT page_size`, which is an index seek
+per page and stable under concurrent writes.
+
+Usage:
+    from supabase_paging import iter_rows
+
+    for row in iter_rows(supabase, 'college_contacts', 'id,email,role',
+                         filters=lambda q: q.in_('role', ['student', 'coach'])):
+        ...
+
+    emails = {r['email'].lower() for r in iter_rows(supabase, 'college_outreach_sent', 'email')}
+"""
+
+PAGE_SIZE = 5000  # Supabase caps responses at its max-rows setting; iter_rows adapts
+
+
+def apply_filters(query, filters):
+    """Filters are a callable (query -> query) or a dict of column == value."""
+    if filters is None:
+        return query
+    if callable(filters):
+        return filters(query)
+    for col, val in filters.items():
+        query = query.eq(col, val)
+    return query
+
+
+def iter_rows(supabase, table, columns='*', filters=None, page_size=PAGE_SIZE, key='id', progress_every=0):
+    """
+    Yield every row of `table` matching `filters`, `page_size` rows per request,
+    ordered by `key`. Only `columns` are fetched (the key is always included).
+
+    If the server returns a short page it is either the end of the table or
+    the project's max-rows cap; one more request tells which, and a cap
+    becomes the page size for the rest of the scan.
+    """
+    if columns != '*' and key not in [c.strip() for c in columns.split(',')]:
+        columns = f"{key},{columns}"
+
+    last_key = None
+    fetched = 0
+    capped = False
+    while True:
+        query = apply_filters(supabase.table(table).select(columns), filters)
+        if last_key is not None:
+            query = query.gt(key, last_key)
+        rows = query.order(key).limit(page_size).execute().data
+
+        if not rows:
+            return
+        yield from rows
+        fetched += len(rows)
+        last_key = rows[-1][key]
+        if progress_every and fetched // progress_every != (fetched - len(rows)) // progress_every:
+            print(f"    ...fetched {fetched} so far", flush=True)
+
+        if len(rows) < page_size:
+            if capped:
+                return
+            page_size = len(rows)
+            capped = True
+
+
+def fetch_column_set(supabase, table, column, filters=None, page_size=PAGE_SIZE):
+    """Set of lowercased, non-empty values of one text column (e.g. every sent email)."""
+    return {
+        row[column].lower()
+        for row in iter_rows(supabase, table, column, filters=filters, page_size=page_size)
+        if row.get(column)
+    }
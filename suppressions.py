@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Vora Suppression Store
+One local, indexed list of addresses we must never email again, fed by
+SendGrid's Event Webhook and by the legacy bounce/bad-address files.
+
+- `serve` runs a small HTTP receiver for SendGrid event posts. bounce,
+  dropped, spamreport, unsubscribe and group_unsubscribe events are
+  appended to suppressions.db as they arrive.
+- Senders load a SuppressionIndex (an in-memory set, refreshed from the
+  store every few seconds) and skip any address in it with an O(1) lookup,
+  so a bounce reported mid-run stops the next send to that address.
+  Lookups compare canonical keys (email_canon), so a bounce on
+  jane.doe@gmail.com also covers janedoe+fit@gmail.com.
+- `import` folds in the scattered legacy lists (bounced_emails.json,
+  r2_bounces.json, smtp_bad_all.json, ...).
+- mbox_unsubscribes.py adds the people who replied asking to be removed
+  (the Gmail Unsubscribe label exports under unsubscribed/).
+
+Usage:
+    # Receive SendGrid events (point the Event Webhook at /sendgrid/events)
+    python suppressions.py serve --port 8026
+
+    # One-time import of legacy bounce / bad-address files
+    python suppressions.py import
+
+    # Look up an address / show counts
+    python suppressions.py check someone@gmail.com
+    python suppressions.py stats
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from email_canon import canonical_email
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SUPPRESSION_DB = os.getenv('SUPPRESSION_DB', os.path.join(BASE_DIR, 'suppressions.db'))
+WEBHOOK_TOKEN = os.getenv('SUPPRESSION_WEBHOOK_TOKEN', '')
+
+SUPPRESS_EVENTS = {'bounce', 'dropped', 'spamreport', 'unsubscribe', 'group_unsubscribe'}
+REFRESH_SECONDS = 2.0
+
+# (path relative to repo root, reason)
+LEGACY_FILES = [
+    ('instagram_test/bounced_emails.json', 'bounce'),
+    ('instagram_test/r2_bounces.json', 'bounce'),
+    ('instagram_test/smtp_bad_all.json', 'smtp_invalid'),
+    ('instagram_test/smtp_bad.json', 'smtp_invalid'),
+    ('instagram_test/smtp_removed.json', 'smtp_invalid'),
+    ('instagram_test/invalid_emails.json', 'invalid'),
+    ('instagram_test/all_bad_to_delete.json', 'invalid'),
+    ('instagram_test/extra_remove.json', 'invalid'),
+    ('instagram_test/r2_extra_remove.json', 'invalid'),
+]
+
+
+def connect(path=None):
+    """Open (and if needed create) the suppression store."""
+    conn = sqlite3.connect(path or SUPPRESSION_DB, timeout=30, check_same_thread=False)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS suppressions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            email TEXT NOT NULL UNIQUE,
+            reason TEXT NOT NULL,
+            source TEXT,
+            event_at REAL,
+            added_at REAL NOT NULL,
+            canonical TEXT
+        )
+    """)
+    columns = [row[1] for row in conn.execute('PRAGMA table_info(suppressions)')]
+    if 'canonical' not in columns:
+        conn.execute('ALTER TABLE suppressions ADD COLUMN canonical TEXT')
+    backfill = conn.execute('SELECT id, email FROM suppressions WHERE canonical IS NULL').fetchall()
+    if backfill:
+        conn.executemany('UPDATE suppressions SET canonical = ? WHERE id = ?',
+                         [(canonical_email(email), row_id) for row_id, email in backfill])
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_suppressions_canonical ON suppressions (canonical)')
+    conn.commit()
+    return conn
+
+
+def normalize_email(email):
+    return (email or '').strip().lower()
+
+
+def add_suppressions(conn, rows, source):
+    """
+    Insert (email, reason, event_at) rows, keeping the first reason seen for
+    an address. Returns the number of newly suppressed addresses.
+    """
+    now = time.time()
+    params = [
+        (normalize_email(email), reason, source, event_at, now, canonical_email(email))
+        for email, reason, event_at in rows
+        if '@' in (email or '')
+    ]
+    before = conn.total_changes
+    conn.executemany(
+        'INSERT OR IGNORE INTO suppressions (email, reason, source, event_at, added_at, canonical) '
+        'VALUES (?, ?, ?, ?, ?, ?)', params,
+    )
+    conn.commit()
+    return conn.total_changes - before
+
+
+def record_events(conn, events):
+    """Store the suppressing events from a SendGrid webhook post. Returns (added, seen)."""
+    rows = []
+    for ev in events:
+        if not isinstance(ev, dict) or ev.get('event') not in SUPPRESS_EVENTS:
+            continue
+        rows.append((ev.get('email'), ev['event'], ev.get('timestamp')))
+    return add_suppressions(conn, rows, 'sendgrid_webhook'), len(rows)
+
+
+class SuppressionIndex:
+    """
+    In-memory set of suppressed canonical keys. Membership checks are O(1);
+    the set picks up rows added since the last refresh (by id watermark)
+    at most every `refresh_seconds`, so long send loops see new bounces
+    within seconds without re-reading the whole store.
+    """
+
+    def __init__(self, path=None, refresh_seconds=REFRESH_SECONDS):
+        self.conn = connect(path)
+        self.refresh_seconds = refresh_seconds
+        self.emails = set()
+        self.watermark = 0
+        self.checked_at = 0.0
+        self._lock = threading.Lock()
+        self.refresh()
+
+    def refresh(self):
+        with self._lock:
+            rows = self.conn.execute(
+                'SELECT id, canonical FROM suppressions WHERE id > ? ORDER BY id', (self.watermark,),
+            ).fetchall()
+            for row_id, key in rows:
+                self.emails.add(key)
+                self.watermark = row_id
+            self.checked_at = time.time()
+        return len(rows)
+
+    def __contains__(self, email):
+        if time.time() - self.checked_at >= self.refresh_seconds:
+            self.refresh()
+        return canonical_email(email) in self.emails
+
+    def __len__(self):
+        return len(self.emails)
+
+
+# ─── Webhook Receiver ────────────────────────────────────────────────────────
+
+class WebhookHandler(BaseHTTPRequestHandler):
+    server_version = 'VoraSuppressionWebhook/1.0'
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        count = self.server.conn.execute('SELECT COUNT(*) FROM suppressions').fetchone()[0]
+        self._reply(200, {'ok': True, 'suppressed': count})
+
+    def do_POST(self):
+        parsed = urlparse(self.path)
+        if parsed.path.rstrip('/') != '/sendgrid/events':
+            self._reply(404, {'error': 'not found'})
+            return
+        if WEBHOOK_TOKEN and parse_qs(parsed.query).get('token', [''])[0] != WEBHOOK_TOKEN:
+            self._reply(403, {'error': 'bad token'})
+            return
+
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            events = json.loads(self.rfile.read(length) or b'[]')
+        except ValueError:
+            self._reply(400, {'error': 'invalid json'})
+            return
+        if isinstance(events, dict):
+            events = [events]
+
+        with self.server.write_lock:
+            added, seen = record_events(self.server.conn, events)
+        if added:
+            print(f"  + {added} suppressed ({seen} suppressing events in post of {len(events)})", flush=True)
+        self._reply(200, {'received': len(events), 'suppressed': added})
+
+
+def serve(host, port, path=None):
+    server = ThreadingHTTPServer((host, port), WebhookHandler)
+    server.daemon_threads = True
+    server.conn = connect(path)
+    server.write_lock = threading.Lock()
+    print(f"  Suppression webhook listening on http://{host}:{port}/sendgrid/events")
+    print(f"  Store: {path or SUPPRESSION_DB}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+# ─── Legacy Import ───────────────────────────────────────────────────────────
+
+def import_legacy(conn):
+    """Fold the legacy bounce / bad-address JSON files into the store."""
+    total = 0
+    for rel_path, reason in LEGACY_FILES:
+        path = os.path.join(BASE_DIR, rel_path)
+        if not os.path.exists(path):
+            continue
+        with open(path) as f:
+            data = json.load(f)
+        rows = []
+        for entry in data:
+            if isinstance(entry, dict):
+                rows.append((entry.get('email'), entry.get('reason') or reason, None))
+            else:
+                rows.append((entry, reason, None))
+        added = add_suppressions(conn, rows, rel_path)
+        total += added
+        print(f"  {rel_path}: {len(rows)} entries, {added} new")
+    return total
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description='Vora suppression store')
+    parser.add_argument('--db', type=str, help=f'Store path (default: {SUPPRESSION_DB})')
+    sub = parser.add_subparsers(dest='command')
+
+    p_serve = sub.add_parser('serve', help='Run the SendGrid event webhook receiver')
+    p_serve.add_argument('--host', default='0.0.0.0')
+    p_serve.add_argument('--port', type=int, default=8026)
+
+    sub.add_parser('import', help='Import legacy bounce / bad-address files')
+
+    p_check = sub.add_parser('check', help='Check whether addresses are suppressed')
+    p_check.add_argument('emails', nargs='+')
+
+    sub.add_parser('stats', help='Show counts by reason')
+
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        serve(args.host, args.port, args.db)
+    elif args.command == 'import':
+        conn = connect(args.db)
+        total = import_legacy(conn)
+        print(f"\n  Imported {total} new suppressed addresses")
+    elif args.command == 'check':
+        index = SuppressionIndex(args.db)
+        for email in args.emails:
+            if email in index:
+                suppressed_as, reason, source = index.conn.execute(
+                    'SELECT email, reason, source FROM suppressions WHERE canonical = ?', (canonical_email(email),),
+                ).fetchone()
+                print(f"  ✗ {email}: suppressed as {suppressed_as} ({reason}, from {source})")
+            else:
+                print(f"  ✓ {email}: not suppressed")
+    elif args.command == 'stats':
+        conn = connect(args.db)
+        rows = conn.execute(
+            'SELECT reason, COUNT(*) FROM suppressions GROUP BY reason ORDER BY 2 DESC'
+        ).fetchall()
+        print(f"  {sum(c for _, c in rows)} suppressed addresses")
+        for reason, count in rows:
+            print(f"    {reason}: {count}")
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
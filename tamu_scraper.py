@@ -14,10 +14,12 @@ import requests
 from bs4 import BeautifulSoup
 import re
 import csv
-import json
 import time
 from urllib.parse import urljoin
 
+from contact_records import CONTACT_FIELDS, ContactList, write_csv, write_json
+from lead_store import write_contacts
+
 
 def log(msg):
     print(msg, flush=True)
@@ -549,7 +551,7 @@ STUDENT_ORGS = [
 
 def main():
     session = requests.Session()
-    all_results = []
+    all_results = ContactList()
     global_seen = set()
 
     def add_results(dept_results):
@@ -690,17 +692,14 @@ def main():
         log(f"  @*.tamu.edu (subdomains): {len(tamu_sub)}")
 
     # CSV with proper quoting to handle commas in names
-    with open(OUTPUT_CSV, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=['email', 'name', 'department', 'source_url'],
-                                quoting=csv.QUOTE_ALL)
-        writer.writeheader()
-        for r in sorted(all_results, key=lambda x: (x['department'], x['email'])):
-            writer.writerow(r)
+    write_csv(sorted(all_results, key=lambda x: (x['department'], x['email'])), OUTPUT_CSV, CONTACT_FIELDS,
+              quoting=csv.QUOTE_ALL)
     log(f"\nSaved to {OUTPUT_CSV}")
 
-    with open(OUTPUT_JSON, 'w') as f:
-        json.dump(all_results, f, indent=2)
+    write_json(all_results, OUTPUT_JSON)
     log(f"Saved to {OUTPUT_JSON}")
+    n = write_contacts(all_results, OUTPUT_CSV)
+    log(f"Stored {n} contacts in the lead store")
 
     # Department summary
     log(f"\n{'='*70}")
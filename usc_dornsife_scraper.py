@@ -12,12 +12,12 @@ Handles two types of pages:
 import requests
 from bs4 import BeautifulSoup
 import re
-import csv
-import json
 import time
 import sys
 from urllib.parse import urljoin
 
+from contact_records import CONTACT_FIELDS, ContactList, write_csv, write_json
+
 
 def log(msg):
     """Print with immediate flush."""
@@ -740,7 +740,7 @@ def scrape_physics(session):
 
 def main():
     session = requests.Session()
-    all_results = []
+    all_results = ContactList()
     seen_emails = set()
     
     def add_results(results):
@@ -818,17 +818,12 @@ def main():
     
     # Save CSV with all entries
     output_csv = 'usc_dornsife_grad_emails.csv'
-    with open(output_csv, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=['email', 'name', 'department', 'source_url'])
-        writer.writeheader()
-        for r in all_results:
-            writer.writerow(r)
+    write_csv(all_results, output_csv, CONTACT_FIELDS)
     log(f"\nSaved all entries to {output_csv}")
     
     # Save JSON
     output_json = 'usc_dornsife_grad_emails.json'
-    with open(output_json, 'w') as f:
-        json.dump(all_results, f, indent=2)
+    write_json(all_results, output_json)
     log(f"Saved all entries to {output_json}")
     
     # Print summary by department
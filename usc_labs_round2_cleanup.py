@@ -2,12 +2,18 @@
 """
 Clean up the round 2 CSV - fix prefix artifacts, add manually extracted emails,
 remove duplicates.
+
+Duplicates are resolved by record_linkage: prefix artifacts that clean_email
+doesn't know yet (investigatorxyz@ next to xyz@) still merge into the clean
+address, and anyone already in an earlier USC scrape is dropped.
 """
 
 import csv
 import json
 import re
 
+from record_linkage import link
+
 
 def clean_email(email):
     """Clean email by removing role/title prefix artifacts."""
@@ -214,58 +220,60 @@ def main():
         {"email": "sfinley@usc.edu", "name": "Stacey D. Finley", "department": "BME - Computational Systems Bio Lab", "source_url": "https://csbl.usc.edu/contact/"},
     ]
     
-    # Merge manual additions with existing results
-    seen_emails = set()
+    # Manual additions are hand-corrected, so they go first and win conflicts
+    candidates = []
+    for r in manual_additions:
+        email = r['email'].lower().strip()
+        if not is_admin_email(email):
+            candidates.append({**r, 'email': email, 'source': 'manual'})
     
-    # First pass: collect emails from existing results after cleaning
-    cleaned_results = []
+    # Cleaned scrape results
     for r in results:
         email = clean_email(r.get('email', ''))
         if not email or is_admin_email(email):
             continue
-        if email not in seen_emails:
-            seen_emails.add(email)
-            r['email'] = email
-            # Clean name
-            name = r.get('name', '')
-            if name and any(x in name.lower() for x in ['staff', 'advisor', 'division chief',
-                                                          'associate chief', 'equal opportunity',
-                                                          'tell us', 'for assistance', 'mailing address',
-                                                          'faculty profile', 'administrative']):
-                r['name'] = ''
-            cleaned_results.append(r)
-    
-    # Second pass: add manual additions
-    for r in manual_additions:
-        email = r['email'].lower().strip()
-        if email not in seen_emails and not is_admin_email(email):
-            seen_emails.add(email)
-            cleaned_results.append(r)
+        r['email'] = email
+        # Clean name
+        name = r.get('name', '')
+        if name and any(x in name.lower() for x in ['staff', 'advisor', 'division chief',
+                                                      'associate chief', 'equal opportunity',
+                                                      'tell us', 'for assistance', 'mailing address',
+                                                      'faculty profile', 'administrative']):
+            r['name'] = ''
+        candidates.append({**r, 'source': 'round2_scrape'})
     
     # Load previous scrapers to filter
-    existing_emails = set()
-    for fname in ['usc_viterbi_emails.csv', 'usc_dornsife_grad_emails.csv', 
-                  'usc_pro_school_emails.csv', 'usc_emails.csv']:
+    previous_sources = ['usc_viterbi_emails.csv', 'usc_dornsife_grad_emails.csv',
+                        'usc_pro_school_emails.csv', 'usc_emails.csv']
+    previous = []
+    for fname in previous_sources:
         try:
             with open(fname, 'r') as f:
                 reader = csv.DictReader(f)
                 for row in reader:
                     if row.get('email'):
-                        existing_emails.add(row['email'].lower().strip())
+                        previous.append({**row, 'source': fname})
         except FileNotFoundError:
             pass
     
-    print(f"Existing emails from previous scrapers: {len(existing_emails)}")
+    print(f"Existing records from previous scrapers: {len(previous)}")
     
-    # Filter
-    final_results = [r for r in cleaned_results if r['email'].lower().strip() not in existing_emails]
+    # Link everything; drop people an earlier scraper already has
+    golden = link(candidates + previous)
+    new_golden = [g for g in golden if not set(g['linked_sources']) & set(previous_sources)]
+    already_known = sum(1 for g in golden if set(g['linked_sources']) - set(previous_sources)) - len(new_golden)
+    print(f"Linked {len(candidates)} round 2 records; {already_known} people already in earlier scrapes")
+    final_results = [{'email': g['email'], 'name': g.get('name', ''), 'department': g.get('department', ''),
+                      'source_url': g.get('source_url', ''), 'linked_emails': g['linked_emails']}
+                     for g in new_golden]
     
     print(f"Final cleaned results: {len(final_results)} unique emails")
     
     # Save
     output_csv = 'usc_labs_round2_emails.csv'
     with open(output_csv, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=['email', 'name', 'department', 'source_url'])
+        writer = csv.DictWriter(f, fieldnames=['email', 'name', 'department', 'source_url'],
+                                extrasaction='ignore')
         writer.writeheader()
         for r in sorted(final_results, key=lambda x: x.get('department', '')):
             writer.writerow(r)
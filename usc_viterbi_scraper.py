@@ -7,11 +7,11 @@ Scrapes student/researcher emails from department directories and research lab p
 import requests
 from bs4 import BeautifulSoup
 import re
-import csv
-import json
 import time
 from urllib.parse import urljoin, urlparse
 
+from contact_records import CONTACT_FIELDS, ContactList, write_csv, write_json
+
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
     'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
@@ -295,7 +295,7 @@ def discover_lab_links(url, session):
 
 
 def main():
-    all_results = []
+    all_results = ContactList()
     seen_emails = set()
     visited_urls = set()
     session = requests.Session()
@@ -379,17 +379,12 @@ def main():
 
     # Save to CSV
     output_csv = 'usc_viterbi_emails.csv'
-    with open(output_csv, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=['email', 'name', 'department', 'source_url'])
-        writer.writeheader()
-        for r in sorted(all_results, key=lambda x: x['department']):
-            writer.writerow(r)
+    write_csv(sorted(all_results, key=lambda x: x['department']), output_csv, CONTACT_FIELDS)
     print(f"\nSaved to {output_csv}")
 
     # Save as JSON
     output_json = 'usc_viterbi_emails.json'
-    with open(output_json, 'w') as f:
-        json.dump(all_results, f, indent=2)
+    write_json(all_results, output_json)
     print(f"Also saved to {output_json}")
 
     # Summary
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Vora Write-Behind Log
+Buffers the per-send Supabase writes (sent logs, follow-up marks) and flushes
+them in bulk from a background thread, so the send loop never waits on
+Supabase.
+
+- record() appends the row to a local spill file and returns immediately
+- a background thread flushes `max_batch` rows at a time, or whatever is
+  buffered every `max_delay` seconds, through the caller's bulk write function
+- flushed rows are acknowledged in the spill file; rows left unacknowledged
+  by a crash are replayed the next time a log with the same name opens
+- a batch the database rejects is split until the bad rows are isolated;
+  those are dropped with a warning (the old per-row writes swallowed them
+  too). Connection/5xx errors back off and retry.
+
+Usage:
+    from write_behind import WriteBehindLog
+
+    sent_log = WriteBehindLog(
+        'college_outreach_sent',
+        lambda rows: supabase.table('college_outreach_sent').insert(rows).execute(),
+    )
+    for contact in send_list:
+        ...send...
+        sent_log.record({'email': email, 'status': 'sent'})
+    sent_log.close()
+
+    # Show rows still waiting in spill files
+    python write_behind.py status
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+from sendgrid_retry import error_status
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SPILL_DIR = os.getenv('WRITE_BEHIND_DIR', os.path.join(BASE_DIR, '.write_behind'))
+
+MAX_BATCH = 500      # rows per bulk write
+MAX_DELAY = 2.0      # seconds a row may wait before a flush
+MAX_BACKOFF = 60.0   # cap on the wait after a failed flush
+
+
+def is_data_error(exc):
+    """
+    True if the database rejected the rows themselves (4xx, or a Postgres
+    SQLSTATE from supabase-py) — retrying the same rows will not help.
+    """
+    status = error_status(exc)
+    if status is not None:
+        return 400 <= status < 500 and status != 429
+    code = getattr(exc, 'code', None)
+    return isinstance(code, str) and bool(code)
+
+
+def spill_path_for(name):
+    return os.path.join(SPILL_DIR, f"{name}.jsonl")
+
+
+def read_spill(path):
+    """Return (rows, acked) from a spill file: all rows and how many were flushed."""
+    rows = []
+    acked = 0
+    if not os.path.exists(path):
+        return rows, acked
+    with open(path) as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                break  # torn final line from a crash
+            if 'ack' in entry:
+                acked = max(acked, entry['ack'])
+            else:
+                rows.append(entry['row'])
+    return rows, acked
+
+
+class WriteBehindLog:
+    """
+    Spill-backed buffer in front of a bulk write function.
+    `flush_fn(rows)` receives a list of row dicts and raises on failure.
+    """
+
+    def __init__(self, name, flush_fn, max_batch=MAX_BATCH, max_delay=MAX_DELAY):
+        self.name = name
+        self.flush_fn = flush_fn
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+
+        os.makedirs(SPILL_DIR, exist_ok=True)
+        self.spill_path = spill_path_for(name)
+        replay, acked = read_spill(self.spill_path)
+        self.pending = replay[acked:]
+        self.replayed = len(self.pending)
+
+        # Rewrite the spill file with just the unflushed rows
+        self.spill = open(self.spill_path, 'w')
+        for row in self.pending:
+            self.spill.write(json.dumps({'row': row}) + '\n')
+        self.spill.flush()
+        self.spilled = len(self.pending)  # rows in the spill file
+        self.acked = 0                    # of those, rows flushed
+
+        self.stats = {'recorded': 0, 'flushed': 0, 'dropped': 0, 'batches': 0, 'failures': 0}
+        self.backoff = 0.0
+        self.closing = False
+        self.lock = threading.Lock()
+        self.wake = threading.Condition(self.lock)
+        self.thread = threading.Thread(target=self._run, name=f"write-behind-{name}", daemon=True)
+        self.thread.start()
+
+        if self.replayed:
+            print(f"  ↻ {self.replayed} unflushed {name} rows from a previous run queued for replay")
+
+    # ─── Producer side ───────────────────────────────────────────────────────
+
+    def record(self, row):
+        """Queue one row. Durable once this returns."""
+        with self.lock:
+            self.spill.write(json.dumps({'row': row}, default=str) + '\n')
+            self.spill.flush()
+            self.spilled += 1
+            self.pending.append(row)
+            self.stats['recorded'] += 1
+            if len(self.pending) >= self.max_batch:
+                self.wake.notify()
+
+    # ─── Flush thread ────────────────────────────────────────────────────────
+
+    def _run(self):
+        close_failures = 0
+        while True:
+            with self.lock:
+                backlog = len(self.pending) >= self.max_batch
+                if not self.closing and (not backlog or self.backoff):
+                    self.wake.wait(timeout=self.max_delay + self.backoff)
+                batch = self.pending[:self.max_batch]
+                closing = self.closing
+            if not batch:
+                if closing:
+                    return
+                continue
+            if self._flush_batch(batch) or not closing:
+                continue
+            # Shutting down and Supabase is still failing: give it a few
+            # tries, then leave the rows in the spill file for the next run
+            close_failures += 1
+            if close_failures >= 3:
+                return
+            time.sleep(self.backoff)
+
+    def _write(self, rows):
+        """Write rows, bisecting around rejected ones. Returns rows handled."""
+        try:
+            self.flush_fn(rows)
+            return len(rows)
+        except Exception as e:
+            if not is_data_error(e):
+                raise
+            if len(rows) == 1:
+                self.stats['dropped'] += 1
+                print(f"  ⚠ {self.name}: dropped rejected row {json.dumps(rows[0], default=str)[:120]} ({e})")
+                return 1
+            mid = len(rows) // 2
+            return self._write(rows[:mid]) + self._write(rows[mid:])
+
+    def _flush_batch(self, batch):
+        """Flush one batch and acknowledge it in the spill file. Returns success."""
+        try:
+            self._write(batch)
+        except Exception as e:
+            self.stats['failures'] += 1
+            self.backoff = min(MAX_BACKOFF, max(1.0, self.backoff * 2))
+            print(f"  ⚠ {self.name}: flush of {len(batch)} rows failed, retrying in "
+                  f"{self.backoff + self.max_delay:.0f}s ({e})")
+            return False
+
+        self.backoff = 0.0
+        with self.lock:
+            del self.pending[:len(batch)]
+            self.stats['batches'] += 1
+            self.stats['flushed'] += len(batch)
+            if self.spill.closed:
+                return True
+            self.acked += len(batch)
+            if self.acked == self.spilled:
+                # Everything on disk is in Supabase: start the spill file over
+                self.spill.seek(0)
+                self.spill.truncate()
+                self.spilled = self.acked = 0
+            else:
+                self.spill.write(json.dumps({'ack': self.acked}) + '\n')
+            self.spill.flush()
+        return True
+
+    # ─── Shutdown ────────────────────────────────────────────────────────────
+
+    def close(self, timeout=60):
+        """Flush what is buffered and stop the thread. Returns the stats dict."""
+        with self.lock:
+            self.closing = True
+            self.wake.notify()
+        self.thread.join(timeout)
+        with self.lock:
+            left = self.spilled - self.acked
+            self.spill.close()
+        if left:
+            print(f"  ⚠ {self.name}: {left} rows not yet in Supabase — kept in "
+                  f"{os.path.relpath(self.spill_path, BASE_DIR)}, replayed on the next run")
+        elif os.path.exists(self.spill_path):
+            os.remove(self.spill_path)
+        return self.stats
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] != 'status':
+        print("Usage: python write_behind.py status")
+        sys.exit(1)
+    if not os.path.isdir(SPILL_DIR):
+        print("  No spill files.")
+        return
+    found = False
+    for fname in sorted(os.listdir(SPILL_DIR)):
+        if not fname.endswith('.jsonl'):
+            continue
+        rows, acked = read_spill(os.path.join(SPILL_DIR, fname))
+        if len(rows) > acked:
+            found = True
+            print(f"  {fname[:-6]:<28} {len(rows) - acked:>6} rows waiting")
+    if not found:
+        print("  Nothing waiting — all spilled rows reached Supabase.")
+
+
+if __name__ == '__main__':
+    main()